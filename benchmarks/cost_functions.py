@@ -0,0 +1,53 @@
+#
+# Benchmarks for the cost functions
+#
+import numpy as np
+import pbparam
+
+
+class TimeCostFunctionEvaluate:
+    """
+    Time the evaluation of the cost functions on simulated and reference data of
+    increasing size, as lists of arrays and stacked with the mask of the missing
+    data computed up front, as in DataFit.
+    """
+
+    params = [["RMSE", "MLE"], [10**3, 10**4, 10**5, 10**6, 10**7]]
+    param_names = ["cost_function", "n_points"]
+
+    def setup(self, cost_function, n_points):
+        rng = np.random.default_rng(0)
+        self.cost_function = getattr(pbparam, cost_function)()
+        self.y_data = np.linspace(4.2, 3.0, n_points)
+        self.y_sim = self.y_data + rng.normal(scale=1e-2, size=n_points)
+        self.weights = np.ones(n_points)
+        self.sd = 1e-2
+        self.y_sim_stacked = self.y_sim[np.newaxis, :]
+        self.y_data_stacked = self.y_data[np.newaxis, :]
+        self.weights_stacked = self.weights[np.newaxis, :]
+        self.nan_mask = np.isnan(self.y_data_stacked)
+        self.counts = np.count_nonzero(~self.nan_mask, axis=1)
+        self.out = np.empty_like(self.y_data_stacked)
+
+    def time_evaluate(self, cost_function, n_points):
+        self.cost_function.evaluate(self.y_sim, self.y_data, self.weights, self.sd)
+
+    def peakmem_evaluate(self, cost_function, n_points):
+        self.cost_function.evaluate(self.y_sim, self.y_data, self.weights, self.sd)
+
+    def _evaluate_stacked(self):
+        self.cost_function.evaluate_stacked(
+            self.y_sim_stacked,
+            self.y_data_stacked,
+            self.weights_stacked,
+            [self.sd],
+            nan_mask=self.nan_mask,
+            counts=self.counts,
+            out=self.out,
+        )
+
+    def time_evaluate_stacked(self, cost_function, n_points):
+        self._evaluate_stacked()
+
+    def peakmem_evaluate_stacked(self, cost_function, n_points):
+        self._evaluate_stacked()
@@ -0,0 +1,82 @@
+#
+# Benchmarks for the DataFit optimisation problem
+#
+import os
+import numpy as np
+import pbparam
+import pybamm
+import pandas as pd
+
+
+class TimeDataFitObjectiveFunction:
+    """
+    Time one evaluation of the objective function, interpolating the solution at the
+    times of the data or solving directly on the data grid. The interpolation
+    evaluates the variables to fit with their cached CasADi functions instead of
+    creating a :class:`pybamm.ProcessedVariable` for each solution.
+    Solving on the data grid is an accuracy option, and is expected to be slower for
+    these densely sampled data.
+    """
+
+    params = [["SPM", "SPMe"], [False, True]]
+    param_names = ["model", "solve_on_data_grid"]
+
+    def setup(self, model, solve_on_data_grid):
+        data = pd.read_csv(
+            os.path.join(
+                pbparam.__path__[0], "input", "data", "LGM50_789_1C_25degC.csv"
+            )
+        )
+        # Keep the discharge part of the data, before the voltage cut-off
+        data = data[data["Time [s]"] < 3500]
+        simulation = pybamm.Simulation(
+            getattr(pybamm.lithium_ion, model)(),
+            parameter_values=pybamm.ParameterValues("Chen2020"),
+            solver=pybamm.CasadiSolver(mode="fast"),
+        )
+        self.optimisation_problem = pbparam.DataFit(
+            simulation,
+            data,
+            {"Negative electrode diffusivity [m2.s-1]": (3.3e-14, (2e-16, 2e-12))},
+            solve_on_data_grid=solve_on_data_grid,
+        )
+        self.x = self.optimisation_problem.x0
+        # The first evaluation builds the model, which should not be timed
+        self.optimisation_problem.objective_function(self.x)
+
+    def time_objective_function(self, model, solve_on_data_grid):
+        self.optimisation_problem.objective_function(self.x)
+
+    def peakmem_objective_function(self, model, solve_on_data_grid):
+        self.optimisation_problem.objective_function(self.x)
+
+
+class TimeDataFitObjectiveFunctionBatch:
+    """
+    Time the evaluation of a batch of parameter values, as done by
+    :class:`pbparam.ScipyDifferentialEvolution` with `vectorized=True`.
+    """
+
+    def setup(self):
+        data = pd.read_csv(
+            os.path.join(
+                pbparam.__path__[0], "input", "data", "LGM50_789_1C_25degC.csv"
+            )
+        )
+        data = data[data["Time [s]"] < 3500]
+        simulation = pybamm.Simulation(
+            pybamm.lithium_ion.SPM(),
+            parameter_values=pybamm.ParameterValues("Chen2020"),
+            solver=pybamm.CasadiSolver(mode="fast"),
+        )
+        self.optimisation_problem = pbparam.DataFit(
+            simulation,
+            data,
+            {"Negative electrode diffusivity [m2.s-1]": (3.3e-14, (2e-16, 2e-12))},
+        )
+        self.X = self.optimisation_problem.x0 * np.linspace(0.5, 2, 8)[:, None]
+        # The first evaluation builds the model, which should not be timed
+        self.optimisation_problem.objective_function_batch(self.X)
+
+    def time_objective_function_batch(self):
+        self.optimisation_problem.objective_function_batch(self.X)
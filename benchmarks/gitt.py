@@ -0,0 +1,63 @@
+#
+# Benchmarks for the GITT optimisation problem
+#
+import os
+import numpy as np
+import pbparam
+import pybamm
+import pandas as pd
+
+
+class TimeGITTObjectiveFunction:
+    """
+    Time one evaluation of the objective function of a GITT pulse fitted with the
+    Weppner-Huggins model.
+    """
+
+    def setup(self):
+        data = pd.read_csv(
+            os.path.join(pbparam.__path__[0], "input", "data", "GITT", "pulse_1.csv")
+        )
+        # Keep the current pulse, fitted to the positive electrode potential
+        data = data[data["Current [A]"] <= -1e-3]
+        pulse = pd.DataFrame(
+            {
+                "Time [s]": data["Time [s]"] - data["Time [s]"].iloc[0],
+                "Voltage [V]": data["Positive electrode potential [V]"],
+            }
+        )
+        param_dict = pybamm.ParameterValues(
+            {
+                "Reference OCP [V]": pulse["Voltage [V]"].iloc[0],
+                "Derivative of the OCP wrt stoichiometry [V]": -1,
+                "Current function [A]": 1.15e-3,
+                "Number of electrodes connected in parallel to make a cell": 1.0,
+                "Electrode width [m]": np.pi * 1.8e-2**2 / 4,
+                "Electrode height [m]": 1,
+                "Positive electrode active material volume fraction": 0.665,
+                "Positive particle radius [m]": 5.22e-6,
+                "Positive electrode thickness [m]": 75.6e-6,
+                "Positive electrode diffusivity [m2.s-1]": 5e-14,
+                "Maximum concentration in positive electrode [mol.m-3]": 63104,
+                "Initial concentration in positive electrode [mol.m-3]": 1000,
+                "Effective resistance [Ohm]": 0,
+                "Negative electrode thickness [m]": 1e-4,
+                "Separator thickness [m]": 1e-4,
+                "Negative particle radius [m]": 1e-5,
+            }
+        )
+        self.optimisation_problem = pbparam.GITT(
+            param_dict=param_dict,
+            gitt_model=pbparam.WeppnerHuggins(),
+            data=pulse,
+            cost_function=pbparam.RMSE(),
+        )
+        self.x = self.optimisation_problem.x0
+        # The first evaluation builds the model, which should not be timed
+        self.optimisation_problem.objective_function(self.x)
+
+    def time_objective_function(self):
+        self.optimisation_problem.objective_function(self.x)
+
+    def peakmem_objective_function(self):
+        self.optimisation_problem.objective_function(self.x)
@@ -0,0 +1,16 @@
+#
+# Benchmarks for the import time of pbparam
+#
+
+
+def timeraw_import_pbparam():
+    # Timed in a new interpreter each time, see
+    # https://asv.readthedocs.io/en/stable/writing_benchmarks.html#raw-timing-benchmarks
+    return "import pbparam"
+
+
+def timeraw_import_ocp_balance():
+    return """
+    import pbparam
+    pbparam.OCPBalance
+    """
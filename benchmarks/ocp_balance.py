@@ -0,0 +1,32 @@
+#
+# Benchmarks for the OCPBalance optimisation problem
+#
+import os
+import pbparam
+import pandas as pd
+
+
+class TimeOCPBalanceObjectiveFunction:
+    """
+    Time one evaluation of the objective function, balancing the OCPs of the anode
+    measured in the three electrode cell against those of the half cell.
+    """
+
+    def setup(self):
+        def read(name):
+            return pd.read_csv(
+                os.path.join(pbparam.__path__[0], "input", "data", name)
+            )
+
+        self.optimisation_problem = pbparam.OCPBalance(
+            [read("anode_OCP_3_lit.csv"), read("anode_OCP_3_delit.csv")],
+            [read("anode_OCP_2_lit.csv"), read("anode_OCP_2_delit.csv")],
+        )
+        self.optimisation_problem.setup_objective_function()
+        self.x = self.optimisation_problem.x0
+
+    def time_objective_function(self):
+        self.optimisation_problem.objective_function(self.x)
+
+    def peakmem_objective_function(self):
+        self.optimisation_problem.objective_function(self.x)
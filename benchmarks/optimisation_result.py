@@ -0,0 +1,68 @@
+#
+# Benchmarks for the optimisation result
+#
+import os
+import pbparam
+import pandas as pd
+from scipy.optimize import OptimizeResult
+
+
+class TimeOptimisationResult:
+    """
+    Time the construction of the result of an optimisation, which holds a copy of
+    the optimisation problem.
+    """
+
+    params = ["DataFit", "OCPBalance"]
+    param_names = ["optimisation_problem"]
+
+    def setup(self, optimisation_problem):
+        def read(name):
+            return pd.read_csv(
+                os.path.join(pbparam.__path__[0], "input", "data", name)
+            )
+
+        if optimisation_problem == "DataFit":
+            import pybamm
+
+            data = read("LGM50_789_1C_25degC.csv")
+            data = data[data["Time [s]"] < 3500]
+            simulation = pybamm.Simulation(
+                pybamm.lithium_ion.SPM(),
+                parameter_values=pybamm.ParameterValues("Chen2020"),
+                solver=pybamm.CasadiSolver(mode="fast"),
+            )
+            self.optimisation_problem = pbparam.DataFit(
+                simulation,
+                data,
+                {"Negative electrode diffusivity [m2.s-1]": (3.3e-14, (2e-16, 2e-12))},
+            )
+            # The result is built after the evaluations, so the model is built
+            self.optimisation_problem.objective_function(self.optimisation_problem.x0)
+        else:
+            self.optimisation_problem = pbparam.OCPBalance(
+                [read("anode_OCP_3_lit.csv"), read("anode_OCP_3_delit.csv")],
+                [read("anode_OCP_2_lit.csv"), read("anode_OCP_2_delit.csv")],
+            )
+            self.optimisation_problem.setup_objective_function()
+        self.x = self.optimisation_problem.x0
+        self.raw_result = OptimizeResult(
+            x=self.x, success=True, message="", fun=0.0, nfev=1
+        )
+
+    def _build_result(self):
+        return pbparam.OptimisationResult(
+            self.x,
+            True,
+            "",
+            0.0,
+            self.raw_result,
+            self.optimisation_problem,
+            "Benchmark",
+        )
+
+    def time_build(self, optimisation_problem):
+        self._build_result()
+
+    def peakmem_build(self, optimisation_problem):
+        self._build_result()
@@ -3,37 +3,80 @@
 #
 from pbparam.version import __version__
 
-#
-# Cost Function
-#
-from .cost_functions.base_cost_function import BaseCostFunction
-from .cost_functions.mle import MLE
-from .cost_functions.rmse import RMSE
+import importlib
 
-#
-# Optimisers
-#
-from .optimisers.base_optimiser import BaseOptimiser
-from .optimisers.scipy_minimize import ScipyMinimize
-from .optimisers.scipy_differential_evolution import ScipyDifferentialEvolution
+# The public classes are imported lazily, on first access, so that `import pbparam`
+# does not pay for importing PyBaMM, SciPy and pandas until they are needed
+_LAZY_IMPORTS = {
+    #
+    # Cost Function
+    #
+    "BaseCostFunction": ".cost_functions.base_cost_function",
+    "MLE": ".cost_functions.mle",
+    "RMSE": ".cost_functions.rmse",
+    #
+    # Optimisers
+    #
+    "BaseOptimiser": ".optimisers.base_optimiser",
+    "ScipyMinimize": ".optimisers.scipy_minimize",
+    "ScipyDifferentialEvolution": ".optimisers.scipy_differential_evolution",
+    "ScipyLeastSquares": ".optimisers.scipy_least_squares",
+    #
+    # Models
+    #
+    "BasicGITT": ".models.basic_gitt",
+    "WeppnerHuggins": ".models.weppner_huggins",
+    #
+    # Optimisation problem
+    #
+    "BaseOptimisationProblem": ".optimisation_problems.base_optimisation_problem",
+    "DataFit": ".optimisation_problems.data_fit",
+    "OCPBalance": ".optimisation_problems.OCP_balance",
+    "GITT": ".optimisation_problems.gitt",
+    #
+    # Optimisation result
+    #
+    "OptimisationResult": ".optimisation_result",
+    #
+    # Evaluation cache and store
+    #
+    "EvaluationCache": ".evaluation_cache",
+    "EvaluationStore": ".evaluation_store",
+    "EvaluationTimer": ".evaluation_timer",
+    "EvaluationHistory": ".evaluation_history",
+    "Profiler": ".profiler",
+    #
+    # Model cache
+    #
+    "ModelCache": ".model_cache",
+    #
+    # Evaluators
+    #
+    "BaseEvaluator": ".evaluators.base_evaluator",
+    "ProcessPoolEvaluator": ".evaluators.process_pool_evaluator",
+    "ThreadPoolEvaluator": ".evaluators.thread_pool_evaluator",
+    "DistributedEvaluator": ".evaluators.distributed_evaluator",
+    #
+    # Finite differences
+    #
+    "ParallelFiniteDifference": ".finite_difference",
+}
 
-#
-# Models
-#
-from .models.basic_gitt import BasicGITT
-from .models.weppner_huggins import WeppnerHuggins
+__all__ = list(_LAZY_IMPORTS)
 
-#
-# Optimisation problem
-#
-from .optimisation_problems.base_optimisation_problem import BaseOptimisationProblem
-from .optimisation_problems.data_fit import DataFit
-from .optimisation_problems.OCP_balance import OCPBalance
-from .optimisation_problems.gitt import GITT
 
-#
-# Optimisation result
-#
-from .optimisation_result import OptimisationResult
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    value = getattr(importlib.import_module(_LAZY_IMPORTS[name], __name__), name)
+    # Cache the class so later accesses do not go through __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
 
 __version__ = 0.1
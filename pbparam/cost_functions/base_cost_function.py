@@ -2,6 +2,44 @@
 # Base cost function class
 #
 
+import numpy as np
+
+
+def _sum_of_squares(y_sim, y_data, weights, nan_mask, counts, out):
+    """
+    Return the sum of the squared errors of each variable stacked as the rows of
+    two dimensional arrays, weighted if `weights` is not None, and the number of
+    points they are summed over, ignoring the NaNs of the data and the simulation
+    like :func:`numpy.nansum` (see :meth:`BaseCostFunction.evaluate_stacked` for
+    the arguments). The squared errors are computed in place in `out`.
+    """
+    if nan_mask is None:
+        nan_mask = np.isnan(y_data)
+    if counts is None:
+        counts = nan_mask.shape[-1] - np.count_nonzero(nan_mask, axis=-1)
+    if out is None:
+        out = np.empty(np.shape(y_data))
+
+    np.subtract(y_sim, y_data, out=out)
+    if weights is not None:
+        out *= weights
+    out *= out
+    np.copyto(out, 0, where=nan_mask)
+    sums = out.sum(axis=-1)
+
+    # The simulation can have missing values too (e.g. if it stopped before the end
+    # of the data), which are only found by scanning the errors of these variables
+    missing = np.flatnonzero(np.isnan(sums))
+    if len(missing):
+        counts = np.array(counts)
+        for i in missing:
+            nan_sim = np.isnan(out[i])
+            np.copyto(out[i], 0, where=nan_sim)
+            sums[i] = out[i].sum()
+            counts[i] -= np.count_nonzero(nan_sim)
+
+    return sums, counts
+
 
 class BaseCostFunction:
     """
@@ -36,3 +74,75 @@ class BaseCostFunction:
 
         """
         pass
+
+    def evaluate_stacked(
+        self, y_sim, y_data, weights, sd=None, nan_mask=None, counts=None, out=None
+    ):
+        """
+        Evaluate the cost of a prediction of variables sampled at the same points,
+        stacked as the rows of two dimensional arrays. This is the fast path used
+        by :class:`pbparam.DataFit`: subclasses can override it to compute the cost
+        of all the variables with array operations, in the preallocated `out`
+        buffer, and using the mask and counts of the missing data computed once.
+        By default it calls :meth:`evaluate` with the rows.
+
+        Parameters
+        ----------
+        y_sim : numpy.ndarray
+            predicted values, with shape (number of variables, number of points)
+        y_data : numpy.ndarray
+            actual values, with the same shape
+        weights : numpy.ndarray
+            weights of each point, with the same shape
+        sd : list, optional
+            standard deviation of error of each variable, not all cost function
+            need it.
+        nan_mask : numpy.ndarray, optional
+            boolean array, True where `y_data` is NaN. If None, it is computed from
+            `y_data`.
+        counts : numpy.ndarray, optional
+            the number of points of each variable where `y_data` is not NaN. If
+            None, it is computed from `nan_mask`.
+        out : numpy.ndarray, optional
+            buffer with the same shape as `y_data` to hold the intermediate
+            results, which may be `y_sim` itself. If None, a new array is used.
+
+        Returns
+        -------
+        cost : float
+            The cost of the prediction
+        """
+        return self.evaluate(list(np.asarray(y_sim)), list(y_data), list(weights), sd)
+
+    def evaluate_with_gradient(self, y_sim, y_data, weights, sd, dy_sim):
+        """
+        Placeholder method for evaluating the cost of a prediction and its gradient
+
+        Subclasses will override this method to provide specific implementations
+
+        Parameters
+        ----------
+        y_sim : array-like
+            predicted values
+        y_data: array-like
+            actual values
+        weights: dict, optional
+            weights of the parameters
+        sd : float
+            standard deviation of error, not all cost function need it.
+        dy_sim : array-like
+            sensitivities of the predicted values with respect to the model
+            parameters, with shape (number of points, number of parameters)
+
+        Returns
+        -------
+        cost : float
+            The cost of the prediction
+        cost_gradient : numpy.ndarray
+            The derivative of the cost with respect to each model parameter
+        sd_gradient : numpy.ndarray
+            The derivative of the cost with respect to each standard deviation
+        """
+        raise NotImplementedError(
+            "evaluate_with_gradient not defined for {}".format(self.name)
+        )
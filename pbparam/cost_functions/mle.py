@@ -3,8 +3,12 @@
 #
 
 import pbparam
+import math
 import numpy as np
-import scipy.stats as stats
+from pbparam.cost_functions.base_cost_function import _sum_of_squares
+
+# Constant term of the negative log-likelihood of each point, log(sqrt(2 pi))
+_LOG_SQRT_2PI = 0.5 * math.log(2 * math.pi)
 
 
 class MLE(pbparam.BaseCostFunction):
@@ -12,8 +16,19 @@ class MLE(pbparam.BaseCostFunction):
     Maximum Likelihood Estimation (MLE) class, to evaluate error of simulation
     dataset to true dataset.
 
+    If `profiled` is True, the standard deviations of the errors are not
+    optimisation parameters but profiled out: for given errors, the likelihood is
+    maximal for the standard deviation sqrt(SSE / n) of each variable, where n is
+    the number of points and SSE the sum of their squared errors, so the cost is
+    evaluated at these standard deviations. The optimiser only searches the
+    model parameters, and the estimated standard deviations are added to the
+    `result_dict` of the optimisation result.
+
     Parameters
     ----------
+    profiled : bool, optional
+            Whether to profile the standard deviations out of the optimisation.
+            The default is False.
     y_sim : array or list
             contains simulation data points
     y_data : array or list
@@ -30,21 +45,233 @@ class MLE(pbparam.BaseCostFunction):
     """
 
     # Initializing the class and giving it a name
-    def __init__(self):
+    def __init__(self, profiled=False):
         self.name = "Maximum Likelihood Estimation"
+        self.profiled = profiled
 
     # Define the evaluate method which will calculate the MLE
     def evaluate(self, y_sim, y_data, weights, sd):
+        """
+        Evaluate the MLE cost function, the negative log-likelihood of the data
+        under Gaussian errors. It is computed in closed form, as
+        n log(sd) + n log(sqrt(2 pi)) + SSE / (2 sd^2) for each variable, where n is
+        the number of points that are not NaN and SSE the sum of their squared
+        errors, which matches the sum of the log-densities of scipy.stats.norm
+        up to rounding. Variables whose standard deviation is not positive add
+        nothing, as their log-densities are NaN. If the MLE is profiled, `sd` is
+        not used and the estimated standard deviations are used instead.
+
+        Parameters
+        ----------
+        y_sim : array or list
+            contains simulation data points
+        y_data : array or list
+            contains reference data points
+        weights : array or list
+            This variable will NOT be used in MLE.
+        sd : float or list
+            standard deviation of the error of each variable, not used if the MLE
+            is profiled
+
+        Returns
+        -------
+        MLE : float
+            Calculated MLE for given inputs.
+        """
         y_sim = y_sim if isinstance(y_sim, list) else [y_sim]
         y_data = y_data if isinstance(y_data, list) else [y_data]
         sd = sd if isinstance(sd, list) else [sd]
 
+        sums, counts = self._sum_of_squares(y_sim, y_data)
+        return self._negative_log_likelihood(sums, counts, sd)
+
+    def evaluate_stacked(
+        self, y_sim, y_data, weights, sd=None, nan_mask=None, counts=None, out=None
+    ):
+        """
+        Evaluate the MLE cost function for variables stacked as the rows of two
+        dimensional arrays (see :meth:`pbparam.BaseCostFunction.evaluate_stacked`),
+        computing the squared errors of all the variables in place in `out`.
+
+        Parameters
+        ----------
+        y_sim : numpy.ndarray
+            contains simulation data points, with shape (number of variables,
+            number of points)
+        y_data : numpy.ndarray
+            contains reference data points, with the same shape
+        weights : numpy.ndarray
+            This variable will NOT be used in MLE.
+        sd : list
+            standard deviation of the error of each variable
+        nan_mask : numpy.ndarray, optional
+            boolean array, True where `y_data` is NaN. If None, it is computed from
+            `y_data`.
+        counts : numpy.ndarray, optional
+            the number of points of each variable where `y_data` is not NaN. If
+            None, it is computed from `nan_mask`.
+        out : numpy.ndarray, optional
+            buffer with the same shape as `y_data` for the squared errors, which
+            may be `y_sim` itself. If None, a new array is used.
+
+        Returns
+        -------
+        MLE : float
+            Calculated MLE for given inputs.
+        """
+        sums, counts = _sum_of_squares(y_sim, y_data, None, nan_mask, counts, out)
+        return self._negative_log_likelihood(sums.tolist(), counts.tolist(), sd)
+
+    def _sum_of_squares(self, y_sim, y_data):
+        """
+        Return the sum of the squared errors of each variable and the number of
+        points they are summed over, ignoring the NaNs.
+        """
+        sums = []
+        counts = []
+        for sim, data in zip(y_sim, y_data):
+            err = np.subtract(sim, data, dtype=float)
+            np.square(err, out=err)
+            missing = np.isnan(err)
+            np.copyto(err, 0, where=missing)
+            sums.append(err.sum())
+            counts.append(err.size - np.count_nonzero(missing))
+        return sums, counts
+
+    def _negative_log_likelihood(self, sums, counts, sd):
+        """
+        Return the negative log-likelihood from the sum of the squared errors and
+        the number of points of each variable, and their standard deviations or
+        the estimated ones if the MLE is profiled. The variables are few, so their
+        terms are combined as Python floats.
+        """
         mle = 0
-        for sim, data, s in zip(y_sim, y_data, sd):
-            mle += -np.nansum(stats.norm.logpdf(data, loc=sim, scale=s))
+        if self.profiled:
+            # At the estimated standard deviation, SSE / (2 sd^2) = n / 2
+            for total, count in zip(sums, counts):
+                if count == 0:
+                    continue
+                if total == 0:
+                    return -math.inf
+                mle += count * (0.5 * math.log(total / count) + _LOG_SQRT_2PI + 0.5)
+            return mle
 
+        for total, count, s in zip(sums, counts, sd):
+            if s > 0:
+                mle += count * (math.log(s) + _LOG_SQRT_2PI) + total / (2 * s**2)
         return mle
 
+    def estimate_sd(self, y_sim, y_data):
+        """
+        Estimate the standard deviation of the error of each variable, which
+        maximises the likelihood for the given errors: sqrt(SSE / n), where n is
+        the number of points that are not NaN and SSE the sum of their squared
+        errors.
+
+        Parameters
+        ----------
+        y_sim : array or list
+            contains simulation data points
+        y_data : array or list
+            contains reference data points
+
+        Returns
+        -------
+        sd : list
+            The estimated standard deviation of each variable.
+        """
+        y_sim = y_sim if isinstance(y_sim, list) else [y_sim]
+        y_data = y_data if isinstance(y_data, list) else [y_data]
+        sums, counts = self._sum_of_squares(y_sim, y_data)
+        return [
+            math.sqrt(total / count) if count else math.nan
+            for total, count in zip(sums, counts)
+        ]
+
+    def estimate_parameters(self, y_sim, y_data, variables):
+        """
+        Estimate the standard deviations profiled out of the optimisation, named
+        like the parameters of :meth:`_get_parameters`. If the MLE is not profiled,
+        the standard deviations are optimisation parameters and nothing is
+        estimated.
+
+        Parameters
+        ----------
+        y_sim : array or list
+            contains simulation data points
+        y_data : array or list
+            contains reference data points
+        variables : list
+            The names of the variables.
+
+        Returns
+        -------
+        parameters : dict
+            Dictionary of the estimated standard deviations.
+        """
+        if not self.profiled:
+            return {}
+        return dict(
+            zip(self._sd_names(variables), self.estimate_sd(y_sim, y_data))
+        )
+
+    def evaluate_with_gradient(self, y_sim, y_data, weights, sd, dy_sim):
+        """
+        Evaluate the MLE and its gradient with respect to the model parameters and
+        the standard deviations.
+
+        Parameters
+        ----------
+        y_sim : array or list
+            contains simulation data points
+        y_data : array or list
+            contains reference data points
+        weights : array or list
+            This variable will NOT be used in MLE.
+        sd : float or list
+            standard deviation of the error of each variable, not used if the MLE
+            is profiled
+        dy_sim : array or list
+            contains the sensitivities of the simulation data points with respect to
+            the model parameters, with shape (number of points, number of
+            parameters)
+
+        Returns
+        -------
+        MLE : float
+            Calculated MLE for given inputs.
+        gradient : array
+            Derivative of the MLE with respect to each model parameter.
+        sd_gradient : array
+            Derivative of the MLE with respect to each standard deviation, which is
+            empty if the MLE is profiled.
+        """
+        y_sim = y_sim if isinstance(y_sim, list) else [y_sim]
+        y_data = y_data if isinstance(y_data, list) else [y_data]
+        sd = sd if isinstance(sd, list) else [sd]
+        dy_sim = dy_sim if isinstance(dy_sim, list) else [dy_sim]
+
+        mle = self.evaluate(y_sim, y_data, weights, sd)
+        if self.profiled:
+            # The derivative of the profiled MLE with respect to the model
+            # parameters is the one of the MLE at the estimated standard deviations
+            sd = self.estimate_sd(y_sim, y_data)
+        gradient = np.zeros(np.shape(dy_sim[0])[1])
+        sd_gradient = np.zeros(len(sd))
+
+        for i, (sim, data, s, dsim) in enumerate(zip(y_sim, y_data, sd, dy_sim)):
+            err = np.asarray(sim - data, dtype=float)
+            mask = ~np.isnan(err)
+            err = err[mask]
+            # d(MLE)/dp = sum((sim - data) / s^2 * dsim/dp)
+            gradient += err @ np.asarray(dsim)[mask] / s**2
+            # d(MLE)/ds = sum(1 / s - (sim - data)^2 / s^3)
+            sd_gradient[i] = err.size / s - np.sum(err**2) / s**3
+
+        if self.profiled:
+            sd_gradient = np.zeros(0)
+        return mle, gradient, sd_gradient
+
     def _get_parameters(self, variables):
         """
         Get the optimisation parameters introduced by the cost function.
@@ -59,9 +286,16 @@ class MLE(pbparam.BaseCostFunction):
         parameters : dict
             Dictionary of parameters.
         """
-        parameters = {}
-        for variable in variables:
-            name = "Standard deviation of " + variable[0].lower() + variable[1:]
-            # TODO: provide better guesses for the bounds
-            parameters[name] = (1, (1e-16, 1e3))
-        return parameters
+        if self.profiled:
+            return {}
+        # TODO: provide better guesses for the bounds
+        return {name: (1, (1e-16, 1e3)) for name in self._sd_names(variables)}
+
+    def _sd_names(self, variables):
+        """
+        Return the names of the standard deviations of the variables.
+        """
+        return [
+            "Standard deviation of " + variable[0].lower() + variable[1:]
+            for variable in variables
+        ]
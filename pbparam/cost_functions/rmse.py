@@ -3,7 +3,9 @@
 #
 
 import pbparam
+import math
 import numpy as np
+from pbparam.cost_functions.base_cost_function import _sum_of_squares
 
 
 class RMSE(pbparam.BaseCostFunction):
@@ -70,6 +72,102 @@ class RMSE(pbparam.BaseCostFunction):
 
         return np.array(rmse)
 
+    def evaluate_stacked(
+        self, y_sim, y_data, weights, sd=None, nan_mask=None, counts=None, out=None
+    ):
+        """
+        Evaluate RMSE cost function for variables stacked as the rows of two
+        dimensional arrays (see :meth:`pbparam.BaseCostFunction.evaluate_stacked`).
+        The weighted squared errors are computed in place in `out`, and the missing
+        data are excluded with `nan_mask` instead of scanning the errors for NaNs,
+        giving the same result as :meth:`evaluate`.
+
+        Parameters
+        ----------
+        y_sim : numpy.ndarray
+            contains simulation data points, with shape (number of variables,
+            number of points)
+        y_data : numpy.ndarray
+            contains reference data points, with the same shape
+        weights : numpy.ndarray
+            contains custom weights for each data point, with the same shape
+        sd : array or list, optional
+            This variable will NOT be used in RMSE. Default is None.
+        nan_mask : numpy.ndarray, optional
+            boolean array, True where `y_data` is NaN. If None, it is computed from
+            `y_data`.
+        counts : numpy.ndarray, optional
+            the number of points of each variable where `y_data` is not NaN. If
+            None, it is computed from `nan_mask`.
+        out : numpy.ndarray, optional
+            buffer with the same shape as `y_data` for the squared errors, which
+            may be `y_sim` itself. If None, a new array is used.
+
+        Returns
+        -------
+        RMSE : array
+            Calculated RMSE for given inputs.
+        """
+        sums, counts = _sum_of_squares(y_sim, y_data, weights, nan_mask, counts, out)
+
+        # The variables are few, so their errors are combined as Python floats
+        rmse = 0
+        for total, count in zip(sums.tolist(), counts.tolist()):
+            rmse += math.sqrt(total / count) if count else math.nan
+
+        return np.array(rmse)
+
+    def evaluate_with_gradient(self, y_sim, y_data, weights, sd, dy_sim):
+        """
+        Evaluate RMSE cost function and its gradient with respect to the model
+        parameters.
+
+        Parameters
+        ----------
+        y_sim : array or list
+            contains simulation data points
+        y_data : array or list
+            contains reference data points
+        weights : array or list
+             contains custom weights for each data point.
+        sd : array or list
+            This variable will NOT be used in RMSE.
+        dy_sim : array or list
+            contains the sensitivities of the simulation data points with respect to
+            the model parameters, with shape (number of points, number of
+            parameters)
+
+        Returns
+        -------
+        RMSE : array
+            Calculated RMSE for given inputs.
+        gradient : array
+            Derivative of the RMSE with respect to each model parameter.
+        sd_gradient : array
+            Derivative of the RMSE with respect to each standard deviation, which
+            is empty as RMSE does not use them.
+        """
+        y_sim = y_sim if isinstance(y_sim, list) else [y_sim]
+        y_data = y_data if isinstance(y_data, list) else [y_data]
+        weights = weights if isinstance(weights, list) else [weights]
+        dy_sim = dy_sim if isinstance(dy_sim, list) else [dy_sim]
+
+        rmse = 0
+        gradient = np.zeros(np.shape(dy_sim[0])[1])
+
+        for sim, data, weight, dsim in zip(y_sim, y_data, weights, dy_sim):
+            err = (sim - data) * weight
+            mask = ~np.isnan(err)
+            n = np.count_nonzero(mask)
+            rmse_variable = np.sqrt(np.sum(err[mask] ** 2) / n)
+            rmse += rmse_variable
+            # d(RMSE)/dp = sum(err * weight * dsim/dp) / (n * RMSE)
+            if rmse_variable > 0:
+                derr = np.broadcast_to(err * weight, err.shape)[mask]
+                gradient += derr @ np.asarray(dsim)[mask] / (n * rmse_variable)
+
+        return np.array(rmse), gradient, np.zeros(0)
+
     def _get_parameters(self, variables):
         """
         Get the optimisation parameters introduced by the cost function.
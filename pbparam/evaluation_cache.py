@@ -0,0 +1,128 @@
+#
+# Evaluation cache class
+#
+
+from collections import OrderedDict
+import numpy as np
+
+
+def evaluation_key(x, decimals=12):
+    """
+    Build the key used to store the evaluation of a parameter vector.
+
+    Parameters
+    ----------
+    x : array-like
+        The scaled parameter vector.
+    decimals : int, optional
+        The number of decimals used to round `x`. The default is 12.
+
+    Returns
+    -------
+    key : bytes
+        The key associated to `x`.
+    """
+    # Adding 0.0 turns -0.0 into 0.0 so both give the same key
+    x = np.round(np.asarray(x, dtype=float), decimals) + 0.0
+    return x.tobytes()
+
+
+class EvaluationCache(object):
+    """
+    Least-recently-used cache of objective function evaluations. The cache is keyed
+    on the scaled parameter vector `x`, rounded to a given number of decimals so
+    that vectors which only differ by floating point noise share the same entry.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of evaluations to store. When the cache is full, the
+        least recently used entry is discarded. If None, the cache grows without
+        bound. The default is 1024.
+    decimals : int, optional
+        The number of decimals used to round `x` before building the key. The
+        default is 12.
+    """
+
+    def __init__(self, maxsize=1024, decimals=12):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be a positive integer or None")
+
+        self.maxsize = maxsize
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def key(self, x):
+        """
+        Build the cache key for a given parameter vector.
+
+        Parameters
+        ----------
+        x : array-like
+            The scaled parameter vector.
+
+        Returns
+        -------
+        key : bytes
+            The key associated to `x`.
+        """
+        return evaluation_key(x, self.decimals)
+
+    def get(self, key, default=None):
+        """
+        Retrieve a cached value and mark it as the most recently used.
+
+        Parameters
+        ----------
+        key : bytes
+            The key, as returned by :meth:`key`.
+        default : object, optional
+            The value to return if the key is not in the cache.
+
+        Returns
+        -------
+        value : object
+            The cached value, or `default` if it is not in the cache.
+        """
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """
+        Store a value in the cache, evicting the least recently used entry if the
+        cache is full.
+
+        Parameters
+        ----------
+        key : bytes
+            The key, as returned by :meth:`key`.
+        value : object
+            The value to store.
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self.maxsize is not None and len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all the entries from the cache and reset the counters.
+        """
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,220 @@
+#
+# Evaluation history class
+#
+
+import os
+import time
+import numpy as np
+
+# Statuses of the evaluations, stored as their index
+STATUSES = ["success", "failed", "error", "aborted"]
+_STATUS_CODES = {status: code for code, status in enumerate(STATUSES)}
+
+
+class EvaluationHistory(object):
+    """
+    History of the objective function evaluations of an optimisation problem,
+    holding for each evaluation the parameter vector `x`, the cost, the time at
+    which it finished (in seconds since the history was created or reset) and its
+    status. The records are stored in a preallocated NumPy buffer which doubles in
+    size when full, so recording an evaluation does not create Python objects.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        The maximum number of evaluations to keep. Once reached, the oldest
+        evaluations are overwritten by the new ones, so the memory used is bounded.
+        The best evaluation is always available through :attr:`best_x` and
+        :attr:`best_cost`. If None, the history grows without bound. The default is
+        None.
+    filename : str, optional
+        If provided, the buffer is memory-mapped to this file instead of being held
+        in memory, so long histories are paged out to disk. The file is a scratch
+        buffer overwritten when the history is created or reset. When the history is
+        pickled (e.g. sent to a worker process), the copy is held in memory.
+    """
+
+    def __init__(self, maxsize=None, filename=None):
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.filename = None if filename is None else os.fspath(filename)
+        self.reset()
+
+    def __getstate__(self):
+        # The copies do not write to the file of the history
+        state = self.__dict__.copy()
+        state["filename"] = None
+        if self._buffer is not None:
+            state["_buffer"] = np.array(self._buffer)
+        del state["_fields"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._buffer is None:
+            self._fields = None
+        else:
+            self._fields = [self._buffer[name] for name in self._buffer.dtype.names]
+
+    def reset(self):
+        """
+        Discard the recorded evaluations.
+        """
+        self._buffer = None
+        self._fields = None
+        self._start = 0
+        self._count = 0
+        self.n_recorded = 0
+        self.best_x = None
+        self.best_cost = np.inf
+        self.start_time = time.perf_counter()
+
+    def _allocate(self, dtype, capacity):
+        """
+        Allocate a buffer for `capacity` records, copying the current records.
+        """
+        if self.filename is None:
+            buffer = np.zeros(capacity, dtype=dtype)
+            if self._buffer is not None:
+                buffer[: self._count] = self._buffer[: self._count]
+        else:
+            # Growing the file keeps the records already written to it
+            if self._buffer is not None:
+                self._buffer.flush()
+                self._buffer = None
+            mode = "w+" if self._count == 0 else "r+"
+            with open(self.filename, mode + "b") as file:
+                file.truncate(capacity * dtype.itemsize)
+            buffer = np.memmap(self.filename, dtype=dtype, mode="r+", shape=capacity)
+        self._buffer = buffer
+        # Writing to the fields is faster than to the records
+        self._fields = [buffer[name] for name in dtype.names]
+
+    def record(self, x, cost, status):
+        """
+        Record an evaluation.
+
+        Parameters
+        ----------
+        x : array-like
+            The parameter vector.
+        cost : float
+            The value of the objective function.
+        status : str
+            The status of the evaluation: "success", "failed", "error" or
+            "aborted" (see :meth:`pbparam.EvaluationStore.set`).
+        """
+        x = np.asarray(x, dtype=float).ravel()
+        if self._buffer is None:
+            dtype = np.dtype(
+                [
+                    ("x", float, (len(x),)),
+                    ("cost", float),
+                    ("time", float),
+                    ("status", np.uint8),
+                ]
+            )
+            capacity = 64 if self.maxsize is None else min(64, self.maxsize)
+            self._allocate(dtype, capacity)
+        elif len(x) != self._buffer.dtype["x"].shape[0]:
+            raise ValueError(
+                "Expected x of length {}, got {}".format(
+                    self._buffer.dtype["x"].shape[0], len(x)
+                )
+            )
+
+        capacity = len(self._buffer)
+        if self._count == capacity:
+            if self.maxsize is None or capacity < self.maxsize:
+                new_capacity = 2 * capacity
+                if self.maxsize is not None:
+                    new_capacity = min(new_capacity, self.maxsize)
+                self._allocate(self._buffer.dtype, new_capacity)
+                index = self._count
+                self._count += 1
+            else:
+                # Overwrite the oldest record
+                index = self._start
+                self._start = (self._start + 1) % capacity
+        else:
+            index = self._count
+            self._count += 1
+
+        xs, costs, times, statuses = self._fields
+        xs[index] = x
+        costs[index] = cost
+        times[index] = time.perf_counter() - self.start_time
+        statuses[index] = _STATUS_CODES[status]
+        self.n_recorded += 1
+
+        if status == "success" and cost < self.best_cost:
+            self.best_cost = float(cost)
+            self.best_x = x.copy()
+
+    def __len__(self):
+        return self._count
+
+    def _records(self):
+        """
+        Return the records in the order they were recorded.
+        """
+        if self._buffer is None:
+            return None
+        if self._start == 0:
+            return self._buffer[: self._count]
+        return np.concatenate(
+            [self._buffer[self._start : self._count], self._buffer[: self._start]]
+        )
+
+    @property
+    def x(self):
+        """
+        The parameter vectors, as a two dimensional array with one row per
+        evaluation.
+        """
+        records = self._records()
+        if records is None:
+            return np.empty((0, 0))
+        return np.array(records["x"])
+
+    @property
+    def costs(self):
+        """
+        The cost of each evaluation.
+        """
+        records = self._records()
+        return np.empty(0) if records is None else np.array(records["cost"])
+
+    @property
+    def times(self):
+        """
+        The time at which each evaluation finished, in seconds since the history
+        was created or reset.
+        """
+        records = self._records()
+        return np.empty(0) if records is None else np.array(records["time"])
+
+    @property
+    def statuses(self):
+        """
+        The status of each evaluation.
+        """
+        records = self._records()
+        if records is None:
+            return np.empty(0, dtype=str)
+        return np.array(STATUSES)[records["status"]]
+
+    def best_costs(self):
+        """
+        Return the best cost found after each evaluation kept in the history,
+        ignoring the evaluations that were not successful. This is the convergence
+        trace of the optimisation.
+
+        Returns
+        -------
+        numpy.ndarray
+            The running minimum of the costs.
+        """
+        costs = np.where(self.statuses == "success", self.costs, np.inf)
+        return np.minimum.accumulate(costs)
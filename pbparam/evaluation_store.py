@@ -0,0 +1,156 @@
+#
+# Evaluation store class
+#
+
+import os
+import sqlite3
+import numpy as np
+
+from pbparam.evaluation_cache import evaluation_key
+
+
+class EvaluationStore(object):
+    """
+    Persistent store of objective function evaluations, backed by an SQLite file.
+    Each record holds the scaled parameter vector `x`, the cost and the solver
+    status, and is grouped under the fingerprint of the optimisation problem that
+    produced it (see :meth:`pbparam.BaseOptimisationProblem.fingerprint`). This
+    allows a fit to be resumed or warm-started without solving the model again.
+
+    Parameters
+    ----------
+    filename : str
+        The path of the SQLite file. It is created if it does not exist.
+    decimals : int, optional
+        The number of decimals used to round `x` when building the keys. The
+        default is 12.
+    """
+
+    def __init__(self, filename, decimals=12):
+        self.filename = os.fspath(filename)
+        self.decimals = decimals
+        self._connection = None
+        self._pid = None
+
+    def __getstate__(self):
+        # SQLite connections cannot be pickled nor shared between processes, so a
+        # new one is opened the first time the store is used after unpickling
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_pid"] = None
+        return state
+
+    @property
+    def connection(self):
+        if self._connection is None or self._pid != os.getpid():
+            # The connection can be used by several threads, as the optimisation
+            # problems only use it while holding their evaluation lock
+            self._connection = sqlite3.connect(
+                self.filename, timeout=60, check_same_thread=False
+            )
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS evaluations ("
+                "fingerprint TEXT, key BLOB, x BLOB, cost REAL, status TEXT, "
+                "PRIMARY KEY (fingerprint, key))"
+            )
+            self._connection.commit()
+            self._pid = os.getpid()
+        return self._connection
+
+    def get(self, fingerprint, x):
+        """
+        Retrieve the stored evaluation of a parameter vector. Evaluations whose
+        solve raised an error or was aborted early are ignored, so they are
+        attempted again.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the optimisation problem.
+        x : array-like
+            The scaled parameter vector.
+
+        Returns
+        -------
+        cost : float or None
+            The stored cost, or None if `x` has not been evaluated.
+        """
+        row = self.connection.execute(
+            "SELECT cost FROM evaluations WHERE fingerprint = ? AND key = ? "
+            "AND status NOT IN ('error', 'aborted')",
+            (fingerprint, evaluation_key(x, self.decimals)),
+        ).fetchone()
+        if row is None:
+            return None
+        # SQLite stores NaN as NULL
+        return np.nan if row[0] is None else row[0]
+
+    def set(self, fingerprint, x, cost, status):
+        """
+        Record the evaluation of a parameter vector.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the optimisation problem.
+        x : array-like
+            The scaled parameter vector.
+        cost : float
+            The value of the objective function.
+        status : str
+            The status of the evaluation: "success", "failed" (the cost is not
+            finite), "error" (the solve raised an exception) or "aborted" (the
+            solve was stopped early and the cost is not known).
+        """
+        x = np.asarray(x, dtype=float)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?)",
+                (
+                    fingerprint,
+                    evaluation_key(x, self.decimals),
+                    x.tobytes(),
+                    float(cost),
+                    status,
+                ),
+            )
+
+    def records(self, fingerprint):
+        """
+        Retrieve all the evaluations stored for an optimisation problem, sorted by
+        increasing cost. This is useful to warm-start an optimiser, for example using
+        the best vectors as the initial guess or initial population.
+
+        Parameters
+        ----------
+        fingerprint : str
+            The fingerprint of the optimisation problem.
+
+        Returns
+        -------
+        x : numpy.ndarray
+            Two dimensional array where each row is a parameter vector.
+        costs : numpy.ndarray
+            The cost of each parameter vector.
+        statuses : list of str
+            The status of each evaluation.
+        """
+        rows = self.connection.execute(
+            "SELECT x, cost, status FROM evaluations WHERE fingerprint = ? "
+            "ORDER BY cost IS NULL, cost",
+            (fingerprint,),
+        ).fetchall()
+        x = np.array([np.frombuffer(row[0]) for row in rows])
+        costs = np.array([np.nan if row[1] is None else row[1] for row in rows])
+        statuses = [row[2] for row in rows]
+        return x, costs, statuses
+
+    def close(self):
+        """
+        Close the connection to the SQLite file.
+        """
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._pid = None
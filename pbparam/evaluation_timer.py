@@ -0,0 +1,136 @@
+#
+# Evaluation timer class
+#
+
+import array
+import functools
+import time
+import numpy as np
+
+
+def timed_phase(phase):
+    """
+    Decorator timing a method of an optimisation problem as a phase of the
+    evaluations, when the timer of the problem is enabled (see
+    :meth:`pbparam.BaseOptimisationProblem.enable_timing`). When it is disabled, the
+    overhead is an extra function call checking the `timer` attribute, below a
+    microsecond.
+
+    Parameters
+    ----------
+    phase : str
+        The name of the phase.
+    """
+
+    def decorator(method):
+        @functools.wraps(method)
+        def timed_method(self, *args, **kwargs):
+            timer = self.timer
+            if timer is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                timer.add(phase, time.perf_counter() - start)
+
+        return timed_method
+
+    return decorator
+
+
+class EvaluationTimer(object):
+    """
+    Timer of the phases of the objective function evaluations of an optimisation
+    problem, e.g. building the model, solving it, reading the variables from the
+    solution and evaluating the cost function. The duration of each call is
+    recorded, and summarised by :meth:`summary`.
+
+    The phases can be nested, and their times include those of the phases they
+    contain (e.g. the "objective_function" phase includes all the others).
+    """
+
+    def __init__(self):
+        self._durations = {}
+
+    def add(self, phase, seconds):
+        """
+        Record the duration of a call of a phase.
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase.
+        seconds : float
+            The duration of the call.
+        """
+        durations = self._durations.get(phase)
+        if durations is None:
+            # setdefault is atomic, so threads sharing the timer keep all the calls
+            durations = self._durations.setdefault(phase, array.array("d"))
+        durations.append(seconds)
+
+    def durations(self, phase):
+        """
+        Return the durations of the calls of a phase.
+
+        Parameters
+        ----------
+        phase : str
+            The name of the phase.
+
+        Returns
+        -------
+        numpy.ndarray
+            The duration of each call, in seconds.
+        """
+        return np.array(self._durations.get(phase, []))
+
+    def summary(self):
+        """
+        Summarise the durations of each phase.
+
+        Returns
+        -------
+        profile : dict
+            Dictionary with a key per phase and as values dictionaries with the
+            number of calls ("count") and the total ("total"), median ("p50"), 95th
+            percentile ("p95") and maximum ("max") durations in seconds.
+        """
+        profile = {}
+        for phase, durations in self._durations.items():
+            durations = np.frombuffer(durations, dtype=float)
+            p50, p95 = np.percentile(durations, [50, 95])
+            profile[phase] = {
+                "count": len(durations),
+                "total": float(np.sum(durations)),
+                "p50": float(p50),
+                "p95": float(p95),
+                "max": float(np.max(durations)),
+            }
+        return profile
+
+    def reset(self):
+        """
+        Discard the recorded durations.
+        """
+        self._durations = {}
+
+    def __str__(self):
+        lines = [
+            "{:<24}{:>8}{:>12}{:>12}{:>12}{:>12}".format(
+                "Phase", "Count", "Total [s]", "p50 [s]", "p95 [s]", "Max [s]"
+            )
+        ]
+        for phase, stats in self.summary().items():
+            lines.append(
+                "{:<24}{:>8}{:>12.4g}{:>12.4g}{:>12.4g}{:>12.4g}".format(
+                    phase,
+                    stats["count"],
+                    stats["total"],
+                    stats["p50"],
+                    stats["p95"],
+                    stats["max"],
+                )
+            )
+        return "\n".join(lines)
@@ -0,0 +1,72 @@
+#
+# Base evaluator class
+#
+
+import numpy as np
+
+
+class BaseEvaluator(object):
+    """
+    Evaluate the objective function of an optimisation problem at batches of
+    points. The optimisers send the points they need to the evaluator, so the
+    evaluations can be run in parallel by the subclasses. This base class evaluates
+    the points one after another in the current process.
+
+    Evaluators are started by :meth:`pbparam.BaseOptimiser.optimise` and closed when
+    the optimisation finishes. They can also be used as context managers.
+
+    If the `profiler` attribute is set to a :class:`pbparam.Profiler` before
+    starting the evaluator (which :meth:`pbparam.BaseOptimiser.optimise` does when
+    profiling), the evaluators running the evaluations in other processes profile
+    them there and add the profiles to it when closed.
+    """
+
+    def __init__(self):
+        self.name = "Base evaluator"
+        self.optimisation_problem = None
+        self.profiler = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self, optimisation_problem):
+        """
+        Prepare the evaluator to evaluate an optimisation problem.
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.BaseOptimisationProblem`
+            The optimisation problem to evaluate.
+        """
+        self.close()
+        self.optimisation_problem = optimisation_problem
+
+    def close(self):
+        """
+        Release the resources used by the evaluator.
+        """
+        self.optimisation_problem = None
+
+    def evaluate(self, X):
+        """
+        Evaluate the objective function at a batch of points.
+
+        Parameters
+        ----------
+        X : array-like
+            Two dimensional array where each row is a point.
+
+        Returns
+        -------
+        costs : numpy.ndarray
+            The value of the objective function at each point.
+        """
+        if self.optimisation_problem is None:
+            raise RuntimeError("start needs to be called before evaluating points")
+        return np.array(
+            [self.optimisation_problem.evaluate(x) for x in np.atleast_2d(X)],
+            dtype=float,
+        )
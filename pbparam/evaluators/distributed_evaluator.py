@@ -0,0 +1,279 @@
+#
+# Distributed evaluator class
+#
+
+import pbparam
+import argparse
+import collections
+import multiprocessing
+import os
+import threading
+import time
+from multiprocessing.connection import Client, Listener, wait
+import numpy as np
+
+
+def run_worker(address, authkey):
+    """
+    Run a worker of a :class:`pbparam.DistributedEvaluator`. The worker connects to
+    the evaluator, receives the optimisation problem and evaluates the points it is
+    sent until the evaluator is closed. It can be run on another node with::
+
+        python -m pbparam.evaluators.distributed_evaluator HOST PORT --authkey KEY
+
+    Parameters
+    ----------
+    address : tuple
+        The host and port the evaluator listens on.
+    authkey : bytes
+        The key used to authenticate the connection.
+    """
+    with Client(tuple(address), authkey=authkey) as connection:
+        optimisation_problem = connection.recv()
+        while True:
+            try:
+                message = connection.recv()
+            except EOFError:
+                return
+            if message is None:
+                return
+            index, x = message
+            try:
+                cost = optimisation_problem.evaluate(x)
+            except Exception as error:
+                connection.send((index, None, error))
+            else:
+                connection.send((index, cost, None))
+
+
+class DistributedEvaluator(pbparam.BaseEvaluator):
+    """
+    Evaluate batches of points on workers connected over sockets, which can run on
+    other nodes. The evaluator listens on `address` and each worker (see
+    :func:`pbparam.evaluators.distributed_evaluator.run_worker`) connects to it,
+    receives the optimisation problem once and is then sent one point at a time,
+    so faster workers evaluate more points. Workers can join while an optimisation
+    is running.
+
+    If a worker is lost (its process dies or the connection drops), the point it
+    was evaluating is sent to another worker. If all the workers are lost, the
+    evaluator waits `timeout` seconds for new ones before raising an error.
+
+    For testing, or to use the processes of the current node, `local_workers`
+    processes are started on this node and connect to the evaluator like remote
+    workers.
+
+    Parameters
+    ----------
+    address : tuple, optional
+        The host and port to listen on. The default is ("localhost", 0), which only
+        accepts workers on this node and picks a free port. Use e.g.
+        ("0.0.0.0", 6000) to accept remote workers. The address actually used is
+        available as the `address` attribute once started.
+    authkey : bytes, optional
+        The key the workers need to connect. If None, a random key is generated,
+        available as the `authkey` attribute.
+    local_workers : int, optional
+        The number of worker processes to start on this node. The default is 0.
+    timeout : float, optional
+        The number of seconds to wait for a worker when there are points to
+        evaluate and none is connected. The default is 60.
+    """
+
+    def __init__(self, address=None, authkey=None, local_workers=0, timeout=60):
+        super().__init__()
+        self._requested_address = tuple(address or ("localhost", 0))
+        self.address = None
+        # The key is printable so that it can be passed to remote workers on the
+        # command line
+        self.authkey = authkey or os.urandom(16).hex().encode()
+        self.local_workers = local_workers
+        self.timeout = timeout
+        self.name = "Distributed evaluator"
+        self._listener = None
+        self._accept_thread = None
+        self._processes = []
+        self._connections = []
+        self._new_connections = []
+        self._lock = threading.Lock()
+        self._closing = False
+
+    def start(self, optimisation_problem):
+        """
+        Start listening for workers, and start the local workers.
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.BaseOptimisationProblem`
+            The optimisation problem to evaluate.
+        """
+        super().start(optimisation_problem)
+        self._closing = False
+        self._listener = Listener(self._requested_address, authkey=self.authkey)
+        self.address = self._listener.address
+
+        # The local workers are started before the thread accepting the workers,
+        # as forking a process with several threads is unsafe
+        self._processes = [
+            multiprocessing.Process(
+                target=run_worker, args=(self.address, self.authkey), daemon=True
+            )
+            for _ in range(self.local_workers)
+        ]
+        for process in self._processes:
+            process.start()
+        self._accept_thread = threading.Thread(target=self._accept, daemon=True)
+        self._accept_thread.start()
+
+    def _accept(self):
+        """
+        Accept the workers and send them the optimisation problem. It runs in a
+        background thread until the evaluator is closed.
+        """
+        while True:
+            try:
+                connection = self._listener.accept()
+            except multiprocessing.AuthenticationError:
+                continue
+            except OSError:
+                return
+            if self._closing:
+                connection.close()
+                return
+            try:
+                connection.send(self.optimisation_problem)
+            except OSError:
+                connection.close()
+                continue
+            with self._lock:
+                self._new_connections.append(connection)
+
+    def close(self):
+        """
+        Stop the workers and the listener.
+        """
+        if self._listener is not None:
+            self._closing = True
+            # Connect to the listener to wake up the thread waiting for workers
+            try:
+                Client(self.address, authkey=self.authkey).close()
+            except OSError:
+                pass
+            self._accept_thread.join()
+            self._listener.close()
+            self._listener = None
+
+            with self._lock:
+                self._connections += self._new_connections
+                self._new_connections = []
+            for connection in self._connections:
+                try:
+                    connection.send(None)
+                except OSError:
+                    pass
+                connection.close()
+            self._connections = []
+
+            for process in self._processes:
+                process.join(5)
+                if process.is_alive():
+                    process.terminate()
+            self._processes = []
+        super().close()
+
+    @property
+    def workers(self):
+        """
+        The number of connected workers.
+        """
+        with self._lock:
+            return len(self._connections) + len(self._new_connections)
+
+    def _receive_new_connections(self):
+        with self._lock:
+            self._connections += self._new_connections
+            self._new_connections = []
+
+    def evaluate(self, X):
+        """
+        Evaluate the objective function at a batch of points on the workers.
+
+        Parameters
+        ----------
+        X : array-like
+            Two dimensional array where each row is a point.
+
+        Returns
+        -------
+        costs : numpy.ndarray
+            The value of the objective function at each point.
+        """
+        if self._listener is None:
+            raise RuntimeError("start needs to be called before evaluating points")
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        costs = np.full(len(X), np.nan)
+        pending = collections.deque(range(len(X)))
+        # Point evaluated by each busy worker
+        outstanding = {}
+        failure = None
+        last_worker_time = time.monotonic()
+
+        def lose(connection):
+            # Send the point of a lost worker to the others
+            self._connections.remove(connection)
+            connection.close()
+            if connection in outstanding:
+                pending.appendleft(outstanding.pop(connection))
+
+        # After an evaluation fails, the results of the busy workers are still
+        # received so that they are not mixed up with the next batch
+        while outstanding or (pending and failure is None):
+            self._receive_new_connections()
+            for connection in list(self._connections):
+                if not pending or failure is not None:
+                    break
+                if connection in outstanding:
+                    continue
+                index = pending.popleft()
+                try:
+                    connection.send((index, X[index]))
+                except OSError:
+                    pending.appendleft(index)
+                    lose(connection)
+                else:
+                    outstanding[connection] = index
+
+            if self._connections:
+                last_worker_time = time.monotonic()
+            elif time.monotonic() - last_worker_time > self.timeout:
+                raise RuntimeError(
+                    "No worker connected within {} seconds".format(self.timeout)
+                )
+
+            # Wake up regularly to send points to the workers that join
+            for connection in wait(list(outstanding), timeout=0.1):
+                try:
+                    index, cost, error = connection.recv()
+                except (EOFError, OSError):
+                    lose(connection)
+                    continue
+                del outstanding[connection]
+                if error is not None:
+                    failure = failure or error
+                else:
+                    costs[index] = cost
+
+        if failure is not None:
+            raise failure
+        return costs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run a worker of a pbparam.DistributedEvaluator"
+    )
+    parser.add_argument("host")
+    parser.add_argument("port", type=int)
+    parser.add_argument("--authkey", required=True)
+    args = parser.parse_args()
+    run_worker((args.host, args.port), args.authkey.encode())
@@ -0,0 +1,134 @@
+#
+# Process pool evaluator class
+#
+
+import pbparam
+import multiprocessing
+import multiprocessing.util
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Optimisation problem of the worker processes, set by the pool initializer so it
+# is only sent once to each worker instead of with every evaluation
+_worker_problem = None
+
+
+def _initialise_worker(optimisation_problem, profiler=None, profile_directory=None):
+    global _worker_problem
+    _worker_problem = optimisation_problem
+    if profiler is not None:
+        profiler.start()
+        # The pool workers run the finalizers when they exit, after the pool is
+        # closed, so the profile covers all the evaluations of the worker
+        multiprocessing.util.Finalize(
+            None,
+            _dump_worker_profile,
+            args=(profiler, profile_directory),
+            exitpriority=10,
+        )
+
+
+def _dump_worker_profile(profiler, profile_directory):
+    profiler.stop()
+    profiler.dump(os.path.join(profile_directory, "{}.prof".format(os.getpid())))
+
+
+def _evaluate_in_worker(x):
+    return _worker_problem.evaluate(x)
+
+
+class ProcessPoolEvaluator(pbparam.BaseEvaluator):
+    """
+    Evaluate batches of points on a pool of processes. The optimisation problem is
+    sent once to each worker when the pool starts, so afterwards only the points
+    and their costs go between the processes, instead of the whole problem (data,
+    simulation and last solution) with every task as when SciPy's `workers`
+    option is used.
+
+    Each worker has its own copy of the problem, so its evaluation cache and best
+    cost are not shared with the other workers. Enabling the model cache (see
+    :meth:`pbparam.BaseOptimisationProblem.enable_model_cache`) before starting the
+    evaluator avoids building the model again in every worker.
+
+    If the `profiler` attribute is set (see :class:`pbparam.BaseEvaluator`), each
+    worker profiles its evaluations with a profiler of the same mode, and the
+    profiles of the workers are added to it when the evaluator is closed.
+
+    Parameters
+    ----------
+    workers : int, optional
+        The number of processes. If None, the number of CPUs is used.
+    chunksize : int, optional
+        The number of points sent to a worker at a time. If None, the points of a
+        batch are split into about four chunks per worker.
+    """
+
+    def __init__(self, workers=None, chunksize=None):
+        super().__init__()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.name = "Process pool evaluator with {} workers".format(self.workers)
+        self._pool = None
+        self._profile_directory = None
+
+    def start(self, optimisation_problem):
+        """
+        Start the pool of processes for an optimisation problem.
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.BaseOptimisationProblem`
+            The optimisation problem to evaluate.
+        """
+        super().start(optimisation_problem)
+        initargs = (optimisation_problem,)
+        if self.profiler is not None:
+            # The workers write their profiles to this directory when they exit
+            self._profile_directory = tempfile.mkdtemp(prefix="pbparam-profile-")
+            initargs += (
+                pbparam.Profiler(self.profiler.mode, self.profiler.interval),
+                self._profile_directory,
+            )
+        self._pool = multiprocessing.Pool(
+            self.workers, initializer=_initialise_worker, initargs=initargs
+        )
+
+    def close(self):
+        """
+        Terminate the pool of processes, and add the profiles of the workers to the
+        profiler if it is set.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._profile_directory is not None:
+            for name in sorted(os.listdir(self._profile_directory)):
+                self.profiler.load(os.path.join(self._profile_directory, name))
+            shutil.rmtree(self._profile_directory)
+            self._profile_directory = None
+        super().close()
+
+    def evaluate(self, X):
+        """
+        Evaluate the objective function at a batch of points on the workers.
+
+        Parameters
+        ----------
+        X : array-like
+            Two dimensional array where each row is a point.
+
+        Returns
+        -------
+        costs : numpy.ndarray
+            The value of the objective function at each point.
+        """
+        if self._pool is None:
+            raise RuntimeError("start needs to be called before evaluating points")
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        return np.array(
+            self._pool.map(_evaluate_in_worker, X, chunksize=self.chunksize),
+            dtype=float,
+        )
@@ -0,0 +1,78 @@
+#
+# Thread pool evaluator class
+#
+
+import pbparam
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+
+class ThreadPoolEvaluator(pbparam.BaseEvaluator):
+    """
+    Evaluate batches of points on a pool of threads, using
+    :meth:`pbparam.BaseOptimisationProblem.evaluate_threadsafe`. Unlike
+    :class:`pbparam.ProcessPoolEvaluator`, the problem is not pickled and the
+    threads share the data, the built model and the evaluation cache. Each thread
+    only copies the state that is modified when solving (e.g. the solver).
+
+    The threads only run in parallel while the solver releases the GIL, which
+    depends on the solver: the CasADi solvers hold it while integrating, so the
+    speed-up is limited for them.
+
+    Parameters
+    ----------
+    workers : int, optional
+        The number of threads. If None, the number of CPUs is used.
+    """
+
+    def __init__(self, workers=None):
+        super().__init__()
+        self.workers = workers or os.cpu_count() or 1
+        self.name = "Thread pool evaluator with {} workers".format(self.workers)
+        self._executor = None
+
+    def start(self, optimisation_problem):
+        """
+        Start the pool of threads for an optimisation problem.
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.BaseOptimisationProblem`
+            The optimisation problem to evaluate.
+        """
+        super().start(optimisation_problem)
+        self._executor = ThreadPoolExecutor(self.workers)
+
+    def close(self):
+        """
+        Shut down the pool of threads.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        super().close()
+
+    def evaluate(self, X):
+        """
+        Evaluate the objective function at a batch of points on the threads.
+
+        Parameters
+        ----------
+        X : array-like
+            Two dimensional array where each row is a point.
+
+        Returns
+        -------
+        costs : numpy.ndarray
+            The value of the objective function at each point.
+        """
+        if self._executor is None:
+            raise RuntimeError("start needs to be called before evaluating points")
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        return np.array(
+            list(
+                self._executor.map(self.optimisation_problem.evaluate_threadsafe, X)
+            ),
+            dtype=float,
+        )
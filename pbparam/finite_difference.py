@@ -0,0 +1,133 @@
+#
+# Parallel finite difference class
+#
+
+import pbparam
+import os
+import numpy as np
+
+
+class ParallelFiniteDifference(object):
+    """
+    Gradient of the objective function by forward finite differences, evaluating
+    the n + 1 points at the same time on a pool of processes. This is useful for
+    models that cannot provide sensitivities (e.g. simulations with an
+    experiment), as the time to compute a gradient is then close to the time of a
+    single solve when there are enough cores.
+
+    The step of each parameter is `rel_step * max(|x|, 1)`. If the forward step
+    falls outside the bounds, a backward step is taken instead.
+
+    Parameters
+    ----------
+    rel_step : float or array-like, optional
+        The relative step of each parameter. The solver tolerances make the
+        objective function noisy, so the step should be much larger than the
+        tolerances. The default is 1e-3.
+    workers : int, optional
+        The number of processes. If None, the number of CPUs is used. If 1, the
+        points are evaluated one after another in the current process.
+    evaluator : :class:`pbparam.BaseEvaluator`, optional
+        The evaluator of the points. If provided, `workers` is ignored. If it has
+        not been started for the optimisation problem, it is started and closed by
+        :meth:`start` and :meth:`close`.
+    """
+
+    def __init__(self, rel_step=1e-3, workers=None, evaluator=None):
+        self.rel_step = rel_step
+        self.workers = workers or os.cpu_count() or 1
+        self.evaluator = evaluator
+        self._bounds = None
+        self._evaluator = None
+        self._owns_evaluator = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self, optimisation_problem, bounds=None):
+        """
+        Start the evaluator of the points for an optimisation problem.
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.BaseOptimisationProblem`
+            The optimisation problem to differentiate.
+        bounds : list of tuples, optional
+            The bounds of each parameter.
+        """
+        self.close()
+        self._bounds = None if bounds is None else np.array(bounds, dtype=float)
+
+        if self.evaluator is not None:
+            self._evaluator = self.evaluator
+        elif self.workers > 1:
+            self._evaluator = pbparam.ProcessPoolEvaluator(self.workers)
+        else:
+            self._evaluator = pbparam.BaseEvaluator()
+
+        # The evaluator may have been started already, e.g. by the optimiser
+        self._owns_evaluator = (
+            self._evaluator.optimisation_problem is not optimisation_problem
+        )
+        if self._owns_evaluator:
+            self._evaluator.start(optimisation_problem)
+
+    def close(self):
+        """
+        Close the evaluator of the points, if it has been started by :meth:`start`.
+        """
+        if self._owns_evaluator:
+            self._evaluator.close()
+        self._evaluator = None
+        self._owns_evaluator = False
+
+    def steps(self, x):
+        """
+        Compute the signed step of each parameter, respecting the bounds.
+
+        Parameters
+        ----------
+        x : array-like
+            The point where the gradient is computed.
+
+        Returns
+        -------
+        h : numpy.ndarray
+            The step of each parameter.
+        """
+        x = np.asarray(x, dtype=float)
+        h = np.broadcast_to(self.rel_step, x.shape) * np.maximum(np.abs(x), 1)
+        if self._bounds is not None:
+            lower, upper = self._bounds.T
+            h = np.where((x + h > upper) & (x - h >= lower), -h, h)
+        return h
+
+    def __call__(self, x):
+        """
+        Evaluate the objective function and its gradient.
+
+        Parameters
+        ----------
+        x : array-like
+            The point where the gradient is computed.
+
+        Returns
+        -------
+        cost : float
+            The value of the objective function at `x`.
+        gradient : numpy.ndarray
+            The gradient of the objective function at `x`.
+        """
+        if self._evaluator is None:
+            raise RuntimeError("start needs to be called before computing gradients")
+
+        x = np.asarray(x, dtype=float)
+        h = self.steps(x)
+        points = np.vstack([x, x + np.diag(h)])
+
+        costs = self._evaluator.evaluate(points)
+
+        return costs[0], (costs[1:] - costs[0]) / h
@@ -0,0 +1,201 @@
+#
+# Model cache class
+#
+
+import copy
+import hashlib
+import os
+import pickle
+import tempfile
+
+from pbparam.optimisation_problems.base_optimisation_problem import _fingerprint_bytes
+
+
+class ModelCache(object):
+    """
+    Cache of built PyBaMM models on disk, shared between processes and runs. Each
+    entry holds the discretised model of a simulation together with its solver, so
+    the CasADi functions of the model created when the solver is set up are stored
+    too. Loading an entry is faster than setting the parameters, meshing,
+    discretising and setting up the solver again, which is what each worker process
+    of a parallel optimiser or a restarted job would otherwise do.
+
+    The entries are addressed by a key built from the content of the model (its
+    equations and options), the parameter values (including which of them are
+    inputs), the mesh and spatial methods, the solver settings and the PyBaMM
+    version, so a change of any of them gives a new entry. Simulations with an
+    experiment are not cached.
+
+    Parameters
+    ----------
+    directory : str
+        The directory where the models are stored. It is created if it does not
+        exist.
+    """
+
+    def __init__(self, directory):
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, simulation):
+        """
+        Compute the key of a simulation. It must be computed before the simulation
+        is built, as setting the parameters replaces its model.
+
+        Parameters
+        ----------
+        simulation : :class:`pybamm.Simulation`
+            The simulation.
+
+        Returns
+        -------
+        key : str
+            The SHA-256 hex digest identifying the built model.
+        """
+        import pybamm
+
+        model = simulation.model
+        digest = hashlib.sha256()
+        digest.update(pybamm.__version__.encode())
+        digest.update(
+            "{}.{}:{}".format(
+                type(model).__module__, type(model).__qualname__, model.name
+            ).encode()
+        )
+        digest.update(_fingerprint_bytes(getattr(model, "options", None)))
+
+        # The equations are identified by their string representation, which unlike
+        # their repr does not depend on the ids of the symbols
+        for equations in [model.rhs, model.algebraic, model.initial_conditions]:
+            digest.update(
+                repr([(str(k), str(v)) for k, v in equations.items()]).encode()
+            )
+        digest.update(
+            repr(
+                [
+                    (str(k), [(side, str(v[0]), v[1]) for side, v in bcs.items()])
+                    for k, bcs in model.boundary_conditions.items()
+                ]
+            ).encode()
+        )
+        digest.update(repr([str(event) for event in model.events]).encode())
+
+        digest.update(_fingerprint_bytes(dict(simulation.parameter_values.items())))
+        digest.update(_fingerprint_bytes(simulation.var_pts))
+        # The submesh types are wrapped in generators in place when meshing
+        digest.update(
+            _fingerprint_bytes(
+                {
+                    domain: (
+                        getattr(submesh, "submesh_type", submesh),
+                        getattr(submesh, "submesh_params", {}),
+                    )
+                    for domain, submesh in simulation.submesh_types.items()
+                }
+            )
+        )
+        digest.update(
+            _fingerprint_bytes(
+                {
+                    domain: (type(method).__name__, method.options)
+                    for domain, method in simulation.spatial_methods.items()
+                }
+            )
+        )
+
+        solver = simulation.solver
+        digest.update(type(solver).__name__.encode())
+        digest.update(
+            _fingerprint_bytes(
+                {
+                    name: value
+                    for name, value in vars(solver).items()
+                    if isinstance(value, (bool, int, float, str, type(None)))
+                }
+            )
+        )
+
+        return digest.hexdigest()
+
+    def filename(self, key):
+        """
+        Return the path of the file of an entry.
+        """
+        return os.path.join(self.directory, key + ".pkl")
+
+    def load(self, key, simulation):
+        """
+        Load the built model and solver of a simulation from the cache, if they have
+        been stored.
+
+        Parameters
+        ----------
+        key : str
+            The key of the simulation, see :meth:`key`.
+        simulation : :class:`pybamm.Simulation`
+            The simulation, which has not been built yet. It is updated in place.
+
+        Returns
+        -------
+        bool
+            Whether the model has been loaded.
+        """
+        if getattr(simulation, "experiment", None) is not None:
+            return False
+
+        try:
+            with open(self.filename(key), "rb") as file:
+                entry = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return False
+
+        simulation._built_model = entry["built_model"]
+        simulation._mesh = entry["mesh"]
+        simulation._solver = entry["solver"]
+        return True
+
+    def save(self, key, simulation):
+        """
+        Store the built model and solver of a simulation. The solver should have
+        been used to solve the model, so that its CasADi functions are stored too.
+
+        Parameters
+        ----------
+        key : str
+            The key of the simulation, computed before it was built (see
+            :meth:`key`).
+        simulation : :class:`pybamm.Simulation`
+            The built simulation.
+
+        Returns
+        -------
+        bool
+            Whether the model has been stored.
+        """
+        if getattr(simulation, "experiment", None) is not None:
+            return False
+        if simulation.built_model is None:
+            return False
+
+        # The CasADi integrator specs cannot be pickled, and the integrators are
+        # faster to create again than to deserialise, so only the model functions
+        # are stored
+        solver = copy.copy(simulation.solver)
+        if hasattr(solver, "integrator_specs"):
+            solver.integrator_specs = {}
+        if hasattr(solver, "integrators"):
+            solver.integrators = {}
+        entry = {
+            "built_model": simulation.built_model,
+            "mesh": simulation.mesh,
+            "solver": solver,
+        }
+
+        # Write to a temporary file first so that other processes never read a
+        # partially written entry
+        with tempfile.NamedTemporaryFile(
+            dir=self.directory, suffix=".tmp", delete=False
+        ) as file:
+            pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file.name, self.filename(key))
+        return True
@@ -7,6 +7,7 @@ import pandas as pd
 import numpy as np
 from scipy import interpolate
 import warnings
+from pbparam.evaluation_timer import timed_phase
 
 
 class OCPBalance(pbparam.BaseOptimisationProblem):
@@ -80,6 +81,7 @@ class OCPBalance(pbparam.BaseOptimisationProblem):
                 raise ValueError("Weights should have the same length as data_ref.")
         self.map_inputs = {"Shift": 0, "Stretch": 1}
 
+    @timed_phase("objective_function")
     def objective_function(self, x):
         """
         Calculates the cost of the simulation based on the fitting parameters.
@@ -94,21 +96,91 @@ class OCPBalance(pbparam.BaseOptimisationProblem):
         cost : float
             The cost of the simulation.
         """
+        x_fit, y_data = self._get_data()
+        y_sim = self._interpolate_reference(x, x_fit)
 
-        # Iterate over the fit and reference data
-        y_sim = []
-        y_data = []
-        for fit, ref in zip(self.data, self.model_fun):
-            # Append simulated values to the y_sim list
-            y_sim.append(ref(x[0] + x[1] * fit.iloc[:, 0]))
-            # Append data values to the y_data list
-            y_data.append(fit.iloc[:, 1].to_numpy())
+        # Return the cost of the simulation using the cost function
+        return self._evaluate_cost_function(x, y_sim, y_data)
 
-        sd = list(x[2:])
+    @timed_phase("data")
+    def _get_data(self):
+        """
+        Get the stoichiometries and the values of the fit data, as lists of arrays.
+        """
+        x_fit = [fit.iloc[:, 0] for fit in self.data]
+        y_data = [fit.iloc[:, 1].to_numpy() for fit in self.data]
+        return x_fit, y_data
 
-        # Return the cost of the simulation using the cost function
+    @timed_phase("interpolation")
+    def _interpolate_reference(self, x, x_fit):
+        """
+        Interpolate the reference data at the shifted and stretched stoichiometries
+        of the fit data.
+        """
+        return [ref(x[0] + x[1] * fit) for fit, ref in zip(x_fit, self.model_fun)]
+
+    @timed_phase("cost")
+    def _evaluate_cost_function(self, x, y_sim, y_data):
+        """
+        Evaluate the cost function from the interpolated reference data and the fit
+        data.
+        """
+        sd = list(x[2:])
         return self.cost_function.evaluate(y_sim, y_data, self.weights, sd)
 
+    def estimated_parameters(self, x):
+        """
+        Estimate the standard deviations profiled out of the optimisation by
+        :class:`pbparam.MLE` with `profiled=True`, at the optimal shift and stretch.
+
+        Parameters
+        ----------
+        x : list
+            The optimal values of the parameters.
+
+        Returns
+        -------
+        parameters : dict
+            Dictionary of the estimated standard deviations, empty if the cost
+            function does not profile any parameter
+        """
+        if not getattr(self.cost_function, "profiled", False):
+            return {}
+        x_fit, y_data = self._get_data()
+        y_sim = self._interpolate_reference(x, x_fit)
+        if len(self.data) == 1:
+            variables = ["Voltage [V]"]
+        else:
+            variables = [
+                "Voltage [V] of dataset {}".format(i + 1) for i in range(len(self.data))
+            ]
+        return self.cost_function.estimate_parameters(y_sim, y_data, variables)
+
+    def residuals(self, x):
+        """
+        Calculates the weighted residuals between the shifted and stretched fit data
+        and the reference data. The residuals of each dataset are divided by the
+        square root of its number of points, so their sum of squares is the weighted
+        mean square error of the dataset.
+
+        Parameters
+        ----------
+        x : list
+            List of fitting parameters.
+
+        Returns
+        -------
+        residuals : numpy.ndarray
+            The weighted residuals of all the datasets, concatenated.
+        """
+        residuals = []
+        for fit, ref, weight in zip(self.data, self.model_fun, self.weights):
+            y_sim = ref(x[0] + x[1] * fit.iloc[:, 0])
+            err = (y_sim - fit.iloc[:, 1].to_numpy()) * weight
+            residuals.append(err / np.sqrt(max(np.count_nonzero(~np.isnan(err)), 1)))
+
+        return np.nan_to_num(np.concatenate(residuals))
+
     def process_and_clean_data(self):
         """
         Sets up the objective function for optimization.
@@ -155,7 +227,9 @@ class OCPBalance(pbparam.BaseOptimisationProblem):
         # ]
         self.bounds = [(-1000, 1000), (-1000, 1000)]
 
-        if isinstance(self.cost_function, pbparam.MLE):
+        # The standard deviations profiled out by the MLE are not optimised
+        cost_function = self.cost_function
+        if isinstance(cost_function, pbparam.MLE) and not cost_function.profiled:
             self.x0 += [1] * len(self.model)
             # self.bounds += [(1e-16, 1e3)] * len(self.model)
             self.bounds = [
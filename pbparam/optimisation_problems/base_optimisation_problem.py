@@ -2,11 +2,86 @@
 # Base optimisation problem class
 #
 
-import pybamm
 import pbparam
 import numpy as np
+import pandas as pd
+import copy
+import hashlib
+import sys
+import threading
 import warnings
 
+from pbparam.evaluation_cache import evaluation_key
+
+# Lock protecting the state shared by the threads evaluating a problem (evaluation
+# cache and store, best cost), and the copies of the problems used by each thread
+_evaluation_lock = threading.RLock()
+_thread_state = threading.local()
+
+# Number of simulations kept for the parameter values used most recently, so a
+# problem whose fixed parameters are edited between fits does not keep every built
+# model in memory
+_MAX_SIMULATIONS = 4
+
+
+def copy_solver(solver):
+    """
+    Copy a PyBaMM solver without the models it has been set up for and the CasADi
+    integrators it has created, which cannot be pickled.
+
+    Parameters
+    ----------
+    solver : :class:`pybamm.BaseSolver`
+        The solver to copy.
+
+    Returns
+    -------
+    :class:`pybamm.BaseSolver`
+        The new solver.
+    """
+    new_solver = solver.copy()
+    for attribute in ["integrators", "integrator_specs"]:
+        if hasattr(new_solver, attribute):
+            setattr(new_solver, attribute, {})
+    return new_solver
+
+
+def _fingerprint_bytes(value):
+    """
+    Convert a value into bytes for the problem fingerprint, so that equal values
+    always give the same bytes.
+    """
+    # PyBaMM symbols are only possible values if PyBaMM has been imported
+    pybamm = sys.modules.get("pybamm")
+    if pybamm is not None and isinstance(value, pybamm.Symbol):
+        # The repr of the symbols contains their id, which changes between
+        # interpreters, so they are identified by their content
+        if isinstance(value, pybamm.InputParameter):
+            return b"[input]" + repr(value.name).encode()
+        return type(value).__name__.encode() + b":" + str(value).encode()
+    elif isinstance(value, pd.DataFrame):
+        return repr(list(value.columns)).encode() + (
+            pd.util.hash_pandas_object(value).values.tobytes()
+        )
+    elif isinstance(value, pd.Series):
+        return repr(value.name).encode() + (
+            pd.util.hash_pandas_object(value).values.tobytes()
+        )
+    elif isinstance(value, np.ndarray):
+        return repr((value.dtype, value.shape)).encode() + value.tobytes()
+    elif isinstance(value, dict):
+        return b"{" + b",".join(
+            _fingerprint_bytes(k) + b":" + _fingerprint_bytes(v)
+            for k, v in sorted(value.items(), key=lambda item: str(item[0]))
+        ) + b"}"
+    elif isinstance(value, (list, tuple)):
+        return b"[" + b",".join(_fingerprint_bytes(v) for v in value) + b"]"
+    elif callable(value) and hasattr(value, "__qualname__"):
+        # Functions are identified by name, as their repr contains their address
+        return f"{value.__module__}.{value.__qualname__}".encode()
+    else:
+        return repr(value).encode()
+
 
 class BaseOptimisationProblem:
     """
@@ -114,6 +189,21 @@ class BaseOptimisationProblem:
         self.weights = weights
         self.map_inputs = {}
 
+        # Evaluation cache and store, disabled unless enable_cache or enable_store
+        # are called
+        self.cache = None
+        self.store = None
+        self.calculate_sensitivities = False
+        self.early_abort_factor = None
+        self.best_cost = np.inf
+        self.aborted = False
+        self.model_cache = None
+        self._model_cache_pending = {}
+        self.timer = None
+        self.history = None
+        self._simulations = {}
+        self._simulation_key = None
+
         # This should be a requirement to run if defined, if it's not defined in the
         #  subclass it will pass
         self.setup_objective_function()
@@ -177,36 +267,126 @@ class BaseOptimisationProblem:
 
     def update_simulation_parameters(self, simulation):
         """
-        Update the simulation object with new parameter values
+        Update the simulation object with new parameter values. The simulations are
+        cached by the values of the parameters, so the model is only processed,
+        discretised and built again if a parameter that is not optimised (i.e. not
+        an input) has changed since the last time these values were used. Only the
+        simulations of the last few parameter values used are kept.
+        """
+        if not any(simulation is sim for sim in self._simulations.values()):
+            # A simulation not created by this problem: keep its settings to create
+            # the simulations for any parameter values
+            self._simulations = {}
+            self._simulation_template = {
+                "model": simulation.model,
+                "experiment": getattr(simulation, "experiment", None),
+                "geometry": copy.deepcopy(simulation.geometry),
+                "submesh_types": simulation.submesh_types,
+                "var_pts": simulation.var_pts,
+                "spatial_methods": simulation.spatial_methods,
+                "solver": copy_solver(simulation.solver),
+                "output_variables": simulation.output_variables,
+                "C_rate": getattr(simulation, "C_rate", None),
+            }
+
+        key = self._parameter_values_key()
+        # The simulations are kept in the order they were last used
+        simulation = self._simulations.pop(key, None)
+        if simulation is None:
+            simulation = self._create_simulation(key)
+        self._simulations[key] = simulation
+        while len(self._simulations) > _MAX_SIMULATIONS:
+            oldest = next(iter(self._simulations))
+            del self._simulations[oldest]
+            self._model_cache_pending.pop(oldest, None)
+
+        self.model = simulation
+        self._simulation_key = key
+
+    def _create_simulation(self, key):
+        """
+        Create the simulation for the current parameter values from the simulation
+        template, loading its built model from the model cache if enabled.
         """
-        # Remove integrator_specs from solver
-        solver = simulation.solver
-        if hasattr(solver, "integrator_specs"):
-            solver.integrator_specs = {}
+        import pybamm
 
         # Why cant we do this?
         # self.model.parameter_values = self.parameter_values
         # self.model.solver = solver
-        # If the simulation has been run then the discretisation already took place
-        # and this would not update the parameters. PyBaMM PR #3267
-        # (https://github.com/pybamm-team/PyBaMM/pull/3267) no longer allows to change
-        # such attributes
-
-        # Updating sim params requires recreating the simulation
-        new_simulation = pybamm.Simulation(
-            simulation.model,
-            experiment=getattr(simulation, "experiment", None),
-            geometry=simulation.geometry,
-            parameter_values=self.parameter_values,
-            submesh_types=simulation.submesh_types,
-            var_pts=simulation.var_pts,
-            spatial_methods=simulation.spatial_methods,
-            solver=solver,
-            output_variables=simulation.output_variables,
-            C_rate=getattr(simulation, "C_rate", None),
+        # If the simulation has been run then the discretisation already took
+        # place and this would not update the parameters. PyBaMM PR #3267
+        # (https://github.com/pybamm-team/PyBaMM/pull/3267) no longer allows to
+        # change such attributes
+
+        # Updating sim params requires recreating the simulation, with its own
+        # solver as a solver can only be set up for one model. The meshing and
+        # discretisation modify the settings in place, so each simulation gets its
+        # own copy.
+        template = self._simulation_template
+        simulation = pybamm.Simulation(
+            **{
+                **template,
+                "geometry": copy.deepcopy(template["geometry"]),
+                "submesh_types": copy.copy(template["submesh_types"]),
+                "var_pts": copy.copy(template["var_pts"]),
+                "spatial_methods": copy.copy(template["spatial_methods"]),
+                "parameter_values": self.parameter_values.copy(),
+                "solver": copy_solver(template["solver"]),
+            }
         )
 
-        self.model = new_simulation
+        experiment = getattr(simulation, "experiment", None)
+        if self.model_cache is not None and experiment is None:
+            model_cache_key = self.model_cache.key(simulation)
+            if not self.model_cache.load(model_cache_key, simulation):
+                # Store the built model straight away so that other processes can
+                # load it, and again with the CasADi functions after the first
+                # solve (see _save_model_cache)
+                simulation.build()
+                self.model_cache.save(model_cache_key, simulation)
+                self._model_cache_pending[key] = model_cache_key
+
+        return simulation
+
+    def _save_model_cache(self):
+        """
+        Store the current simulation in the model cache if it has been built in this
+        process and not stored since it was first solved.
+        """
+        if self._simulation_key in self._model_cache_pending:
+            self.model_cache.save(
+                self._model_cache_pending.pop(self._simulation_key), self.model
+            )
+
+    def refresh_simulation(self):
+        """
+        Make sure the simulation uses the current parameter values. If a parameter
+        that is not optimised has been changed in `parameter_values`, the
+        simulation is updated (see :meth:`update_simulation_parameters`),
+        otherwise the built model is reused.
+
+        Returns
+        -------
+        bool
+            Whether the simulation has been updated.
+        """
+        # The simulation has not been created by update_simulation_parameters yet
+        if self._simulation_key is None:
+            return False
+        if self._parameter_values_key() == self._simulation_key:
+            return False
+
+        self.update_simulation_parameters(self.model)
+        return True
+
+    def _parameter_values_key(self):
+        """
+        Build the key identifying the current parameter values, including which of
+        them are inputs.
+        """
+        return hashlib.sha256(
+            _fingerprint_bytes(dict(self.parameter_values.items()))
+        ).hexdigest()
 
     def process_weights(self):
         if self.weights is None:
@@ -254,6 +434,637 @@ class BaseOptimisationProblem:
             " be called first"
         )
 
+    def objective_function_and_gradient(self, x):
+        """
+        Placeholder method for the objective function and its gradient
+
+        Subclasses will override this method to provide specific implementations
+
+        Parameters
+        ----------
+        x : array-like
+            independent variable for the objective function
+
+        Returns
+        -------
+        float
+            the value of the objective function
+        numpy.ndarray
+            the gradient of the objective function with respect to `x`
+        """
+        raise NotImplementedError(
+            "objective_function_and_gradient not defined for {}".format(
+                type(self).__name__
+            )
+        )
+
+    def residuals(self, x):
+        """
+        Placeholder method for the residuals of the fit
+
+        Subclasses will override this method to provide specific implementations
+
+        Parameters
+        ----------
+        x : array-like
+            independent variable for the objective function
+
+        Returns
+        -------
+        numpy.ndarray
+            the weighted residuals between the model and the data
+        """
+        raise NotImplementedError(
+            "residuals not defined for {}".format(type(self).__name__)
+        )
+
+    def residuals_and_jacobian(self, x):
+        """
+        Placeholder method for the residuals of the fit and their jacobian
+
+        Subclasses will override this method to provide specific implementations
+
+        Parameters
+        ----------
+        x : array-like
+            independent variable for the objective function
+
+        Returns
+        -------
+        numpy.ndarray
+            the weighted residuals between the model and the data
+        numpy.ndarray
+            the jacobian of the residuals with respect to `x`
+        """
+        raise NotImplementedError(
+            "residuals_and_jacobian not defined for {}".format(type(self).__name__)
+        )
+
+    def estimated_parameters(self, x):
+        """
+        Estimate the parameters that are not optimised but profiled out of the
+        optimisation by the cost function (e.g. the standard deviations of
+        :class:`pbparam.MLE` with `profiled=True`), at the optimal parameters.
+
+        Subclasses that support profiled cost functions override this method.
+
+        Parameters
+        ----------
+        x : array-like
+            The optimal values of the parameters, unscaled
+
+        Returns
+        -------
+        parameters : dict
+            Dictionary of the estimated parameters, empty by default
+        """
+        return {}
+
+    def enable_cache(self, maxsize=1024, decimals=12):
+        """
+        Enable the memoisation of the objective function. Evaluations requested
+        through :meth:`evaluate` and :meth:`evaluate_batch` are then looked up in a
+        least-recently-used cache before calling the objective function.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            The maximum number of evaluations to store. If None, the cache grows
+            without bound. The default is 1024.
+        decimals : int, optional
+            The number of decimals used to round `x` when building the cache keys.
+            The default is 12.
+        """
+        self.cache = pbparam.EvaluationCache(maxsize=maxsize, decimals=decimals)
+
+    def disable_cache(self):
+        """
+        Disable the memoisation of the objective function.
+        """
+        self.cache = None
+
+    def enable_store(self, filename, decimals=12):
+        """
+        Enable the persistent storage of the evaluations in an SQLite file. Before
+        solving, :meth:`evaluate` and :meth:`evaluate_batch` look up the evaluations
+        stored for the same problem fingerprint, so an interrupted fit can be resumed
+        without solving the model again.
+
+        This method should be called once the problem is fully set up, as the
+        fingerprint is computed at this stage.
+
+        Parameters
+        ----------
+        filename : str
+            The path of the SQLite file. It is created if it does not exist.
+        decimals : int, optional
+            The number of decimals used to round `x` when building the keys. The
+            default is 12.
+        """
+        self.store = pbparam.EvaluationStore(filename, decimals=decimals)
+        self._fingerprint = self.fingerprint()
+
+    def disable_store(self):
+        """
+        Disable the persistent storage of the evaluations.
+        """
+        if self.store is not None:
+            self.store.close()
+        self.store = None
+
+    def enable_model_cache(self, directory):
+        """
+        Enable the cache of the built models on disk (see
+        :class:`pbparam.ModelCache`). The simulations created for new parameter
+        values are then loaded from the cache instead of being built, which is
+        useful when the problem is sent to worker processes or the fit is run again.
+
+        Parameters
+        ----------
+        directory : str
+            The directory where the models are stored.
+        """
+        self.model_cache = pbparam.ModelCache(directory)
+        self._model_cache_pending = {}
+        if self._simulation_key is not None:
+            # Create the current simulation again so that it goes through the cache
+            key = self._simulation_key
+            self._simulations = {key: self._create_simulation(key)}
+            self.model = self._simulations[key]
+            self.setup_objective_function()
+
+    def disable_model_cache(self):
+        """
+        Disable the cache of the built models on disk.
+        """
+        self.model_cache = None
+        self._model_cache_pending = {}
+
+    def enable_timing(self):
+        """
+        Enable the timing of the phases of the objective function evaluations (see
+        :class:`pbparam.EvaluationTimer`). The timer is reset at the start of each
+        optimisation, and its summary is stored in the `profile` attribute of the
+        result. Only the evaluations run in the current process are timed.
+        """
+        self.timer = pbparam.EvaluationTimer()
+
+    def disable_timing(self):
+        """
+        Disable the timing of the objective function evaluations.
+        """
+        self.timer = None
+
+    def enable_history(self, maxsize=None, filename=None):
+        """
+        Enable the recording of the evaluations of the objective function (see
+        :class:`pbparam.EvaluationHistory`). The evaluations looked up in the
+        evaluation cache or store are not recorded again. Each optimisation records
+        to a new history, available in the `history` attribute of its result. Only
+        the evaluations run in the current process are recorded.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            The maximum number of evaluations to keep. If None, all of them are
+            kept. The default is None.
+        filename : str, optional
+            If provided, the history is memory-mapped to this file while the
+            optimisation runs, and the result holds a copy in memory, as the file is
+            overwritten by the next optimisation.
+        """
+        self.history = pbparam.EvaluationHistory(maxsize=maxsize, filename=filename)
+
+    def disable_history(self):
+        """
+        Disable the recording of the evaluations.
+        """
+        self.history = None
+
+    def fingerprint(self):
+        """
+        Compute a fingerprint of the optimisation problem. Two problems with the same
+        fingerprint give the same cost for the same `x`, so their evaluations can be
+        shared. The fingerprint accounts for the model name, the parameter values
+        that are not optimised, the data, the variables to fit, the weights, the
+        cost function, and the scalings and bounds of `x`, as the evaluations are
+        keyed by the scaled `x` (the scalings are the initial guesses).
+
+        Returns
+        -------
+        fingerprint : str
+            The SHA-256 hex digest identifying the problem.
+        """
+        import pybamm
+
+        digest = hashlib.sha256()
+        digest.update(type(self).__name__.encode())
+
+        if isinstance(self.model, pybamm.Simulation):
+            digest.update(self.model.model.name.encode())
+            digest.update(str(getattr(self.model, "experiment", None)).encode())
+            digest.update(_fingerprint_bytes(self.model.var_pts))
+        else:
+            digest.update(_fingerprint_bytes(self.model))
+
+        parameter_values = getattr(self, "parameter_values", None)
+        if parameter_values is not None:
+            digest.update(
+                _fingerprint_bytes(
+                    {
+                        k: v
+                        for k, v in parameter_values.items()
+                        if k not in self.map_inputs
+                    }
+                )
+            )
+
+        digest.update(_fingerprint_bytes(self.data))
+        digest.update(_fingerprint_bytes(self.map_inputs))
+        digest.update(_fingerprint_bytes(self.scalings))
+        digest.update(_fingerprint_bytes(self.bounds))
+        digest.update(_fingerprint_bytes(self.variables_to_fit))
+        digest.update(_fingerprint_bytes(self.weights))
+        digest.update(type(self.cost_function).__name__.encode())
+        digest.update(_fingerprint_bytes(vars(self.cost_function)))
+
+        return digest.hexdigest()
+
+    def enable_early_abort(self, factor):
+        """
+        Allow the objective function to stop the solves whose cost is going to be
+        larger than a threshold, given by the best cost found so far relaxed by a
+        safety factor. The aborted evaluations return infinity, so this is meant for
+        optimisers that only need to know that a point is worse than the best one,
+        such as differential evolution. A lower bound of the cost is not returned,
+        as it can be below the cost of the member of the population a trial point
+        is compared with, which would then be replaced with an understated cost.
+        The evaluations that are not aborted return the same cost as without early
+        abort. It is normally set up through the `early_abort_factor` argument of
+        :meth:`pbparam.BaseOptimiser.optimise`.
+
+        Parameters
+        ----------
+        factor : float
+            The safety factor, which must be at least 1. The solves are aborted once
+            the cost exceeds `best_cost + (factor - 1) * |best_cost|`.
+        """
+        if factor < 1:
+            raise ValueError("The early abort factor must be at least 1")
+        self.early_abort_factor = factor
+        self.best_cost = np.inf
+
+    def disable_early_abort(self):
+        """
+        Disable the early abort of the solves.
+        """
+        self.early_abort_factor = None
+
+    def early_abort_threshold(self):
+        """
+        Compute the cost above which solves are aborted.
+
+        Returns
+        -------
+        threshold : float or None
+            The threshold, or None if the solves should not be aborted.
+        """
+        if self.early_abort_factor is None or not np.isfinite(self.best_cost):
+            return None
+        return self.best_cost + (self.early_abort_factor - 1) * abs(self.best_cost)
+
+    def _update_best_cost(self, cost):
+        """
+        Keep track of the best cost found so far. Aborted evaluations do not need
+        to be excluded, as their cost is above the best one.
+        """
+        if np.isfinite(cost) and cost < self.best_cost:
+            self.best_cost = float(cost)
+
+    def _key(self, x):
+        """
+        Build the key identifying `x` in the evaluation cache and store.
+        """
+        if self.cache is not None:
+            return self.cache.key(x)
+        elif self.store is not None:
+            return evaluation_key(x, self.store.decimals)
+        else:
+            return np.asarray(x, dtype=float).tobytes()
+
+    def _lookup(self, key, x):
+        """
+        Look up the cost of `x` in the evaluation cache and then in the store.
+        Returns None if it has not been evaluated yet.
+        """
+        cost = None
+        if self.cache is not None:
+            cost = self.cache.get(key)
+        if cost is None and self.store is not None:
+            cost = self.store.get(self._fingerprint, x)
+            if cost is not None and self.cache is not None:
+                self.cache.set(key, cost)
+        return cost
+
+    def _record(self, key, x, cost, status=None):
+        """
+        Record the cost of `x` in the evaluation cache, store and history. The
+        aborted evaluations are not cached, as their cost is not known.
+        """
+        if status is None:
+            if self.aborted:
+                status = "aborted"
+            else:
+                status = "success" if np.isfinite(cost) else "failed"
+        if self.cache is not None and status != "aborted":
+            self.cache.set(key, cost)
+        if self.store is not None:
+            self.store.set(self._fingerprint, x, cost, status)
+        if self.history is not None:
+            self.history.record(x, cost, status)
+
+    def _record_error(self, x):
+        """
+        Record that the evaluation of `x` raised an error in the evaluation store
+        and history.
+        """
+        if self.store is not None:
+            self.store.set(self._fingerprint, x, np.nan, "error")
+        if self.history is not None:
+            self.history.record(x, np.nan, "error")
+
+    def evaluate(self, x):
+        """
+        Evaluate the objective function, using the cached or stored value if
+        available. This is the method the optimisers call.
+
+        Parameters
+        ----------
+        x : array-like
+            independent variable for the objective function
+
+        Returns
+        -------
+        float
+            the value of the objective function
+        """
+        # The objective function sets this flag if it aborts the solve
+        self.aborted = False
+        if self.cache is None and self.store is None and self.history is None:
+            cost = self.objective_function(x)
+            self._update_best_cost(cost)
+            return cost
+
+        key = self._key(x)
+        cost = self._lookup(key, x)
+        if cost is None:
+            try:
+                cost = self.objective_function(x)
+            except Exception:
+                self._record_error(x)
+                raise
+            self._record(key, x, cost)
+        self._update_best_cost(cost)
+
+        return cost
+
+    def evaluate_with_gradient(self, x):
+        """
+        Evaluate the objective function and its gradient. The gradient is not
+        cached, so the objective function is always called, but the cost is recorded
+        in the evaluation cache and store.
+
+        Parameters
+        ----------
+        x : array-like
+            independent variable for the objective function
+
+        Returns
+        -------
+        float
+            the value of the objective function
+        numpy.ndarray
+            the gradient of the objective function with respect to `x`
+        """
+        self.aborted = False
+        if self.cache is None and self.store is None and self.history is None:
+            return self.objective_function_and_gradient(x)
+
+        try:
+            cost, gradient = self.objective_function_and_gradient(x)
+        except Exception:
+            self._record_error(x)
+            raise
+        self._record(self._key(x), x, cost)
+
+        return cost, gradient
+
+    def evaluate_batch(self, X):
+        """
+        Evaluate the objective function for a batch of parameter vectors. Identical
+        vectors within the batch are only evaluated once, vectors in the evaluation
+        cache or store are looked up, and the remaining ones are passed together to
+        :meth:`objective_function_batch`.
+
+        Parameters
+        ----------
+        X : array-like
+            Two dimensional array where each row is a parameter vector.
+
+        Returns
+        -------
+        costs : numpy.ndarray
+            The value of the objective function for each row of `X`.
+        """
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        costs = np.empty(X.shape[0])
+        self.aborted = False
+
+        # Group the rows of X by key so each distinct vector is evaluated once
+        rows = {}
+        for i, x in enumerate(X):
+            rows.setdefault(self._key(x), []).append(i)
+
+        missing = []
+        for key, indices in rows.items():
+            cost = self._lookup(key, X[indices[0]])
+            if cost is None:
+                missing.append(key)
+            else:
+                costs[indices] = cost
+
+        if missing:
+            X_missing = X[[rows[key][0] for key in missing]]
+            for key, x, cost in zip(
+                missing, X_missing, self.objective_function_batch(X_missing)
+            ):
+                costs[rows[key]] = cost
+                self._record(key, x, cost)
+
+        for cost in costs:
+            self._update_best_cost(cost)
+
+        return costs
+
+    def evaluate_threadsafe(self, x):
+        """
+        Evaluate the objective function so that several threads can evaluate the
+        problem at the same time. Each thread evaluates its own copy of the problem
+        (see :meth:`copy_for_thread`), so no data of the evaluation is written to
+        the problem, and the evaluation cache, store and best cost are updated
+        under a lock.
+
+        Parameters
+        ----------
+        x : array-like
+            independent variable for the objective function
+
+        Returns
+        -------
+        float
+            the value of the objective function
+        """
+        key = None
+        if self.cache is not None or self.store is not None:
+            key = self._key(x)
+            with _evaluation_lock:
+                cost = self._lookup(key, x)
+            if cost is not None:
+                return cost
+
+        problem = self._thread_problem()
+        # Use the latest settings of the early abort
+        problem.early_abort_factor = self.early_abort_factor
+        problem.best_cost = self.best_cost
+        problem.aborted = False
+        cost = problem.objective_function(x)
+
+        with _evaluation_lock:
+            if key is not None or self.history is not None:
+                if problem.aborted:
+                    status = "aborted"
+                else:
+                    status = "success" if np.isfinite(cost) else "failed"
+                self._record(key, x, cost, status)
+            self._update_best_cost(cost)
+
+        return cost
+
+    def _thread_problem(self):
+        """
+        Return the copy of the problem used by the current thread, creating it the
+        first time or if the simulation of the problem has changed.
+        """
+        problems = getattr(_thread_state, "problems", None)
+        if problems is None:
+            problems = _thread_state.problems = {}
+
+        entry = problems.get(id(self))
+        if entry is None or entry[0] is not self or entry[1] is not self.model:
+            with _evaluation_lock:
+                problem = self.copy_for_thread()
+            entry = problems[id(self)] = (self, self.model, problem)
+        return entry[2]
+
+    def copy_for_thread(self):
+        """
+        Create a copy of the problem for a thread to evaluate the objective function
+        without modifying the problem. The copy shares the data of the problem but
+        not its evaluation cache and store, which are handled by
+        :meth:`evaluate_threadsafe`. Subclasses holding state that is modified when
+        evaluating the objective function (e.g. a solver) should override this
+        method to copy it.
+
+        Returns
+        -------
+        :class:`pbparam.BaseOptimisationProblem`
+            The copy of the problem.
+        """
+        problem = copy.copy(self)
+        problem.cache = None
+        problem.store = None
+        return problem
+
+    def _snapshot(self):
+        """
+        Return the state of the problem kept by :class:`pbparam.OptimisationResult`,
+        from which the problem is rebuilt with :meth:`_from_snapshot`. The settings
+        of the optimisation (e.g. `x0`, `bounds`, `scalings` and `map_inputs`) are
+        copied, so that the result is not affected by later changes to the problem,
+        while the data and the other attributes are referenced. The state of the
+        evaluations (evaluation cache and store, timer, history and early abort) is
+        not kept. Subclasses holding large state built by the evaluations (e.g. a
+        built model) should override this method to drop it.
+
+        Returns
+        -------
+        state : dict
+            The state of the problem.
+        """
+        state = self.__dict__.copy()
+        for attribute in [
+            "x0",
+            "bounds",
+            "scalings",
+            "map_inputs",
+            "parameters",
+            "joint_parameters",
+            "variables_to_fit",
+        ]:
+            if attribute in state:
+                state[attribute] = copy.deepcopy(state[attribute])
+        state.update(
+            cache=None,
+            store=None,
+            timer=None,
+            history=None,
+            early_abort_factor=None,
+            best_cost=np.inf,
+            aborted=False,
+        )
+        return state
+
+    @classmethod
+    def _from_snapshot(cls, state):
+        """
+        Rebuild a problem from the state returned by :meth:`_snapshot`, like
+        unpickling it.
+
+        Parameters
+        ----------
+        state : dict
+            The state of the problem.
+
+        Returns
+        -------
+        :class:`pbparam.BaseOptimisationProblem`
+            The problem.
+        """
+        problem = cls.__new__(cls)
+        if hasattr(problem, "__setstate__"):
+            problem.__setstate__(dict(state))
+        else:
+            problem.__dict__.update(state)
+        return problem
+
+    def objective_function_batch(self, X):
+        """
+        Calculate the objective function for a batch of parameter vectors. By default
+        the vectors are evaluated one at a time, subclasses can override this method
+        to solve them together.
+
+        Parameters
+        ----------
+        X : array-like
+            Two dimensional array where each row is a parameter vector.
+
+        Returns
+        -------
+        costs : numpy.ndarray
+            The value of the objective function for each row of `X`.
+        """
+        return np.array([self.objective_function(x) for x in X], dtype=float)
+
     def setup_objective_function(self):
         """
         Placeholder method for setting up the objective function
@@ -4,6 +4,11 @@
 
 import pbparam
 import pybamm
+from pbparam.evaluation_timer import timed_phase
+import numpy as np
+import copy
+
+from pbparam.optimisation_problems.base_optimisation_problem import copy_solver
 
 
 class DataFit(pbparam.BaseOptimisationProblem):
@@ -35,6 +40,31 @@ class DataFit(pbparam.BaseOptimisationProblem):
         functions or defined explicitly.
     solve_options : dict (optional)
         A dictionary of options to pass to the simulation. The default is None.
+    solve_on_data_grid : bool (optional)
+        If True, the solver returns the solution directly at the times of the data
+        and the variables to fit are read from the solution without interpolation.
+        Otherwise, the solution is computed at 100 points and the variables to fit
+        are interpolated linearly at the times of the data. This is an accuracy
+        option rather than a speed one: the solver returns every time of the data,
+        so the evaluations are slower for data sampled densely (e.g. about 6 times
+        for an SPM and 15 times for an SPMe with the CasADi solver and 3654 data
+        points). This option is ignored for simulations with an experiment. The
+        default is False.
+    calculate_sensitivities : bool (optional)
+        If True, the sensitivities of the variables to fit with respect to the
+        parameters are computed by the solver, so the gradient of the cost function
+        is available through :meth:`objective_function_and_gradient`. The cost
+        function needs to implement `evaluate_with_gradient`. The default is False.
+    early_abort_windows : int (optional)
+        The number of time windows in which the simulation is solved when early
+        abort is enabled (see
+        :meth:`pbparam.BaseOptimisationProblem.enable_early_abort`).
+        After each window, a lower bound of the cost is computed assuming the
+        simulation matches the data for the rest of the time, and the solve stops
+        if it exceeds the threshold. The solves that are not aborted are solved
+        again in full, so their cost is the same as without early abort, which pays
+        off when most solves are aborted. Early abort is ignored for simulations
+        with an experiment and when computing sensitivities. The default is 10.
     """
 
     def __init__(
@@ -46,7 +76,11 @@ class DataFit(pbparam.BaseOptimisationProblem):
         cost_function=pbparam.RMSE(),
         weights=None,
         solve_options=None,
+        solve_on_data_grid=False,
+        calculate_sensitivities=False,
+        early_abort_windows=10,
     ):
+        self.solve_on_data_grid = solve_on_data_grid
         super().__init__(
             model=simulation,
             cost_function=cost_function,
@@ -56,10 +90,130 @@ class DataFit(pbparam.BaseOptimisationProblem):
             weights=weights,
         )
 
+        self.calculate_sensitivities = calculate_sensitivities
+        self.early_abort_windows = early_abort_windows
+
         self.collect_parameters(solve_options)
         self.update_simulation_parameters(simulation)
         self.process_weights()
 
+    def __getstate__(self):
+        # The CasADi integrators and functions created by the solves cannot be
+        # pickled, so they are dropped and the evaluation plan is compiled again
+        # after unpickling (e.g. when the problem is sent to worker processes)
+        state = self.__dict__.copy()
+        state["solution"] = None
+        state["_evaluation_plan_compiled"] = False
+        for attribute in [
+            "_variables_casadi",
+            "_variables_casadi_model",
+            "_residuals_buffer",
+        ]:
+            state.pop(attribute, None)
+
+        state["_model_cache_pending"] = {}
+        if self.model_cache is not None:
+            # The simulation is loaded from the model cache after unpickling
+            state["model"] = None
+            state["_simulations"] = {}
+        else:
+            simulation = copy.copy(self.model)
+            simulation._solver = copy_solver(self.model.solver)
+            state["model"] = simulation
+            state["_simulations"] = {self._simulation_key: simulation}
+        state["_simulation_template"] = {
+            **self._simulation_template,
+            "solver": copy_solver(self._simulation_template["solver"]),
+        }
+
+        return state
+
+    def copy_for_thread(self):
+        """
+        Create a copy of the problem for a thread (see
+        :meth:`pbparam.BaseOptimisationProblem.copy_for_thread`). The copy has its
+        own simulation, with a shallow copy of the built model and a new solver, as
+        the solver writes to the model when solving.
+
+        Returns
+        -------
+        :class:`pbparam.DataFit`
+            The copy of the problem.
+        """
+        if not self._evaluation_plan_compiled:
+            self._compile_evaluation_plan()
+
+        problem = super().copy_for_thread()
+        simulation = copy.copy(self.model)
+        simulation._solver = copy_solver(self.model.solver)
+        if getattr(self.model, "experiment", None) is None:
+            self.model.build()
+            simulation._built_model = copy.copy(self.model.built_model)
+            simulation._built_model._variables_casadi = {}
+        else:
+            # Each thread builds the models and solvers of the experiment steps
+            simulation.op_conds_to_built_models = None
+            simulation.op_conds_to_built_solvers = None
+        problem.model = simulation
+        problem._simulations = {self._simulation_key: simulation}
+        problem.solution = None
+        problem.model_cache = None
+        problem._model_cache_pending = {}
+        problem._variables_casadi = {}
+        problem._variables_casadi_model = None
+        problem._residuals_buffer = np.empty_like(self._y_data)
+        return problem
+
+    def _snapshot(self):
+        """
+        Return the state of the problem kept by the optimisation results (see
+        :meth:`pbparam.BaseOptimisationProblem._snapshot`). The simulations, with
+        their built models and last solution, and the evaluation plan are not kept:
+        the simulation is created again from its template and the parameter values
+        when the problem is rebuilt (loading the built model from the model cache if
+        enabled).
+
+        Returns
+        -------
+        state : dict
+            The state of the problem.
+        """
+        state = super()._snapshot()
+        state["model"] = None
+        state["_simulations"] = {}
+        state["_model_cache_pending"] = {}
+        state["solution"] = None
+        state["parameter_values"] = self.parameter_values.copy()
+        state["_evaluation_plan_compiled"] = False
+        for attribute in [
+            "_t_data",
+            "_t_end",
+            "_y_data",
+            "_weights_data",
+            "_nan_data",
+            "_data_counts",
+            "_residuals_buffer",
+            "_input_names",
+            "_input_indices",
+            "_sd_indices",
+            "_sensitivity_names",
+            "_sensitivity_indices",
+            "_t_eval",
+            "_t_eval_indices",
+            "_variables_casadi",
+            "_variables_casadi_model",
+        ]:
+            state.pop(attribute, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self.model is None:
+            key = self._simulation_key
+            self._simulations = {key: self._create_simulation(key)}
+            self.model = self._simulations[key]
+
+    @timed_phase("objective_function")
     def objective_function(self, x):
         """
         Calculate the cost function given the current values of the parameters
@@ -75,20 +229,659 @@ class DataFit(pbparam.BaseOptimisationProblem):
             The calculated cost of the simulation with the current parameters
         """
 
+        if not self._evaluation_plan_compiled:
+            self._compile_evaluation_plan()
+
         # Update the parameter values and solve the simulation using PyBaMM
-        input_dict = {
-            param: self.scalings[i] * x[i] for param, i in self.map_inputs.items()
-        }
-        t_end = self.data["Time [s]"].iloc[-1]
-        self.solution = self.model.solve([0, t_end], inputs=input_dict)
+        x = np.asarray(x, dtype=float)
+        threshold = self.early_abort_threshold()
+        if (
+            threshold is not None
+            and not self.calculate_sensitivities
+            and not getattr(self.model, "experiment", None)
+        ):
+            # The solves that are not aborted are solved again in full, so their
+            # cost does not depend on the early abort
+            if self._solve_with_early_abort(x, threshold):
+                return np.inf
+
+        self._build()
+        self.solution = self._solve(self._get_inputs(x))
+
+        return self._calculate_cost(x, self.solution)
+
+    @timed_phase("objective_function")
+    def objective_function_and_gradient(self, x):
+        """
+        Calculate the cost function and its gradient given the current values of the
+        parameters. The gradient is computed from the sensitivities of the solution,
+        so `calculate_sensitivities` needs to be True.
+
+        Parameters
+        ----------
+        x : array-like
+            The current values of the parameters
+
+        Returns
+        -------
+        cost : float
+            The calculated cost of the simulation with the current parameters
+        gradient : numpy.ndarray
+            The gradient of the cost with respect to `x`
+        """
+        if not self.calculate_sensitivities:
+            raise ValueError(
+                "calculate_sensitivities must be True to compute the gradient"
+            )
 
-        # Get the new y values from the simulation
-        y_sim = [self.solution[v](self.data["Time [s]"]) for v in self.variables_to_fit]
-        y_data = [self.data[v] for v in self.variables_to_fit]
-        weights = [self.weights[v] for v in self.variables_to_fit]
-        sd = [x[self.map_inputs[k]] for k in self.cost_function_parameters]
+        if not self._evaluation_plan_compiled:
+            self._compile_evaluation_plan()
 
-        return self.cost_function.evaluate(y_sim, y_data, weights, sd)
+        x = np.asarray(x, dtype=float)
+        self._build()
+        self.solution = self._solve(self._get_inputs(x))
+        y_sim, dy_sim = self._get_variables_and_sensitivities(self.solution)
+        sd = list(x[self._sd_indices])
+
+        cost, cost_gradient, sd_gradient = self.cost_function.evaluate_with_gradient(
+            y_sim, list(self._y_data), list(self._weights_data), sd, dy_sim
+        )
+
+        # Chain rule with the scalings, adding up the contributions of the inputs
+        # that take the same entry of x
+        gradient = np.zeros_like(x)
+        np.add.at(
+            gradient,
+            self._sensitivity_indices,
+            cost_gradient * self.scalings[self._sensitivity_indices],
+        )
+        gradient[self._sd_indices] += sd_gradient
+
+        return cost, gradient
+
+    def residuals(self, x):
+        """
+        Calculate the weighted residuals between the simulation and the data. The
+        residuals of each variable are divided by the square root of its number of
+        points, so their sum of squares is the weighted mean square error of the
+        variable. Points where the simulation is not defined have zero residual.
+
+        Parameters
+        ----------
+        x : array-like
+            The current values of the parameters
+
+        Returns
+        -------
+        residuals : numpy.ndarray
+            The weighted residuals of all the variables to fit, concatenated
+        """
+        if not self._evaluation_plan_compiled:
+            self._compile_evaluation_plan()
+
+        x = np.asarray(x, dtype=float)
+        self.solution = self._solve(self._get_inputs(x))
+        y_sim = self._get_variables(self.solution)
+
+        return np.nan_to_num(self._calculate_residuals(y_sim))
+
+    def residuals_and_jacobian(self, x):
+        """
+        Calculate the weighted residuals between the simulation and the data (see
+        :meth:`residuals`) and their jacobian with respect to `x`, computed from the
+        sensitivities of the solution. `calculate_sensitivities` needs to be True.
+
+        Parameters
+        ----------
+        x : array-like
+            The current values of the parameters
+
+        Returns
+        -------
+        residuals : numpy.ndarray
+            The weighted residuals of all the variables to fit, concatenated
+        jacobian : numpy.ndarray
+            The jacobian of the residuals, with one column per entry of `x`
+        """
+        if not self.calculate_sensitivities:
+            raise ValueError(
+                "calculate_sensitivities must be True to compute the jacobian"
+            )
+
+        if not self._evaluation_plan_compiled:
+            self._compile_evaluation_plan()
+
+        x = np.asarray(x, dtype=float)
+        self.solution = self._solve(self._get_inputs(x))
+        y_sim, dy_sim = self._get_variables_and_sensitivities(self.solution)
+        residuals = self._calculate_residuals(y_sim)
+
+        # Scale the sensitivities like the residuals, and chain them with the
+        # scalings, adding up the columns of the inputs that take the same entry of x
+        jacobian_inputs = np.vstack(
+            [
+                dy * (weights / np.sqrt(n))[:, np.newaxis]
+                for dy, weights, n in zip(
+                    dy_sim, self._weights_data, self._count_residuals(y_sim)
+                )
+            ]
+        )
+        jacobian_inputs[np.isnan(residuals)] = 0
+        jacobian = np.zeros((len(residuals), len(x)))
+        np.add.at(
+            jacobian.T,
+            self._sensitivity_indices,
+            (jacobian_inputs * self.scalings[self._sensitivity_indices]).T,
+        )
+
+        return np.nan_to_num(residuals), jacobian
+
+    def _count_residuals(self, y_sim):
+        """
+        Count the points of each variable where the simulation and the data are both
+        defined.
+        """
+        return [
+            max(np.count_nonzero(~np.isnan(sim - data)), 1)
+            for sim, data in zip(y_sim, self._y_data)
+        ]
+
+    def _calculate_residuals(self, y_sim):
+        """
+        Calculate the weighted residuals from the values of the variables to fit at
+        the times of the data. Undefined residuals are kept as NaN.
+        """
+        return np.concatenate(
+            [
+                (sim - data) * weights / np.sqrt(n)
+                for sim, data, weights, n in zip(
+                    y_sim,
+                    self._y_data,
+                    self._weights_data,
+                    self._count_residuals(y_sim),
+                )
+            ]
+        )
+
+    def objective_function_batch(self, X):
+        """
+        Calculate the cost function for a batch of parameter values. The members are
+        solved one after another with the built model and the solver of the
+        problem, which is set up once for all the batches. Passing a list of inputs
+        to the PyBaMM solver instead would start a new process pool and send the
+        model to it for each batch, which costs more than the solves. To solve the
+        members in parallel, use a persistent :class:`pbparam.ProcessPoolEvaluator`.
+
+        Parameters
+        ----------
+        X : array-like
+            Two dimensional array where each row holds values of the parameters
+
+        Returns
+        -------
+        costs : numpy.ndarray
+            The calculated cost of the simulation for each row of `X`
+        """
+        if getattr(self.model, "experiment", None):
+            return super().objective_function_batch(X)
+
+        if not self._evaluation_plan_compiled:
+            self._compile_evaluation_plan()
+
+        X = np.atleast_2d(np.asarray(X, dtype=float))
+        self._build()
+        costs = np.empty(X.shape[0])
+        for i, x in enumerate(X):
+            self.solution = self._solve(self._get_inputs(x))
+            costs[i] = self._calculate_cost(x, self.solution)
+        return costs
+
+    def _build(self):
+        """
+        Build the simulation, if it has not been built yet, so that the time spent
+        building it is not counted in the first solve.
+        """
+        if self.model.built_model is None and not getattr(
+            self.model, "experiment", None
+        ):
+            self._build_simulation()
+
+    @timed_phase("build")
+    def _build_simulation(self):
+        self.model.build()
+
+    @timed_phase("solve")
+    def _solve(self, inputs, **kwargs):
+        """
+        Solve the simulation for the given inputs at the times required by the
+        evaluation plan, computing the sensitivities if requested.
+        """
+        t_eval = [0, self._t_end] if self._t_eval is None else self._t_eval
+        if self.calculate_sensitivities:
+            kwargs["calculate_sensitivities"] = self._sensitivity_names
+
+        solution = self.model.solve(t_eval, inputs=inputs, **kwargs)
+        if "solver" not in kwargs:
+            self._save_model_cache()
+        return solution
+
+    @timed_phase("solve")
+    def _solve_with_early_abort(self, x, threshold):
+        """
+        Solve the simulation in time windows, stopping as soon as a lower bound of
+        the cost exceeds the threshold. The lower bound is the cost obtained when
+        the simulation matches the data at the times not solved yet. The last
+        window is not solved, as the solve can no longer be aborted. Sets the
+        `aborted` flag if the solve is stopped early.
+
+        Parameters
+        ----------
+        x : numpy.ndarray
+            The current values of the parameters
+        threshold : float
+            The cost above which the solve is aborted
+
+        Returns
+        -------
+        aborted : bool
+            Whether the solve was aborted
+        """
+        self._build()
+        model = self.model.built_model
+        solver = self.model.solver
+        inputs = self._get_inputs(x)
+
+        # Return a similar number of points as a full solve, which returns 100
+        window_ends = np.linspace(0, self._t_end, self.early_abort_windows + 1)[1:-1]
+        npts = int(np.ceil(100 / self.early_abort_windows)) + 1
+
+        self.aborted = False
+        solution = None
+        t_solved = []
+        y_solved = [[] for _ in self.variables_to_fit]
+        for t_window_end in window_ends:
+            if solution is None:
+                t_start, n_windows = 0, 0
+            else:
+                t_start, n_windows = solution.t[-1], len(solution.all_ts)
+            solution = solver.step(
+                solution, model, t_window_end - t_start, npts=npts, inputs=inputs
+            )
+            self._save_model_cache()
+            if solution.termination != "final time":
+                # The full solve stops at the same event
+                return False
+
+            # Evaluate the variables to fit only on the new window, and interpolate
+            # them at the times of the data solved so far
+            t_solved.extend(solution.all_ts[n_windows:])
+            for y, values in zip(
+                y_solved, self._get_window_variables(solution, n_windows)
+            ):
+                y.extend(values)
+            t_sim = np.concatenate(t_solved)
+            y_sim = [
+                np.interp(self._t_data, t_sim, np.concatenate(y)) for y in y_solved
+            ]
+
+            # Lower bound of the cost, taking the data as the simulated values at
+            # the times not solved yet
+            unsolved = self._t_data > t_sim[-1]
+            for y, y_data in zip(y_sim, self._y_data):
+                y[unsolved] = y_data[unsolved]
+            if self._evaluate_cost_function(x, y_sim) > threshold:
+                self.solution = solution
+                self.aborted = True
+                return True
+
+        return False
+
+    def _get_window_variables(self, solution, n_windows):
+        """
+        Evaluate the variables to fit on the sub-solutions added to a solution
+        after the first `n_windows`, using their CasADi functions if possible.
+        """
+        values = []
+        for v in self.variables_to_fit:
+            variable_casadi = self._get_cached_variable_casadi(solution, v)
+
+            if variable_casadi is None:
+                variable = solution[v]
+                values.append([variable(t) for t in solution.all_ts[n_windows:]])
+            else:
+                values.append(
+                    [
+                        variable_casadi(ts[np.newaxis, :], ys, inputs).full().ravel()
+                        for ts, ys, inputs in zip(
+                            solution.all_ts[n_windows:],
+                            solution.all_ys[n_windows:],
+                            solution.all_inputs_casadi[n_windows:],
+                        )
+                    ]
+                )
+        return values
+
+    def _get_inputs(self, x):
+        """
+        Assemble the dictionary of input parameters for the simulation from the
+        scaled parameters `x`.
+        """
+        values = self.scalings[self._input_indices] * x[self._input_indices]
+        return dict(zip(self._input_names, values))
+
+    def _calculate_cost(self, x, solution):
+        """
+        Calculate the cost function from the solution for the parameters `x`.
+        """
+        return self._evaluate_cost_function(x, self._get_variables(solution))
+
+    def estimated_parameters(self, x):
+        """
+        Estimate the standard deviations profiled out of the optimisation by
+        :class:`pbparam.MLE` with `profiled=True`, from the solution at the optimal
+        parameters.
+
+        Parameters
+        ----------
+        x : array-like
+            The optimal values of the parameters, unscaled
+
+        Returns
+        -------
+        parameters : dict
+            Dictionary of the estimated standard deviations, empty if the cost
+            function does not profile any parameter
+        """
+        if not getattr(self.cost_function, "profiled", False):
+            return {}
+        solution = self.calculate_solution(x)
+        if not self._evaluation_plan_compiled:
+            self._compile_evaluation_plan()
+        y_sim = [solution[v](self._t_data) for v in self.variables_to_fit]
+        return self.cost_function.estimate_parameters(
+            y_sim, list(self._y_data), self.variables_to_fit
+        )
+
+    @timed_phase("variables")
+    def _get_variables(self, solution):
+        """
+        Get the values of the variables to fit at the times of the data from a
+        solution.
+        """
+        if self._t_eval is None:
+            return self._interpolate_variables(solution)
+        return self._get_variables_on_data_grid(solution)
+
+    def _interpolate_variables(self, solution):
+        """
+        Interpolate the variables to fit at the times of the data from a solution
+        computed on the default time grid. The variables are evaluated at the times
+        of the solution with their CasADi functions, which are created once per
+        evaluation plan, instead of creating a :class:`pybamm.ProcessedVariable`
+        for each solution. The values at the times of the data after the end of the
+        solution (e.g. because an event was triggered) are set to NaN so they are
+        ignored by the cost function.
+
+        Parameters
+        ----------
+        solution : :class:`pybamm.Solution`
+            The solution to interpolate.
+
+        Returns
+        -------
+        y_sim : list of numpy.ndarray
+            The values of each variable to fit at the times of the data.
+        """
+        t_sim = np.concatenate(solution.all_ts)
+        unsolved = self._t_data > t_sim[-1]
+        y_sim = []
+        for values in self._get_window_variables(solution, 0):
+            y = np.interp(self._t_data, t_sim, np.concatenate(values))
+            y[unsolved] = np.nan
+            y_sim.append(y)
+        return y_sim
+
+    @timed_phase("cost")
+    def _evaluate_cost_function(self, x, y_sim):
+        """
+        Evaluate the cost function from the values of the variables to fit at the
+        times of the data.
+        """
+        sd = list(x[self._sd_indices])
+
+        # The variables are copied to the residuals buffer, which the cost function
+        # can work in
+        residuals = self._residuals_buffer
+        for i, y in enumerate(y_sim):
+            residuals[i] = y
+        return self.cost_function.evaluate_stacked(
+            residuals,
+            self._y_data,
+            self._weights_data,
+            sd,
+            nan_mask=self._nan_data,
+            counts=self._data_counts,
+            out=residuals,
+        )
+
+    def setup_objective_function(self):
+        """
+        Make sure the simulation uses the current parameter values, reusing the
+        built model if only the inputs have changed, and mark the evaluation plan as
+        outdated, so it gets compiled again from the current data, weights and
+        parameters in the next call to the objective function.
+        """
+        self.refresh_simulation()
+        self._evaluation_plan_compiled = False
+
+    @timed_phase("data")
+    def _compile_evaluation_plan(self):
+        """
+        Precompute the arrays used by the objective function, so that each evaluation
+        does no pandas work:
+
+        - the time grid of the data and its final time,
+        - the data of the variables to fit, stacked as a (variables, times) matrix,
+        - the weights, broadcast to the same shape as the data,
+        - the mask of the missing data, the number of points that are not missing
+          for each variable and a buffer for the residuals,
+        - the names of the inputs and the index of `x` each of them takes,
+        - the index of `x` of each parameter introduced by the cost function.
+        """
+        self._t_data = self.data["Time [s]"].to_numpy(dtype=float)
+        self._t_end = self._t_data[-1]
+        self._y_data = np.vstack(
+            [self.data[v].to_numpy(dtype=float) for v in self.variables_to_fit]
+        )
+        self._weights_data = np.vstack(
+            [
+                np.broadcast_to(
+                    np.asarray(self.weights[v], dtype=float), self._t_data.shape
+                )
+                for v in self.variables_to_fit
+            ]
+        )
+        self._nan_data = np.isnan(self._y_data)
+        self._data_counts = self._nan_data.shape[1] - np.count_nonzero(
+            self._nan_data, axis=1
+        )
+        self._residuals_buffer = np.empty_like(self._y_data)
+        self._input_names = list(self.map_inputs.keys())
+        self._input_indices = np.array(list(self.map_inputs.values()), dtype=int)
+        self._sd_indices = np.array(
+            [self.map_inputs[k] for k in self.cost_function_parameters], dtype=int
+        )
+        # The sensitivities are only computed for the model parameters, as the
+        # parameters introduced by the cost function are not inputs of the model
+        self._sensitivity_names = [
+            k for k in self._input_names if k not in self.cost_function_parameters
+        ]
+        self._sensitivity_indices = np.array(
+            [self.map_inputs[k] for k in self._sensitivity_names], dtype=int
+        )
+
+        # Times at which the solver returns the solution when solving on the data
+        # grid, and the index of the solution time for each data point. The solver
+        # needs strictly increasing times starting at t = 0, so repeated times are
+        # merged and t = 0 is prepended if needed.
+        if self.solve_on_data_grid and not getattr(self.model, "experiment", None):
+            t_unique, self._t_eval_indices = np.unique(
+                self._t_data, return_inverse=True
+            )
+            if t_unique[0] == 0:
+                self._t_eval = t_unique
+            else:
+                self._t_eval = np.concatenate([[0], t_unique])
+                self._t_eval_indices += 1
+        else:
+            self._t_eval = None
+        self._variables_casadi = {}
+        self._variables_casadi_model = None
+
+        self._evaluation_plan_compiled = True
+
+    def _get_variables_on_data_grid(self, solution):
+        """
+        Read the variables to fit from a solution computed at the times of the data,
+        without interpolating. Each variable is evaluated at all the times in a
+        single call to its CasADi function, instead of creating a
+        :class:`pybamm.ProcessedVariable`. If the solve stopped before the end of
+        the data (e.g. because an event was triggered), the missing values are set
+        to NaN so they are ignored by the cost function.
+
+        Parameters
+        ----------
+        solution : :class:`pybamm.Solution`
+            The solution computed with `t_eval` set to the times of the data.
+
+        Returns
+        -------
+        y_sim : list of numpy.ndarray
+            The values of each variable to fit at the times of the data.
+        """
+        n = self._count_data_grid_times(solution)
+
+        y_sim = []
+        y = np.full(self._t_eval.shape, np.nan)
+        for v in self.variables_to_fit:
+            variable_casadi = self._get_cached_variable_casadi(solution, v)
+
+            if variable_casadi is None:
+                entries = solution[v].entries
+            else:
+                entries = np.concatenate(
+                    [
+                        variable_casadi(ts[np.newaxis, :], ys, inputs).full().ravel()
+                        for ts, ys, inputs in zip(
+                            solution.all_ts, solution.all_ys, solution.all_inputs_casadi
+                        )
+                    ]
+                )
+            y[:n] = entries[:n]
+            y_sim.append(y[self._t_eval_indices])
+
+        return y_sim
+
+    def _count_data_grid_times(self, solution):
+        """
+        Count the solution times matching the requested ones, as a solve stopped by
+        an event ends with the time of the event.
+        """
+        n = min(len(solution.t), len(self._t_eval))
+        if n > 0 and not np.isclose(solution.t[n - 1], self._t_eval[n - 1]):
+            n -= 1
+        return n
+
+    def _get_variables_and_sensitivities(self, solution):
+        """
+        Read the variables to fit and their sensitivities with respect to the model
+        parameters at the times of the data.
+
+        Parameters
+        ----------
+        solution : :class:`pybamm.Solution`
+            The solution computed with sensitivities.
+
+        Returns
+        -------
+        y_sim : list of numpy.ndarray
+            The values of each variable to fit at the times of the data.
+        dy_sim : list of numpy.ndarray
+            The sensitivities of each variable to fit at the times of the data, with
+            one column per model parameter.
+        """
+        y_sim = []
+        dy_sim = []
+        for v in self.variables_to_fit:
+            variable = solution[v]
+            sensitivities = variable.sensitivities
+            dy = np.column_stack(
+                [
+                    np.asarray(sensitivities[name], dtype=float).ravel()
+                    for name in self._sensitivity_names
+                ]
+            )
+
+            if self._t_eval is None:
+                y = variable(self._t_data)
+                dy = np.column_stack(
+                    [np.interp(self._t_data, solution.t, column) for column in dy.T]
+                )
+                # Ignore the sensitivities where the variable is not defined
+                dy[np.isnan(y)] = 0
+            else:
+                n = self._count_data_grid_times(solution)
+                y_grid = np.full(self._t_eval.shape, np.nan)
+                y_grid[:n] = variable.entries[:n]
+                dy_grid = np.zeros(self._t_eval.shape + (dy.shape[1],))
+                dy_grid[:n] = dy[:n]
+                y = y_grid[self._t_eval_indices]
+                dy = dy_grid[self._t_eval_indices]
+
+            y_sim.append(y)
+            dy_sim.append(dy)
+
+        return y_sim, dy_sim
+
+    def _get_cached_variable_casadi(self, solution, variable):
+        """
+        Get the CasADi function evaluating a variable from a solution, created once
+        for each built model, as the functions of a model do not apply to the
+        others (e.g. after switching to the simulation of other parameter values).
+        """
+        model = solution.all_models[0]
+        if model is not self._variables_casadi_model:
+            self._variables_casadi = {}
+            self._variables_casadi_model = model
+        if variable not in self._variables_casadi:
+            self._variables_casadi[variable] = self._get_variable_casadi(
+                solution, variable
+            )
+        return self._variables_casadi[variable]
+
+    def _get_variable_casadi(self, solution, variable):
+        """
+        Create the CasADi function evaluating a variable from the time, states and
+        inputs of a solution. Returns None if the variable is not a scalar or is a
+        time integral, in which case the variable needs to be processed by PyBaMM.
+        """
+        model = solution.all_models[0]
+        variable_pybamm = model.variables_and_events[variable]
+        if isinstance(variable_pybamm, pybamm.ExplicitTimeIntegral):
+            return None
+
+        variable_casadi = solution.process_casadi_var(
+            variable_pybamm, solution.all_inputs[0], solution.all_ys[0].shape
+        )
+        if variable_casadi.numel_out(0) != 1:
+            return None
+
+        # Expanding to a scalar expression graph makes the evaluation much faster,
+        # but it is not possible for all expressions (e.g. interpolants)
+        try:
+            return variable_casadi.expand()
+        except RuntimeError:
+            return variable_casadi
 
     def calculate_solution(self, parameters=None):
         """
@@ -122,6 +915,10 @@ class DataFit(pbparam.BaseOptimisationProblem):
             # Use the final time from the data as t_eval if experiment is not present
             t_eval = [0, self.data["Time [s]"].iloc[-1]]
 
+        # Make sure the simulation uses the current parameter values
+        if self.refresh_simulation():
+            self._evaluation_plan_compiled = False
+
         # Solve the simulation with the given inputs and t_eval
         solution = self.model.solve(t_eval=t_eval, inputs=inputs, **self.solve_options)
 
@@ -2,7 +2,6 @@
 # Optimisation result class
 #
 
-import copy
 import numpy as np
 
 
@@ -23,7 +22,10 @@ class OptimisationResult(object):
     raw_result : scipy.optimize.OptimizeResult
         The raw result of the optimisation.
     optimisation_problem : object
-        The optimisation problem that was used for the optimization.
+        The optimisation problem that was used for the optimization. The result
+        keeps a snapshot of its settings, referencing its data, from which a copy
+        of the problem is rebuilt when the `optimisation_problem` attribute is first
+        accessed (e.g. by :meth:`plot`), so the result is cheap to create and keep.
     optimiser_name : str
         The optimiser name used in the optimisation.
     """
@@ -39,39 +41,59 @@ class OptimisationResult(object):
         self.message = message
         self.fun = fun
         self.raw_result = raw_result
-        self.optimisation_problem = copy.deepcopy(optimisation_problem)
+        self._problem_class = type(optimisation_problem)
+        self._problem_snapshot = optimisation_problem._snapshot()
+        self._optimisation_problem = None
         self.optimiser_name = optimiser_name
 
-        # Initialise time
+        # Initialise time and the profile and history of the evaluations
         self.solve_time = None
+        self.profile = None
+        self.profiler = None
+        self.history = None
         self.result_dict = {
-            key: x[value] for key, value in self.optimisation_problem.map_inputs.items()
+            key: x[value] for key, value in optimisation_problem.map_inputs.items()
         }
+        # Add the parameters profiled out of the optimisation by the cost function
+        self.result_dict.update(optimisation_problem.estimated_parameters(x))
 
         # Rescale initial guesses & bounds if needed
-        if self.optimisation_problem.scalings is None:
-            x0 = self.optimisation_problem.x0
-            bounds = self.optimisation_problem.bounds
+        if optimisation_problem.scalings is None:
+            x0 = optimisation_problem.x0
+            bounds = optimisation_problem.bounds
         else:
-            x0 = np.multiply(
-                self.optimisation_problem.x0, self.optimisation_problem.scalings
-            )
+            x0 = np.multiply(optimisation_problem.x0, optimisation_problem.scalings)
             bounds = []
             for bound, scaling in zip(
-                self.optimisation_problem.bounds, self.optimisation_problem.scalings
+                optimisation_problem.bounds, optimisation_problem.scalings
             ):
                 bounds.append([bound[0] * scaling, bound[1] * scaling])
 
         # Assemble initial guess dictionaries
         self.initial_guess = {
-            key: x0[value]
-            for key, value in self.optimisation_problem.map_inputs.items()
+            key: x0[value] for key, value in optimisation_problem.map_inputs.items()
         }
         self.bounds = {
-            key: bounds[value]
-            for key, value in self.optimisation_problem.map_inputs.items()
+            key: bounds[value] for key, value in optimisation_problem.map_inputs.items()
         }
 
+    def __getstate__(self):
+        # The rebuilt problem is not pickled, it is rebuilt from the snapshot
+        state = self.__dict__.copy()
+        state["_optimisation_problem"] = None
+        return state
+
+    @property
+    def optimisation_problem(self):
+        """
+        The optimisation problem, rebuilt from its snapshot on first access.
+        """
+        if self._optimisation_problem is None:
+            self._optimisation_problem = self._problem_class._from_snapshot(
+                self._problem_snapshot
+            )
+        return self._optimisation_problem
+
     def __str__(self):
         str = f"""
              Optimal values: {self.result_dict}
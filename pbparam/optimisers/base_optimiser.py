@@ -2,7 +2,64 @@
 # Base optimiser class
 #
 
-import pybamm
+import pbparam
+import copy
+import json
+import os
+import queue
+import tempfile
+import threading
+import time
+import numpy as np
+
+
+class _AskTellStopped(Exception):
+    """
+    Raised in the optimisation thread when the ask/tell optimisation is stopped.
+    """
+
+
+class _AskTellEvaluator(pbparam.BaseEvaluator):
+    """
+    Evaluator handing the points of the optimiser, which runs in another thread, to
+    :meth:`BaseOptimiser.ask` and waiting for their costs from
+    :meth:`BaseOptimiser.tell`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.name = "Ask/tell evaluator"
+        self.candidates = queue.Queue()
+        self.costs = queue.Queue()
+
+    def evaluate(self, X):
+        self.candidates.put(np.atleast_2d(np.asarray(X, dtype=float)))
+        costs = self.costs.get()
+        if costs is None:
+            raise _AskTellStopped()
+        return costs
+
+
+def _rng_state(rng):
+    """
+    Return the state of a NumPy random number generator as a JSON string.
+    """
+    if isinstance(rng, np.random.Generator):
+        state = rng.bit_generator.state
+    else:
+        state = rng.get_state(legacy=False)
+    return json.dumps(state, default=lambda value: np.asarray(value).tolist())
+
+
+def _set_rng_state(rng, state):
+    """
+    Set the state of a NumPy random number generator from :func:`_rng_state`.
+    """
+    state = json.loads(state)
+    if isinstance(rng, np.random.Generator):
+        rng.bit_generator.state = state
+    else:
+        rng.set_state(state)
 
 
 class BaseOptimiser(object):
@@ -20,9 +77,26 @@ class BaseOptimiser(object):
         self.name = "Base optimiser"
         self.single_variable = False
         self.global_optimiser = False
+        self.ask_tell = False
+        self.checkpointing = False
+        self.evaluator = None
+        self.profiler = None
+        self.result = None
+        self._ask_tell = None
+        self._checkpoint = None
 
     def optimise(
-        self, optimisation_problem, x0=None, bounds=None, pybamm_logging_level=None
+        self,
+        optimisation_problem,
+        x0=None,
+        bounds=None,
+        pybamm_logging_level=None,
+        early_abort_factor=None,
+        evaluator=None,
+        checkpoint=None,
+        checkpoint_interval=60,
+        resume_from=None,
+        profiler=None,
     ):
         """
         Optimise the optimisation problem.
@@ -38,11 +112,54 @@ class BaseOptimiser(object):
         pybamm_logging_level : str, optional
             The logging level to use when running the PyBaMM simulations. If None, it
             defaults to "ERROR"
+        early_abort_factor : float, optional
+            If provided, the solves are aborted once their cost exceeds the best
+            cost found so far relaxed by this safety factor (see
+            :meth:`pbparam.BaseOptimisationProblem.enable_early_abort`). This is
+            only supported by some optimisation problems, and is meant for
+            optimisers that only compare points with the best one, such as
+            differential evolution.
+        evaluator : :class:`pbparam.BaseEvaluator`, optional
+            If provided, the optimisers that evaluate several points at a time send
+            them to this evaluator, e.g. to run them on a pool of processes. It is
+            started before the optimisation and closed at the end. Optimisers that
+            evaluate one point at a time ignore it.
+        checkpoint : str, optional
+            If provided, the state of the optimiser is written to this file every
+            `checkpoint_interval` seconds and at the end of the optimisation, so
+            that it can be resumed with `resume_from` if it is interrupted. Only
+            the optimisers with the `checkpointing` attribute set to True support
+            it.
+        checkpoint_interval : float, optional
+            The minimum number of seconds between two checkpoints. The default is
+            60.
+        resume_from : str, optional
+            A checkpoint file written by the same optimiser for the same
+            optimisation problem (see
+            :meth:`pbparam.BaseOptimisationProblem.fingerprint`), to continue the
+            optimisation from.
+        profiler : str or :class:`pbparam.Profiler`, optional
+            If provided, the optimisation is profiled, with cProfile ("cprofile")
+            or by sampling the call stacks ("sampling"), or with the profiler
+            passed. The evaluations run in the worker processes of a
+            :class:`pbparam.ProcessPoolEvaluator` are profiled too and merged, but
+            not those run by the optimiser's own workers (e.g. the `workers`
+            option of :class:`pbparam.ScipyDifferentialEvolution`). The profiler
+            is available as the `profiler` attribute of the result.
         Returns
         -------
         result : :class:`OptimisationResult` object.
             The results of the optimisation.
         """
+        import pybamm
+
+        if (checkpoint or resume_from) and not self.checkpointing:
+            raise NotImplementedError(
+                "checkpoints are not supported by {}".format(self.name)
+            )
+        if isinstance(profiler, str):
+            profiler = pbparam.Profiler(profiler)
+
         # Setup cost function which resets simulation.solve.integrator_specs
         # Otherwise the multiprocessing will fail
         optimisation_problem.setup_objective_function()
@@ -57,10 +174,66 @@ class BaseOptimiser(object):
         self.x0 = x0 or optimisation_problem.x0
         self.bounds = bounds or optimisation_problem.bounds
 
-        result = self._run_optimiser(optimisation_problem, self.x0, self.bounds)
+        if early_abort_factor is not None:
+            optimisation_problem.enable_early_abort(early_abort_factor)
+        timer = getattr(optimisation_problem, "timer", None)
+        if timer is not None:
+            timer.reset()
+        history = getattr(optimisation_problem, "history", None)
+        if history is not None:
+            # Each optimisation records to a new history, so the results of the
+            # previous ones keep theirs
+            history = pbparam.EvaluationHistory(
+                maxsize=history.maxsize, filename=history.filename
+            )
+            optimisation_problem.history = history
+        # The evaluator is started after enabling the early abort so that the
+        # problem is sent to the workers with the same settings
+        self.evaluator = evaluator
+        self.profiler = profiler
+        self._checkpoint = {
+            "filename": checkpoint,
+            "interval": checkpoint_interval,
+            "resume_from": resume_from,
+            "time": time.monotonic(),
+        }
+        if evaluator is not None:
+            if profiler is not None:
+                evaluator.profiler = profiler
+            evaluator.start(optimisation_problem)
+        try:
+            # The profiler is started after the evaluator, so that the worker
+            # processes are not forked while it is running
+            if profiler is not None:
+                profiler.start()
+            try:
+                result = self._run_optimiser(
+                    optimisation_problem, self.x0, self.bounds
+                )
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+        finally:
+            if evaluator is not None:
+                evaluator.close()
+                if profiler is not None:
+                    evaluator.profiler = None
+            self.profiler = None
+            if early_abort_factor is not None:
+                optimisation_problem.disable_early_abort()
+            # Restore original logging level
+            pybamm.set_logging_level(old_logging_level)
 
-        # Restore original logging level
-        pybamm.set_logging_level(old_logging_level)
+        if timer is not None:
+            result.profile = timer.summary()
+        if history is not None:
+            # The file of a memory-mapped history is overwritten by the next
+            # optimisation, so the result keeps a copy in memory
+            if history.filename is not None:
+                history = copy.deepcopy(history)
+            result.history = history
+        if profiler is not None:
+            result.profiler = profiler
 
         return result
 
@@ -69,3 +242,188 @@ class BaseOptimiser(object):
         Run the optimiser. It is implemented in subclasses.
         """
         pass
+
+    def _write_checkpoint(self, optimisation_problem, state, force=False):
+        """
+        Write the state of the optimiser to the checkpoint file, if one was passed to
+        :meth:`optimise` and `checkpoint_interval` seconds have passed since the
+        last checkpoint (or `force` is True).
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.BaseOptimisationProblem`
+            The optimisation problem, whose fingerprint is stored.
+        state : dict
+            The arrays (or scalars and strings) describing the state.
+        force : bool, optional
+            Whether to write the checkpoint regardless of the interval. The default
+            is False.
+        """
+        checkpoint = self._checkpoint
+        if checkpoint is None or checkpoint["filename"] is None:
+            return
+        now = time.monotonic()
+        if not force and now - checkpoint["time"] < checkpoint["interval"]:
+            return
+        checkpoint["time"] = now
+
+        filename = os.fspath(checkpoint["filename"])
+        # Write to a temporary file first so that an interruption never leaves a
+        # partially written checkpoint
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(os.path.abspath(filename)), suffix=".tmp", delete=False
+        ) as file:
+            np.savez_compressed(
+                file,
+                optimiser=type(self).__name__,
+                fingerprint=optimisation_problem.fingerprint(),
+                **state,
+            )
+        os.replace(file.name, filename)
+
+    def _read_checkpoint(self, optimisation_problem):
+        """
+        Read the checkpoint to resume from, if one was passed to :meth:`optimise`.
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.BaseOptimisationProblem`
+            The optimisation problem, which must be the one the checkpoint was
+            written for.
+
+        Returns
+        -------
+        state : dict or None
+            The state written by :meth:`_write_checkpoint`.
+        """
+        checkpoint = self._checkpoint
+        if checkpoint is None or checkpoint["resume_from"] is None:
+            return None
+        with np.load(checkpoint["resume_from"], allow_pickle=False) as data:
+            state = {name: data[name] for name in data.files}
+        if str(state.pop("optimiser")) != type(self).__name__:
+            raise ValueError(
+                "The checkpoint was not written by {}".format(type(self).__name__)
+            )
+        if str(state.pop("fingerprint")) != optimisation_problem.fingerprint():
+            raise ValueError(
+                "The checkpoint was written for a different optimisation problem"
+            )
+        return state
+
+    def start(self, optimisation_problem, x0=None, bounds=None, **kwargs):
+        """
+        Start an ask/tell optimisation, where the caller evaluates the points instead
+        of the optimiser. The points are obtained with :meth:`ask`, and their costs
+        passed back with :meth:`tell`, until :meth:`ask` returns None. This lets an
+        external scheduler run the evaluations, e.g. on a cluster::
+
+            optimiser.start(optimisation_problem)
+            X = optimiser.ask()
+            while X is not None:
+                optimiser.tell([optimisation_problem.evaluate(x) for x in X])
+                X = optimiser.ask()
+            result = optimiser.result
+
+        The optimiser runs in a background thread that waits for the costs, so the
+        points it evaluates together (e.g. a generation of differential evolution
+        or the points of the finite differences) are returned in the same batch.
+        Only the optimisers with the `ask_tell` attribute set to True support it.
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.OptimisationProblem`
+            The optimisation problem to be optimised.
+        x0 : numpy array (optional)
+            The initial guesses for the optimisation.
+        bounds : list of tuples (optional)
+            The bounds for the optimisation.
+        **kwargs
+            Other arguments passed to :meth:`optimise`.
+        """
+        if not self.ask_tell:
+            raise NotImplementedError(
+                "ask/tell is not supported by {}".format(self.name)
+            )
+        self.stop()
+
+        evaluator = _AskTellEvaluator()
+        state = {"evaluator": evaluator, "result": None, "error": None}
+
+        def run():
+            try:
+                state["result"] = self.optimise(
+                    optimisation_problem, x0, bounds, evaluator=evaluator, **kwargs
+                )
+            except _AskTellStopped:
+                pass
+            except Exception as error:
+                state["error"] = error
+            finally:
+                # Tell ask that there are no more points
+                evaluator.candidates.put(None)
+
+        state["thread"] = threading.Thread(target=run, daemon=True)
+        self._ask_tell = state
+        self.result = None
+        state["thread"].start()
+
+    def ask(self):
+        """
+        Return the next batch of points to evaluate in an ask/tell optimisation (see
+        :meth:`start`).
+
+        Returns
+        -------
+        X : numpy.ndarray or None
+            Two dimensional array where each row is a point, or None if the
+            optimisation has finished, in which case the result is in the `result`
+            attribute.
+        """
+        if self._ask_tell is None:
+            raise RuntimeError("start needs to be called before ask")
+        state = self._ask_tell
+        if state.get("pending") is not None:
+            return state["pending"]
+
+        X = state["evaluator"].candidates.get()
+        if X is None:
+            state["thread"].join()
+            self._ask_tell = None
+            if state["error"] is not None:
+                raise state["error"]
+            self.result = state["result"]
+        else:
+            state["pending"] = X
+        return X
+
+    def tell(self, costs):
+        """
+        Pass the costs of the points returned by the last call to :meth:`ask`.
+
+        Parameters
+        ----------
+        costs : array-like
+            The cost of each point.
+        """
+        state = self._ask_tell
+        if state is None or state.get("pending") is None:
+            raise RuntimeError("ask needs to be called before tell")
+        costs = np.asarray(costs, dtype=float).ravel()
+        if len(costs) != len(state["pending"]):
+            raise ValueError(
+                "Expected {} costs, got {}".format(len(state["pending"]), len(costs))
+            )
+        state["pending"] = None
+        state["evaluator"].costs.put(costs)
+
+    def stop(self):
+        """
+        Stop the ask/tell optimisation in progress, if any.
+        """
+        state = self._ask_tell
+        if state is None:
+            return
+        state["evaluator"].costs.put(None)
+        state["thread"].join()
+        self._ask_tell = None
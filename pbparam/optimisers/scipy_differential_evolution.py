@@ -2,9 +2,32 @@
 # SciPy Differential Evolution optimiser
 #
 import pbparam
+import re
 import numpy as np
+import scipy
+from pbparam.optimisers.base_optimiser import _rng_state, _set_rng_state
 from scipy.optimize import differential_evolution
-import pybamm
+
+# The checkpoints use the solver class behind scipy.optimize.differential_evolution
+# to save and restore its state. Its callback taking the intermediate result and
+# the private attributes saved in the checkpoints are those of SciPy 1.12 and later.
+CHECKPOINT_SCIPY_VERSION = (1, 12)
+_SOLVER_ATTRIBUTES = [
+    "population",
+    "population_energies",
+    "feasible",
+    "constraint_violation",
+    "random_number_generator",
+    "_random_population_index",
+    "_nfev",
+]
+
+
+def _scipy_version():
+    """
+    Return the major and minor version of SciPy.
+    """
+    return tuple(int(part) for part in re.findall(r"\d+", scipy.__version__)[:2])
 
 
 class ScipyDifferentialEvolution(pbparam.BaseOptimiser):
@@ -23,15 +46,43 @@ class ScipyDifferentialEvolution(pbparam.BaseOptimiser):
     ----------
     extra_options : dict, optional
         Dict of arguments that will be passed to the differential_evolution function.
+        The `workers` option cannot be combined with a profiler (see
+        :meth:`pbparam.BaseOptimiser.optimise`).
+    vectorized : bool, optional
+        If True, the whole population is evaluated in a single call to
+        :meth:`pbparam.BaseOptimisationProblem.evaluate_batch`, which lets the
+        optimisation problem reuse the set up model and solver for all the
+        members. To solve the members in parallel, pass a
+        :class:`pbparam.ProcessPoolEvaluator` to :meth:`optimise`. This sets the
+        `updating` option of differential_evolution to "deferred". The default is
+        False.
+
+    If an evaluator is passed to :meth:`optimise` (or in an ask/tell optimisation,
+    see :meth:`pbparam.BaseOptimiser.start`), the members of each generation are
+    sent to it together, with the `updating` option set to "deferred" too, and the
+    points of the polishing step are sent one at a time.
+
+    Checkpoints (see :meth:`pbparam.BaseOptimiser.optimise`) hold the population
+    and its costs, the number of generations and evaluations and the state of the
+    random number generator, so a resumed optimisation continues exactly as if it
+    had not been interrupted. `maxiter` counts the generations of the whole
+    optimisation, including those before the checkpoint. Checkpoints need SciPy 1.12
+    or later, as they rely on the internal state of the solver of
+    :func:`scipy.optimize.differential_evolution`. Without `checkpoint` or
+    `resume_from`, the optimisation runs through
+    :func:`scipy.optimize.differential_evolution`.
 
     """
 
-    def __init__(self, extra_options=None):
+    def __init__(self, extra_options=None, vectorized=False):
         super().__init__()
         self.extra_options = extra_options or {}
+        self.vectorized = vectorized
         self.name = "SciPy Differential Evolution optimiser"
         self.single_variable = False
         self.global_optimiser = True
+        self.ask_tell = True
+        self.checkpointing = _scipy_version() >= CHECKPOINT_SCIPY_VERSION
 
     def _run_optimiser(self, optimisation_problem, x0, bounds):
         """
@@ -52,13 +103,49 @@ class ScipyDifferentialEvolution(pbparam.BaseOptimiser):
             The results of the optimization process.
 
         """
+        if self.profiler is not None and self.extra_options.get("workers", 1) != 1:
+            raise ValueError(
+                "the profiler does not cover the workers of differential_evolution, "
+                "use a ProcessPoolEvaluator to profile parallel evaluations"
+            )
+
+        if self.evaluator is not None:
+
+            def objective_function(x):
+                # The population is sent to the evaluator together, the polishing
+                # step sends one vector at a time
+                if np.ndim(x) == 1:
+                    return self.evaluator.evaluate(x[np.newaxis, :])[0]
+                return self.evaluator.evaluate(x.T)
+
+            options = {"vectorized": True, "updating": "deferred"}
+        elif self.vectorized:
+
+            def objective_function(x):
+                # SciPy passes the population as an (N, S) array, but the polishing
+                # step evaluates single vectors
+                if np.ndim(x) == 1:
+                    return optimisation_problem.evaluate(x)
+                return optimisation_problem.evaluate_batch(x.T)
+
+            options = {"vectorized": True, "updating": "deferred"}
+        else:
+            objective_function = optimisation_problem.evaluate
+            options = {}
+
+        import pybamm
+
         timer = pybamm.Timer()
-        raw_result = differential_evolution(
-            optimisation_problem.objective_function,
-            bounds,
-            x0=x0,
-            **self.extra_options,
-        )
+        options = {**options, **self.extra_options}
+        checkpoint = self._checkpoint or {}
+        if checkpoint.get("filename") is None and checkpoint.get("resume_from") is None:
+            raw_result = differential_evolution(
+                objective_function, bounds, x0=x0, **options
+            )
+        else:
+            raw_result = self._solve_with_checkpoints(
+                objective_function, bounds, x0, options, optimisation_problem
+            )
         solve_time = timer.time()
         if optimisation_problem.scalings is None:
             scaled_result = raw_result.x
@@ -76,3 +163,91 @@ class ScipyDifferentialEvolution(pbparam.BaseOptimiser):
         )
         result.solve_time = solve_time
         return result
+
+    def _solve_with_checkpoints(
+        self, objective_function, bounds, x0, options, optimisation_problem
+    ):
+        """
+        Run the solver of differential_evolution, restoring its state from the
+        checkpoint to resume from and checkpointing it after each generation.
+        """
+        from scipy.optimize._differentialevolution import (
+            DifferentialEvolutionSolver,
+        )
+
+        with DifferentialEvolutionSolver(
+            objective_function, bounds, x0=x0, **options
+        ) as solver:
+            # Fail clearly if the internal state of the solver has changed
+            missing = [a for a in _SOLVER_ATTRIBUTES if not hasattr(solver, a)]
+            if missing:
+                raise RuntimeError(
+                    "Checkpoints are not supported with SciPy {}, whose "
+                    "differential evolution solver has no attribute {}".format(
+                        scipy.__version__, ", ".join(missing)
+                    )
+                )
+            iterations = self._restore_solver(solver, optimisation_problem)
+            user_callback = solver.callback
+            latest_state = {}
+
+            def callback(intermediate_result):
+                latest_state.update(
+                    self._solver_state(solver, iterations + intermediate_result.nit)
+                )
+                self._write_checkpoint(optimisation_problem, latest_state)
+                if user_callback is not None:
+                    return user_callback(intermediate_result)
+                return False
+
+            solver.callback = callback
+            raw_result = solver.solve()
+            # The last checkpoint holds the last generation, as the polishing step
+            # changes the population
+            if latest_state:
+                self._write_checkpoint(optimisation_problem, latest_state, force=True)
+            raw_result.nit += iterations
+        return raw_result
+
+    def _restore_solver(self, solver, optimisation_problem):
+        """
+        Restore the state of the solver from the checkpoint to resume from, if any,
+        and return the number of generations already run.
+        """
+        state = self._read_checkpoint(optimisation_problem)
+        if state is None:
+            return 0
+        if state["population"].shape != solver.population.shape:
+            raise ValueError(
+                "The population of the checkpoint has shape {}, expected {}".format(
+                    state["population"].shape, solver.population.shape
+                )
+            )
+        solver.population = state["population"]
+        solver.population_energies = state["population_energies"]
+        solver.feasible = state["feasible"]
+        solver.constraint_violation = state["constraint_violation"]
+        solver._random_population_index = state["random_population_index"]
+        solver._nfev = int(state["nfev"])
+        _set_rng_state(solver.random_number_generator, str(state["rng_state"]))
+        iterations = int(state["nit"])
+        solver.maxiter = max(solver.maxiter - iterations, 0)
+        return iterations
+
+    def _solver_state(self, solver, iterations):
+        """
+        Return the state of the solver after a generation, to be checkpointed.
+        """
+        return {
+            "population": solver.population.copy(),
+            "population_energies": solver.population_energies.copy(),
+            "feasible": solver.feasible.copy(),
+            "constraint_violation": solver.constraint_violation.copy(),
+            "x": solver.x,
+            "fun": solver.population_energies[0],
+            # The indices shuffled in place to pick the members to mutate
+            "random_population_index": solver._random_population_index.copy(),
+            "nfev": solver._nfev,
+            "nit": iterations,
+            "rng_state": _rng_state(solver.random_number_generator),
+        }
@@ -0,0 +1,136 @@
+#
+# SciPy Least Squares optimiser
+#
+import pbparam
+import numpy as np
+from scipy.optimize import least_squares
+
+
+class ScipyLeastSquares(pbparam.BaseOptimiser):
+    """
+    Scipy Least Squares class.
+
+    This class is a wrapper around the scipy.optimize.least_squares function. It
+    minimises the sum of squares of the residuals of the optimisation problem (see
+    :meth:`pbparam.BaseOptimisationProblem.residuals`), so trust-region methods can
+    exploit the structure of the fit and usually converge in fewer evaluations than
+    minimising the scalar cost. For a single variable this is equivalent to
+    minimising the RMSE. Please refer to
+    (https://docs.scipy.org/doc/scipy/reference/generated/scipy.optimize.least_squares.html)
+    for more details.
+
+    If the optimisation problem computes the sensitivities (e.g.
+    :class:`pbparam.DataFit` with `calculate_sensitivities=True`), the jacobian of
+    the residuals is computed from them instead of using finite differences. This
+    can be overridden by passing `jac` in `extra_options`.
+
+    Parameters
+    ----------
+    method : str
+        Algorithm to perform minimization. Should be one of
+
+        ‘trf’
+
+        ‘dogbox’
+
+        ‘lm’ (does not support bounds, so the bounds of the problem are ignored)
+
+    extra_options : dict, optional
+        Dict of arguments that will be used in optimiser.
+    """
+
+    def __init__(self, method="trf", extra_options=None):
+        super().__init__()
+        self.method = method
+        self.extra_options = extra_options or {}
+        self.name = "SciPy Least Squares optimiser with {} method".format(method)
+        self.single_variable = False
+        self.global_optimiser = False
+
+    def _run_optimiser(self, optimisation_problem, x0, bounds):
+        """
+        Run the optimiser.
+
+        Parameters
+        ----------
+        optimisation_problem : :class:`pbparam.OptimisationProblem`
+            The optimization problem.
+        x0 : array-like
+            Initial guess of the solution.
+        bounds : tuple
+            Bounds of the variables.
+
+        Returns
+        -------
+        result : :class:`pbparam.OptimisationResult`
+            The result of the optimization.
+        """
+        if isinstance(optimisation_problem.cost_function, pbparam.MLE):
+            raise ValueError(
+                "ScipyLeastSquares minimises the sum of squared residuals, so it "
+                "cannot be used with the MLE cost function"
+            )
+
+        if (
+            getattr(optimisation_problem, "calculate_sensitivities", False)
+            and "jac" not in self.extra_options
+        ):
+            # The residuals and the jacobian come from the same solve, so the
+            # jacobian is stored until SciPy asks for it
+            last = {}
+
+            def residuals(x):
+                last["x"] = np.array(x)
+                last["residuals"], last["jacobian"] = (
+                    optimisation_problem.residuals_and_jacobian(x)
+                )
+                return last["residuals"]
+
+            def jacobian(x):
+                if "x" not in last or not np.array_equal(x, last["x"]):
+                    residuals(x)
+                return last["jacobian"]
+
+            jac = {"jac": jacobian}
+        else:
+            residuals = optimisation_problem.residuals
+            jac = {}
+
+        if bounds is None or self.method == "lm":
+            bounds = (-np.inf, np.inf)
+        else:
+            bounds = tuple(np.array(bounds, dtype=float).T)
+
+        import pybamm
+
+        timer = pybamm.Timer()
+        raw_result = least_squares(
+            residuals,
+            np.array(x0, dtype=float),
+            method=self.method,
+            bounds=bounds,
+            **jac,
+            **self.extra_options,
+        )
+        solve_time = timer.time()
+
+        if optimisation_problem.scalings is None:
+            scaled_result = raw_result.x
+        else:
+            scaled_result = np.multiply(raw_result.x, optimisation_problem.scalings)
+
+        # Report the cost function at the optimum, consistently with the other
+        # optimisers, rather than the sum of squares
+        result = pbparam.OptimisationResult(
+            scaled_result,
+            raw_result.success,
+            raw_result.message,
+            optimisation_problem.evaluate(raw_result.x),
+            raw_result,
+            optimisation_problem,
+            self.name,
+        )
+
+        result.solve_time = solve_time
+
+        return result
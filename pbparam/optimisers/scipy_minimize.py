@@ -4,7 +4,9 @@
 import pbparam
 import numpy as np
 from scipy.optimize import minimize
-import pybamm
+
+# Methods of scipy.optimize.minimize that do not use the gradient
+GRADIENT_FREE_METHODS = ["nelder-mead", "powell", "cobyla"]
 
 
 class ScipyMinimize(pbparam.BaseOptimiser):
@@ -54,16 +56,45 @@ class ScipyMinimize(pbparam.BaseOptimiser):
 
     extra_options : dict, optional
         Dict of arguments that will be used in optimiser.
+    finite_difference : :class:`pbparam.ParallelFiniteDifference`, optional
+        If provided and the method uses gradients, the gradient is computed by
+        finite differences evaluated in parallel, instead of one point after
+        another by SciPy.
+
+    If an evaluator is passed to :meth:`optimise`, all the points are sent to it,
+    and if the method uses gradients they are computed by finite differences whose
+    points are sent together. This takes precedence over the analytic gradient.
+
+    If the optimisation problem computes the sensitivities (e.g.
+    :class:`pbparam.DataFit` with `calculate_sensitivities=True`) and the method
+    uses gradients, the analytic gradient of the cost function is passed to the
+    minimiser instead of letting it use finite differences. This can be overridden
+    by passing `jac` in `extra_options`.
+
+    Checkpoints (see :meth:`pbparam.BaseOptimiser.optimise`) hold the best point
+    found and the number of evaluations. The internal state of the methods (e.g.
+    the simplex or the Hessian approximation) is not available from SciPy, so a
+    resumed optimisation is a warm restart from the best point rather than an
+    exact continuation.
     """
 
-    def __init__(self, method=None, extra_options=None, optimiser_options=None):
+    def __init__(
+        self,
+        method=None,
+        extra_options=None,
+        optimiser_options=None,
+        finite_difference=None,
+    ):
         super().__init__()
         self.method = method
         self.extra_options = extra_options or {}
         self.optimiser_options = optimiser_options or {}
+        self.finite_difference = finite_difference
         self.name = "SciPy Minimize optimiser with {} method".format(method)
         self.single_variable = False
         self.global_optimiser = False
+        self.ask_tell = True
+        self.checkpointing = True
 
     def _run_optimiser(self, optimisation_problem, x0, bounds):
         """
@@ -83,17 +114,71 @@ class ScipyMinimize(pbparam.BaseOptimiser):
         result : :class:`pbparam.OptimisationResult`
             The result of the optimization.
         """
+        import pybamm
+
         timer = pybamm.Timer()
 
-        raw_result = minimize(
-            optimisation_problem.objective_function,
-            x0,
-            method=self.method,
-            bounds=bounds,
-            **self.extra_options,
-            options=self.optimiser_options,
-        )
+        finite_difference = None
+        if self._use_finite_difference():
+            finite_difference = self.finite_difference
+        elif self.evaluator is not None and self._uses_gradient():
+            finite_difference = pbparam.ParallelFiniteDifference(
+                evaluator=self.evaluator
+            )
+        elif self.evaluator is not None:
+
+            def objective_function(x):
+                return self.evaluator.evaluate(x[np.newaxis, :])[0]
+
+            jac = {}
+        elif self._use_gradient(optimisation_problem):
+            objective_function = optimisation_problem.evaluate_with_gradient
+            jac = {"jac": True}
+        else:
+            objective_function = optimisation_problem.evaluate
+            jac = {}
+
+        if finite_difference is not None:
+            finite_difference.start(optimisation_problem, bounds)
+            objective_function = finite_difference
+            jac = {"jac": True}
+
+        state = self._read_checkpoint(optimisation_problem)
+        evaluations = 0 if state is None else int(state["nfev"])
+        if state is not None:
+            x0 = state["x"]
+        best = {}
+        if (self._checkpoint or {}).get("filename") is not None:
+            untracked_function = objective_function
+
+            def objective_function(x):
+                # Record the best point so far in the checkpoints
+                value = untracked_function(x)
+                cost = value[0] if jac else value
+                best["nfev"] = best.get("nfev", evaluations) + 1
+                if cost < best.get("fun", np.inf):
+                    best.update(x=np.array(x, dtype=float), fun=cost)
+                if "x" in best:
+                    self._write_checkpoint(optimisation_problem, best)
+                return value
+
+        try:
+            raw_result = minimize(
+                objective_function,
+                x0,
+                method=self.method,
+                bounds=bounds,
+                **jac,
+                **self.extra_options,
+                options=self.optimiser_options,
+            )
+        finally:
+            if finite_difference is not None:
+                finite_difference.close()
+            if "x" in best:
+                self._write_checkpoint(optimisation_problem, best, force=True)
         solve_time = timer.time()
+        raw_result.nfev = raw_result.get("nfev", 0) + evaluations
 
         if optimisation_problem.scalings is None:
             scaled_result = raw_result.x
@@ -113,3 +198,30 @@ class ScipyMinimize(pbparam.BaseOptimiser):
         result.solve_time = solve_time
 
         return result
+
+    def _uses_gradient(self):
+        """
+        Check whether the method uses the gradient and it is not set by the user.
+        """
+        return (
+            not callable(self.method)
+            and (self.method or "").lower() not in GRADIENT_FREE_METHODS
+            and "jac" not in self.extra_options
+        )
+
+    def _use_finite_difference(self):
+        """
+        Check whether the gradient should be computed by parallel finite
+        differences.
+        """
+        return self.finite_difference is not None and self._uses_gradient()
+
+    def _use_gradient(self, optimisation_problem):
+        """
+        Check whether the analytic gradient of the optimisation problem should be
+        passed to the minimiser.
+        """
+        return (
+            getattr(optimisation_problem, "calculate_sensitivities", False)
+            and self._uses_gradient()
+        )
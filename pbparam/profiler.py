@@ -0,0 +1,211 @@
+#
+# Profiler class
+#
+
+import collections
+import cProfile
+import marshal
+import pstats
+import sys
+import threading
+import time
+
+MODES = ["cprofile", "sampling"]
+
+
+class _RawStats(object):
+    """
+    Minimal profile-like object to build a :class:`pstats.Stats` from the raw dict
+    of statistics, e.g. after unpickling.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class Profiler(object):
+    """
+    Profiler of the code run by an optimisation, set with
+    `optimise(..., profiler=...)` (see :meth:`pbparam.BaseOptimiser.optimise`) and
+    available afterwards as the `profiler` attribute of the result.
+
+    Two modes are available:
+
+    - "cprofile" records every function call with :mod:`cProfile`. It is exact,
+      but slows down the Python code, and the statistics are available as a
+      :class:`pstats.Stats` in :attr:`stats`.
+    - "sampling" records the call stack of the profiled thread every `interval`
+      seconds from a background thread, which has a low overhead. The samples
+      are available as collapsed stacks (the format of flame graph tools) in
+      :attr:`stacks`. A sample can only be taken when the profiled thread
+      releases the GIL, so each sample is weighted by the number of intervals
+      since the previous one, attributing the time spent in C extensions that
+      hold the GIL (e.g. CasADi) to the stack seen when it returns. The samples
+      measure the wall time, so the time spent waiting (e.g. for the worker
+      processes) is included.
+
+    The profiler covers the thread that starts it. The profiles of the worker
+    processes of a :class:`pbparam.ProcessPoolEvaluator` are merged into it when
+    the evaluator is closed. The processes started by the optimisers themselves
+    (e.g. with the `workers` option of :class:`pbparam.ScipyDifferentialEvolution`)
+    are not covered, so this option cannot be combined with a profiler.
+
+    Parameters
+    ----------
+    mode : str, optional
+        The profiling mode, "cprofile" or "sampling". The default is "cprofile".
+    interval : float, optional
+        The number of seconds between two samples in sampling mode. The default is
+        0.001.
+    """
+
+    def __init__(self, mode="cprofile", interval=0.001):
+        if mode not in MODES:
+            raise ValueError(
+                "mode must be one of {}, got '{}'".format(", ".join(MODES), mode)
+            )
+        self.mode = mode
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self._stats = None
+        self._profile = None
+        self._thread = None
+        self._stopped = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def __getstate__(self):
+        # Only the statistics are kept, not the running profiler
+        state = self.__dict__.copy()
+        state["_profile"] = None
+        state["_thread"] = None
+        state["_stopped"] = None
+        if self._stats is not None:
+            state["_stats"] = self._stats.stats
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        if self._stats is not None:
+            self._stats = pstats.Stats(_RawStats(self._stats))
+
+    def start(self):
+        """
+        Start profiling the current thread. The statistics are added to those
+        already recorded.
+        """
+        if self._profile is not None or self._thread is not None:
+            raise RuntimeError("The profiler is already running")
+        if self.mode == "cprofile":
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._stopped = threading.Event()
+            self._thread = threading.Thread(
+                target=self._sample, args=(threading.get_ident(),), daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stop profiling.
+        """
+        if self._profile is not None:
+            self._profile.disable()
+            self._profile.create_stats()
+            self._add_stats(self._profile.stats)
+            self._profile = None
+        if self._thread is not None:
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+            self._stopped = None
+
+    def _sample(self, thread_id):
+        """
+        Record the stack of a thread every interval until the profiler is stopped.
+        It runs in a background thread.
+        """
+        last = time.perf_counter()
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            now = time.perf_counter()
+            weight = max(1, round((now - last) / self.interval))
+            last = now
+            frames = []
+            while frame is not None:
+                code = frame.f_code
+                frames.append(
+                    "{} ({}:{})".format(
+                        code.co_name, code.co_filename, code.co_firstlineno
+                    )
+                )
+                frame = frame.f_back
+            if frames:
+                self.stacks[";".join(reversed(frames))] += weight
+
+    def _add_stats(self, raw_stats):
+        """
+        Add the raw statistics of a profile, as in pstats files, to the statistics.
+        """
+        if not raw_stats:
+            return
+        stats = pstats.Stats(_RawStats(raw_stats))
+        if self._stats is None:
+            self._stats = stats
+        else:
+            self._stats.add(stats)
+
+    @property
+    def stats(self):
+        """
+        The statistics recorded in "cprofile" mode, or None.
+        """
+        return self._stats
+
+    def dump(self, filename):
+        """
+        Write the profile to a file: a pstats file in "cprofile" mode, which can
+        be read with :class:`pstats.Stats` or tools such as snakeviz, and collapsed
+        stacks in "sampling" mode, which can be read by flame graph tools such as
+        flamegraph.pl or speedscope.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file.
+        """
+        if self.mode == "cprofile":
+            with open(filename, "wb") as file:
+                marshal.dump({} if self._stats is None else self._stats.stats, file)
+        else:
+            with open(filename, "w") as file:
+                for stack, count in self.stacks.items():
+                    file.write("{} {}\n".format(stack, count))
+
+    def load(self, filename):
+        """
+        Add a profile written by :meth:`dump` with the same mode, e.g. by a worker
+        process, to this one.
+
+        Parameters
+        ----------
+        filename : str
+            The name of the file.
+        """
+        if self.mode == "cprofile":
+            with open(filename, "rb") as file:
+                self._add_stats(marshal.load(file))
+        else:
+            with open(filename) as file:
+                for line in file:
+                    stack, count = line.rstrip("\n").rsplit(" ", 1)
+                    self.stacks[stack] += int(count)
@@ -2,6 +2,7 @@
 # Tests for the Base Cost Function class
 #
 import pbparam
+import numpy as np
 
 import unittest
 
@@ -15,6 +16,26 @@ class TestBaseCostFunction(unittest.TestCase):
         cost_function = pbparam.BaseCostFunction()
         self.assertIsNone(cost_function.evaluate(None, None, 1))
 
+    def test_evaluate_stacked(self):
+        # By default the rows are passed to evaluate
+        cost_function = pbparam.MLE()
+        y_sim = np.array([[1.0, 2.0, 3.0], [0.5, 0.2, 0.1]])
+        y_data = np.array([[1.5, 2.0, np.nan], [0.4, 0.2, 0.3]])
+        weights = np.ones((2, 3))
+        self.assertEqual(
+            pbparam.BaseCostFunction.evaluate_stacked(
+                cost_function, y_sim, y_data, weights, [0.1, 0.2]
+            ),
+            cost_function.evaluate(
+                list(y_sim), list(y_data), list(weights), [0.1, 0.2]
+            ),
+        )
+
+    def test_evaluate_with_gradient(self):
+        cost_function = pbparam.BaseCostFunction()
+        with self.assertRaisesRegex(NotImplementedError, "Base Cost Function"):
+            cost_function.evaluate_with_gradient(None, None, 1, None, None)
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
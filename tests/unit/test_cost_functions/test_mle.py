@@ -23,6 +23,64 @@ class TestMLE(unittest.TestCase):
             < cost_function.evaluate(y_sim, y_data, 1, 1)
         )
 
+    def test_evaluate_closed_form(self):
+        import scipy.stats as stats
+
+        cost_function = pbparam.MLE()
+        rng = np.random.default_rng(0)
+        y_data = [rng.normal(size=50), rng.normal(size=30)]
+        y_data[0][[3, 7]] = np.nan
+        y_sim = [y + rng.normal(scale=0.1, size=y.size) for y in y_data]
+        y_sim[1][-4:] = np.nan
+        sd = [0.1, 0.05]
+
+        # Same as the sum of the log-densities, ignoring the NaNs
+        expected = sum(
+            -np.nansum(stats.norm.logpdf(data, loc=sim, scale=s))
+            for sim, data, s in zip(y_sim, y_data, sd)
+        )
+        self.assertAlmostEqual(
+            cost_function.evaluate(y_sim, y_data, 1, sd) / expected, 1, places=14
+        )
+
+        # Standard deviations that are not positive are ignored
+        self.assertAlmostEqual(
+            cost_function.evaluate(y_sim, y_data, 1, [0, 0.05]),
+            cost_function.evaluate(y_sim[1], y_data[1], 1, 0.05),
+        )
+
+    def test_evaluate_stacked(self):
+        cost_function = pbparam.MLE()
+        rng = np.random.default_rng(0)
+        y_data = rng.normal(size=(2, 40))
+        y_data[rng.random((2, 40)) < 0.1] = np.nan
+        y_sim = y_data + rng.normal(scale=0.1, size=(2, 40))
+        y_sim[0, -3:] = np.nan
+        sd = [0.1, 0.2]
+        expected = cost_function.evaluate(list(y_sim), list(y_data), 1, sd)
+
+        self.assertAlmostEqual(
+            cost_function.evaluate_stacked(y_sim, y_data, None, sd), expected
+        )
+        nan_mask = np.isnan(y_data)
+        out = np.empty_like(y_data)
+        self.assertAlmostEqual(
+            cost_function.evaluate_stacked(
+                y_sim,
+                y_data,
+                None,
+                sd,
+                nan_mask=nan_mask,
+                counts=np.count_nonzero(~nan_mask, axis=1),
+                out=out,
+            ),
+            expected,
+        )
+        self.assertAlmostEqual(
+            cost_function.evaluate_stacked(y_sim, y_data, None, [0.1, -1]),
+            cost_function.evaluate(y_sim[0], y_data[0], 1, 0.1),
+        )
+
     def test_get_parameters(self):
         cost_function = pbparam.MLE()
         variables = ["Voltage [V]", "X-averaged temperature [K]"]
@@ -34,6 +92,113 @@ class TestMLE(unittest.TestCase):
 
         self.assertDictEqual(parameters, expected_result)
 
+    def test_evaluate_with_gradient(self):
+        cost_function = pbparam.MLE()
+        # Linear model so the sensitivities are exact
+        A = np.array([[1.0, 0.5], [2.0, -1.0], [0.5, 3.0], [1.5, 1.0]])
+        p = np.array([0.7, 1.3])
+        sd = [0.5, 2.0]
+        y_data = [np.array([1.0, 0.5, np.nan, 2.0]), np.array([0.2, 1.0, 3.0, 2.5])]
+
+        def simulate(p):
+            return [A @ p, 2 * A @ p]
+
+        cost, gradient, sd_gradient = cost_function.evaluate_with_gradient(
+            simulate(p), y_data, 1, sd, [A, 2 * A]
+        )
+        self.assertAlmostEqual(
+            cost, cost_function.evaluate(simulate(p), y_data, 1, sd)
+        )
+
+        h = 1e-6
+        for i in range(len(p)):
+            dp = np.zeros_like(p)
+            dp[i] = h
+            fd = (
+                cost_function.evaluate(simulate(p + dp), y_data, 1, sd)
+                - cost_function.evaluate(simulate(p - dp), y_data, 1, sd)
+            ) / (2 * h)
+            self.assertAlmostEqual(gradient[i], fd, places=4)
+
+        for i in range(len(sd)):
+            sd_plus = list(sd)
+            sd_plus[i] += h
+            sd_minus = list(sd)
+            sd_minus[i] -= h
+            fd = (
+                cost_function.evaluate(simulate(p), y_data, 1, sd_plus)
+                - cost_function.evaluate(simulate(p), y_data, 1, sd_minus)
+            ) / (2 * h)
+            self.assertAlmostEqual(sd_gradient[i], fd, places=4)
+
+    def test_profiled(self):
+        cost_function = pbparam.MLE(profiled=True)
+        self.assertEqual(cost_function._get_parameters(["Voltage [V]"]), {})
+
+        rng = np.random.default_rng(0)
+        y_data = [rng.normal(size=50), rng.normal(size=30)]
+        y_data[0][[3, 7]] = np.nan
+        y_sim = [y + rng.normal(scale=0.1, size=y.size) for y in y_data]
+        y_sim[1][-4:] = np.nan
+
+        # The estimated standard deviations maximise the likelihood
+        sd = cost_function.estimate_sd(y_sim, y_data)
+        for sim, data, s in zip(y_sim, y_data, sd):
+            self.assertAlmostEqual(s, np.sqrt(np.nanmean((sim - data) ** 2)))
+        cost = cost_function.evaluate(y_sim, y_data, 1, None)
+        self.assertAlmostEqual(cost, pbparam.MLE().evaluate(y_sim, y_data, 1, sd))
+        for factor in [0.9, 1.1]:
+            self.assertLess(
+                cost,
+                pbparam.MLE().evaluate(y_sim, y_data, 1, [factor * s for s in sd]),
+            )
+        self.assertAlmostEqual(
+            cost_function.evaluate_stacked(
+                y_sim[0][np.newaxis], y_data[0][np.newaxis], None
+            ),
+            cost_function.evaluate(y_sim[0], y_data[0], 1, None),
+        )
+        self.assertEqual(
+            cost_function.evaluate(y_data[1], y_data[1], 1, None), -np.inf
+        )
+
+        variables = ["Voltage [V]", "X-averaged temperature [K]"]
+        self.assertEqual(
+            cost_function.estimate_parameters(y_sim, y_data, variables),
+            {
+                "Standard deviation of voltage [V]": sd[0],
+                "Standard deviation of x-averaged temperature [K]": sd[1],
+            },
+        )
+        self.assertEqual(
+            pbparam.MLE().estimate_parameters(y_sim, y_data, variables), {}
+        )
+
+    def test_profiled_gradient(self):
+        cost_function = pbparam.MLE(profiled=True)
+        A = np.array([[1.0, 0.5], [2.0, -1.0], [0.5, 3.0], [1.5, 1.0]])
+        p = np.array([0.7, 1.3])
+        y_data = [np.array([1.0, 0.5, np.nan, 2.0]), np.array([0.2, 1.0, 3.0, 2.5])]
+
+        def simulate(p):
+            return [A @ p, 2 * A @ p]
+
+        cost, gradient, sd_gradient = cost_function.evaluate_with_gradient(
+            simulate(p), y_data, 1, [], [A, 2 * A]
+        )
+        self.assertAlmostEqual(cost, cost_function.evaluate(simulate(p), y_data, 1, []))
+        self.assertEqual(len(sd_gradient), 0)
+
+        h = 1e-6
+        for i in range(len(p)):
+            dp = np.zeros_like(p)
+            dp[i] = h
+            fd = (
+                cost_function.evaluate(simulate(p + dp), y_data, 1, [])
+                - cost_function.evaluate(simulate(p - dp), y_data, 1, [])
+            ) / (2 * h)
+            self.assertAlmostEqual(gradient[i], fd, places=4)
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
@@ -30,6 +30,40 @@ class TestRMSE(unittest.TestCase):
             cost_function.evaluate(y_sim, y_data, [1] * len(y_data)), 4.15092219
         )
 
+    def test_evaluate_stacked(self):
+        cost_function = pbparam.RMSE()
+        rng = np.random.default_rng(0)
+        y_data = rng.normal(size=(3, 50))
+        y_data[rng.random((3, 50)) < 0.1] = np.nan
+        y_sim = y_data + rng.normal(scale=0.1, size=(3, 50))
+        y_sim[1, -5:] = np.nan
+        weights = rng.random((3, 50))
+        expected = cost_function.evaluate(list(y_sim), list(y_data), list(weights))
+
+        # Same result as evaluate, with the NaNs of the data and the simulation
+        self.assertEqual(
+            cost_function.evaluate_stacked(y_sim, y_data, weights), expected
+        )
+        nan_mask = np.isnan(y_data)
+        out = y_sim.copy()
+        self.assertEqual(
+            cost_function.evaluate_stacked(
+                out,
+                y_data,
+                weights,
+                nan_mask=nan_mask,
+                counts=np.count_nonzero(~nan_mask, axis=1),
+                out=out,
+            ),
+            expected,
+        )
+
+        # Variables without any data
+        y_data[0] = np.nan
+        self.assertTrue(
+            np.isnan(cost_function.evaluate_stacked(y_sim, y_data, weights))
+        )
+
     def test_get_parameters(self):
         cost_function = pbparam.RMSE()
         variables = ["Voltage [V]", "X-averaged temperature [K]"]
@@ -38,6 +72,35 @@ class TestRMSE(unittest.TestCase):
 
         self.assertDictEqual(parameters, expected_result)
 
+    def test_evaluate_with_gradient(self):
+        cost_function = pbparam.RMSE()
+        # Linear model so the sensitivities are exact
+        A = np.array([[1.0, 0.5], [2.0, -1.0], [0.5, 3.0], [1.5, 1.0]])
+        p = np.array([0.7, 1.3])
+        y_data = [np.array([1.0, 0.5, np.nan, 2.0]), np.array([0.2, 1.0, 3.0, 2.5])]
+        weights = [np.ones(4), np.array([1.0, 2.0, 1.0, 0.5])]
+
+        def simulate(p):
+            return [A @ p, 2 * A @ p]
+
+        cost, gradient, sd_gradient = cost_function.evaluate_with_gradient(
+            simulate(p), y_data, weights, [], [A, 2 * A]
+        )
+        self.assertAlmostEqual(
+            float(cost), float(cost_function.evaluate(simulate(p), y_data, weights))
+        )
+        self.assertEqual(sd_gradient.size, 0)
+
+        h = 1e-6
+        for i in range(len(p)):
+            dp = np.zeros_like(p)
+            dp[i] = h
+            fd = (
+                cost_function.evaluate(simulate(p + dp), y_data, weights)
+                - cost_function.evaluate(simulate(p - dp), y_data, weights)
+            ) / (2 * h)
+            self.assertAlmostEqual(gradient[i], fd, places=5)
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
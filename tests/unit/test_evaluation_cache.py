@@ -0,0 +1,60 @@
+#
+# Tests for the Evaluation Cache class
+#
+import pbparam
+import numpy as np
+
+import unittest
+
+
+class TestEvaluationCache(unittest.TestCase):
+    def test_init(self):
+        cache = pbparam.EvaluationCache()
+        self.assertEqual(cache.maxsize, 1024)
+        self.assertEqual(cache.decimals, 12)
+        self.assertEqual(len(cache), 0)
+
+        with self.assertRaisesRegex(ValueError, "maxsize"):
+            pbparam.EvaluationCache(maxsize=0)
+
+    def test_key(self):
+        cache = pbparam.EvaluationCache(decimals=6)
+        self.assertEqual(cache.key([1.0, 2.0]), cache.key(np.array([1.0, 2.0])))
+        self.assertEqual(cache.key([1.0, 2.0]), cache.key([1.0 + 1e-9, 2.0]))
+        self.assertEqual(cache.key([0.0]), cache.key([-0.0]))
+        self.assertNotEqual(cache.key([1.0, 2.0]), cache.key([1.0, 2.1]))
+
+    def test_get_set(self):
+        cache = pbparam.EvaluationCache(maxsize=2)
+        key_1 = cache.key([1])
+        key_2 = cache.key([2])
+        key_3 = cache.key([3])
+
+        self.assertIsNone(cache.get(key_1))
+        self.assertEqual(cache.misses, 1)
+
+        cache.set(key_1, 1)
+        cache.set(key_2, 2)
+        self.assertEqual(cache.get(key_1), 1)
+        self.assertEqual(cache.hits, 1)
+
+        # key_2 is now the least recently used entry so it gets evicted
+        cache.set(key_3, 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIn(key_1, cache)
+        self.assertNotIn(key_2, cache)
+        self.assertIn(key_3, cache)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(cache.misses, 0)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -0,0 +1,99 @@
+#
+# Tests for the Evaluation History class
+#
+import pbparam
+import numpy as np
+import os
+import pickle
+import tempfile
+
+import unittest
+
+
+class TestEvaluationHistory(unittest.TestCase):
+    def test_init(self):
+        history = pbparam.EvaluationHistory()
+        self.assertIsNone(history.maxsize)
+        self.assertIsNone(history.filename)
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.x.shape, (0, 0))
+        self.assertEqual(len(history.costs), 0)
+        self.assertEqual(len(history.times), 0)
+        self.assertEqual(len(history.statuses), 0)
+        self.assertIsNone(history.best_x)
+
+        with self.assertRaisesRegex(ValueError, "maxsize"):
+            pbparam.EvaluationHistory(maxsize=0)
+
+    def test_record(self):
+        history = pbparam.EvaluationHistory()
+        history.record([1, 2], 5, "success")
+        history.record([3, 4], np.nan, "error")
+        history.record([0, 1], 1, "aborted")
+        history.record([1, 1], 2, "success")
+
+        self.assertEqual(len(history), 4)
+        np.testing.assert_array_equal(history.x, [[1, 2], [3, 4], [0, 1], [1, 1]])
+        np.testing.assert_array_equal(history.costs, [5, np.nan, 1, 2])
+        np.testing.assert_array_equal(
+            history.statuses, ["success", "error", "aborted", "success"]
+        )
+        self.assertTrue(np.all(np.diff(history.times) >= 0))
+        # Only the successful evaluations count towards the best cost
+        np.testing.assert_array_equal(history.best_costs(), [5, 5, 5, 2])
+        np.testing.assert_array_equal(history.best_x, [1, 1])
+        self.assertEqual(history.best_cost, 2)
+
+        with self.assertRaisesRegex(ValueError, "Expected x of length 2, got 1"):
+            history.record([1], 1, "success")
+
+        history.reset()
+        self.assertEqual(len(history), 0)
+        self.assertEqual(history.n_recorded, 0)
+
+    def test_growth_and_maxsize(self):
+        # The buffer grows beyond its initial size
+        history = pbparam.EvaluationHistory()
+        for i in range(200):
+            history.record([i], i, "success")
+        self.assertEqual(len(history), 200)
+        np.testing.assert_array_equal(history.costs, np.arange(200))
+
+        # With a maximum size the oldest evaluations are overwritten
+        history = pbparam.EvaluationHistory(maxsize=100)
+        for i in range(250):
+            history.record([i], 250 - i, "success")
+        self.assertEqual(len(history), 100)
+        self.assertEqual(history.n_recorded, 250)
+        self.assertEqual(len(history._buffer), 100)
+        np.testing.assert_array_equal(history.costs, 250 - np.arange(150, 250))
+        self.assertEqual(history.best_cost, 1)
+
+    def test_filename(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "history.bin")
+            history = pbparam.EvaluationHistory(filename=filename)
+            for i in range(100):
+                history.record([i, -i], i, "success")
+            self.assertIsInstance(history._buffer, np.memmap)
+            self.assertEqual(
+                os.path.getsize(filename), len(history._buffer) * (4 * 8 + 1)
+            )
+            np.testing.assert_array_equal(history.x[-1], [99, -99])
+
+            # Copies are held in memory
+            copy = pickle.loads(pickle.dumps(history))
+            self.assertIsNone(copy.filename)
+            copy.record([0, 0], 0, "success")
+            self.assertEqual(len(copy), 101)
+            self.assertEqual(len(history), 100)
+            del history
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -0,0 +1,72 @@
+#
+# Tests for the Evaluation Store class
+#
+import pbparam
+import numpy as np
+import os
+import pickle
+import tempfile
+
+import unittest
+
+
+class TestEvaluationStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, "evaluations.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_set(self):
+        store = pbparam.EvaluationStore(self.filename)
+        self.assertIsNone(store.get("a", [1, 2]))
+
+        store.set("a", [1, 2], 3, "success")
+        store.set("a", [3, 4], np.nan, "failed")
+        store.set("a", [5, 6], np.nan, "error")
+        store.set("a", [7, 8], 1, "aborted")
+        self.assertEqual(store.get("a", [1, 2]), 3)
+        self.assertTrue(np.isnan(store.get("a", [3, 4])))
+        # Errors are not returned so they get evaluated again
+        self.assertIsNone(store.get("a", [5, 6]))
+        # Aborted evaluations only have a lower bound of the cost
+        self.assertIsNone(store.get("a", [7, 8]))
+        # Records are grouped by fingerprint
+        self.assertIsNone(store.get("b", [1, 2]))
+        store.close()
+
+        # Records persist after reopening the file
+        store = pbparam.EvaluationStore(self.filename)
+        self.assertEqual(store.get("a", [1, 2]), 3)
+        store.close()
+
+    def test_records(self):
+        store = pbparam.EvaluationStore(self.filename)
+        store.set("a", [1, 2], 3, "success")
+        store.set("a", [3, 4], np.nan, "failed")
+        store.set("a", [5, 6], 1, "success")
+
+        x, costs, statuses = store.records("a")
+        np.testing.assert_array_equal(x, [[5, 6], [1, 2], [3, 4]])
+        np.testing.assert_array_equal(costs, [1, 3, np.nan])
+        self.assertEqual(statuses, ["success", "success", "failed"])
+        store.close()
+
+    def test_pickle(self):
+        store = pbparam.EvaluationStore(self.filename)
+        store.set("a", [1, 2], 3, "success")
+
+        new_store = pickle.loads(pickle.dumps(store))
+        self.assertEqual(new_store.get("a", [1, 2]), 3)
+        store.close()
+        new_store.close()
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -0,0 +1,63 @@
+#
+# Tests for the Evaluation Timer class
+#
+import pbparam
+import numpy as np
+from pbparam.evaluation_timer import timed_phase
+
+import unittest
+
+
+class TimedProblem(object):
+    def __init__(self):
+        self.timer = None
+
+    @timed_phase("square")
+    def square(self, x):
+        if x < 0:
+            raise ValueError("negative x")
+        return x**2
+
+
+class TestEvaluationTimer(unittest.TestCase):
+    def test_summary(self):
+        timer = pbparam.EvaluationTimer()
+        self.assertEqual(timer.summary(), {})
+        for seconds in [1, 2, 3, 4]:
+            timer.add("solve", seconds)
+        timer.add("cost", 0.5)
+
+        profile = timer.summary()
+        self.assertEqual(list(profile), ["solve", "cost"])
+        self.assertEqual(profile["solve"]["count"], 4)
+        self.assertEqual(profile["solve"]["total"], 10)
+        self.assertEqual(profile["solve"]["p50"], 2.5)
+        self.assertAlmostEqual(profile["solve"]["p95"], 3.85)
+        self.assertEqual(profile["solve"]["max"], 4)
+        np.testing.assert_array_equal(timer.durations("solve"), [1, 2, 3, 4])
+        self.assertEqual(len(timer.durations("build")), 0)
+        self.assertIn("solve", str(timer))
+
+        timer.reset()
+        self.assertEqual(timer.summary(), {})
+
+    def test_timed_phase(self):
+        problem = TimedProblem()
+        self.assertEqual(problem.square(2), 4)
+
+        problem.timer = pbparam.EvaluationTimer()
+        self.assertEqual(problem.square(3), 9)
+        # Calls raising an error are timed too
+        with self.assertRaisesRegex(ValueError, "negative x"):
+            problem.square(-1)
+        self.assertEqual(problem.timer.summary()["square"]["count"], 2)
+        self.assertEqual(TimedProblem.square.__name__, "square")
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
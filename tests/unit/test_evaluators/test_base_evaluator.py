@@ -0,0 +1,41 @@
+#
+# Tests for the Base Evaluator class
+#
+import pbparam
+import numpy as np
+
+import unittest
+
+
+class TestBaseEvaluator(unittest.TestCase):
+    def test_base_evaluator_init(self):
+        evaluator = pbparam.BaseEvaluator()
+        self.assertEqual(evaluator.name, "Base evaluator")
+        self.assertIsNone(evaluator.optimisation_problem)
+
+    def test_evaluate(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = np.sum
+
+        evaluator = pbparam.BaseEvaluator()
+        with self.assertRaisesRegex(RuntimeError, "start"):
+            evaluator.evaluate([[1, 2]])
+
+        with evaluator:
+            evaluator.start(optimisation_problem)
+            self.assertIs(evaluator.optimisation_problem, optimisation_problem)
+            np.testing.assert_array_equal(
+                evaluator.evaluate([[1, 2], [3, 4]]), [3, 7]
+            )
+        self.assertIsNone(evaluator.optimisation_problem)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
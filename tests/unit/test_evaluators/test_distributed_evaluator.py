@@ -0,0 +1,106 @@
+#
+# Tests for the Distributed Evaluator class
+#
+import pbparam
+import numpy as np
+import os
+import tempfile
+import threading
+from pbparam.evaluators.distributed_evaluator import run_worker
+
+import unittest
+
+
+class DistributedProblem(pbparam.BaseOptimisationProblem):
+    def __init__(self, marker=None):
+        super().__init__(cost_function=pbparam.RMSE())
+        self.x0 = [0.5]
+        self.bounds = [(-2, 2)]
+        self.marker = marker
+
+    def objective_function(self, x):
+        if x[0] < -10:
+            raise ValueError("x too small")
+        # The first worker evaluating x = 3 dies, to check the point is evaluated
+        # by another worker
+        if self.marker is not None and x[0] == 3 and not os.path.exists(self.marker):
+            open(self.marker, "w").close()
+            os._exit(1)
+        return (x[0] - 1) ** 2
+
+
+class TestDistributedEvaluator(unittest.TestCase):
+    def test_distributed_evaluator_init(self):
+        evaluator = pbparam.DistributedEvaluator(local_workers=2, timeout=5)
+        self.assertEqual(evaluator.local_workers, 2)
+        self.assertEqual(evaluator.timeout, 5)
+        self.assertEqual(evaluator.name, "Distributed evaluator")
+        self.assertEqual(evaluator.workers, 0)
+        self.assertEqual(len(evaluator.authkey), 32)
+
+        with self.assertRaisesRegex(RuntimeError, "start"):
+            evaluator.evaluate([[1]])
+
+    def test_evaluate(self):
+        optimisation_problem = DistributedProblem()
+        with pbparam.DistributedEvaluator(local_workers=2) as evaluator:
+            evaluator.start(optimisation_problem)
+            np.testing.assert_array_equal(
+                evaluator.evaluate([[0], [1], [3], [2]]), [1, 0, 4, 1]
+            )
+
+            # Errors are raised, and the evaluator can still be used
+            with self.assertRaisesRegex(ValueError, "x too small"):
+                evaluator.evaluate([[0], [-20], [1]])
+            np.testing.assert_array_equal(evaluator.evaluate([[2]]), [1])
+        self.assertIsNone(evaluator._listener)
+        self.assertEqual(evaluator._processes, [])
+
+    def test_remote_worker(self):
+        # Workers started separately connect to the address of the evaluator
+        with pbparam.DistributedEvaluator(timeout=10) as evaluator:
+            evaluator.start(DistributedProblem())
+            worker = threading.Thread(
+                target=run_worker, args=(evaluator.address, evaluator.authkey)
+            )
+            worker.start()
+            np.testing.assert_array_equal(evaluator.evaluate([[0], [1]]), [1, 0])
+        worker.join()
+
+    def test_worker_loss(self):
+        with tempfile.TemporaryDirectory() as directory:
+            optimisation_problem = DistributedProblem(os.path.join(directory, "lost"))
+            with pbparam.DistributedEvaluator(local_workers=2) as evaluator:
+                evaluator.start(optimisation_problem)
+                np.testing.assert_array_equal(
+                    evaluator.evaluate([[0], [3], [1], [2]]), [1, 4, 0, 1]
+                )
+                self.assertEqual(evaluator.workers, 1)
+
+                # Without workers the evaluation times out
+                evaluator.timeout = 0.5
+                for process in evaluator._processes:
+                    process.terminate()
+                    process.join()
+                with self.assertRaisesRegex(RuntimeError, "No worker connected"):
+                    evaluator.evaluate([[0], [1]])
+
+    def test_optimise(self):
+        optimisation_problem = DistributedProblem()
+        optimiser = pbparam.ScipyDifferentialEvolution(
+            extra_options={"popsize": 5, "seed": 0, "polish": False}
+        )
+        result = optimiser.optimise(
+            optimisation_problem,
+            evaluator=pbparam.DistributedEvaluator(local_workers=2),
+        )
+        np.testing.assert_array_almost_equal(result.x, [1], decimal=3)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -0,0 +1,82 @@
+#
+# Tests for the Process Pool Evaluator class
+#
+import pbparam
+import numpy as np
+import os
+
+import unittest
+
+
+class ProcessProblem(pbparam.BaseOptimisationProblem):
+    def __init__(self):
+        super().__init__(cost_function=pbparam.RMSE())
+        self.x0 = [0.5]
+        self.bounds = [(-2, 2)]
+
+    def objective_function(self, x):
+        # Record the process so that the tests can check where x is evaluated
+        self.pids.add(os.getpid())
+        return (x[0] - 1) ** 2
+
+    def setup_objective_function(self):
+        self.pids = set()
+
+
+class TestProcessPoolEvaluator(unittest.TestCase):
+    def test_process_pool_evaluator_init(self):
+        evaluator = pbparam.ProcessPoolEvaluator(workers=2, chunksize=3)
+        self.assertEqual(evaluator.workers, 2)
+        self.assertEqual(evaluator.chunksize, 3)
+        self.assertEqual(evaluator.name, "Process pool evaluator with 2 workers")
+        self.assertGreaterEqual(pbparam.ProcessPoolEvaluator().workers, 1)
+
+        with self.assertRaisesRegex(RuntimeError, "start"):
+            evaluator.evaluate([[1]])
+
+    def test_evaluate(self):
+        optimisation_problem = ProcessProblem()
+        with pbparam.ProcessPoolEvaluator(workers=2) as evaluator:
+            evaluator.start(optimisation_problem)
+            np.testing.assert_array_equal(
+                evaluator.evaluate([[0], [1], [3]]), [1, 0, 4]
+            )
+        self.assertIsNone(evaluator._pool)
+        # The points are evaluated on the workers' copies of the problem
+        self.assertEqual(optimisation_problem.pids, set())
+
+    def test_optimise(self):
+        optimisation_problem = ProcessProblem()
+        optimiser = pbparam.ScipyDifferentialEvolution(
+            extra_options={"popsize": 5, "seed": 0, "polish": False}
+        )
+        result = optimiser.optimise(
+            optimisation_problem, evaluator=pbparam.ProcessPoolEvaluator(workers=2)
+        )
+        np.testing.assert_array_almost_equal(result.x, [1], decimal=3)
+        self.assertEqual(optimisation_problem.pids, set())
+
+    def test_profile(self):
+        optimisation_problem = ProcessProblem()
+        optimiser = pbparam.ScipyDifferentialEvolution(
+            extra_options={"maxiter": 2, "popsize": 5, "seed": 0, "polish": False}
+        )
+        evaluator = pbparam.ProcessPoolEvaluator(workers=2)
+        result = optimiser.optimise(
+            optimisation_problem, evaluator=evaluator, profiler="cprofile"
+        )
+        # The profiles of the workers are merged with the one of the optimiser
+        functions = {function for _, _, function in result.profiler.stats.stats}
+        self.assertIn("_run_optimiser", functions)
+        self.assertIn("_evaluate_in_worker", functions)
+        self.assertIsNone(evaluator.profiler)
+        self.assertIsNone(evaluator._profile_directory)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -0,0 +1,53 @@
+#
+# Tests for the Thread Pool Evaluator class
+#
+import pbparam
+import numpy as np
+import threading
+
+import unittest
+
+
+class TestThreadPoolEvaluator(unittest.TestCase):
+    def test_thread_pool_evaluator_init(self):
+        evaluator = pbparam.ThreadPoolEvaluator(workers=2)
+        self.assertEqual(evaluator.workers, 2)
+        self.assertEqual(evaluator.name, "Thread pool evaluator with 2 workers")
+        self.assertGreaterEqual(pbparam.ThreadPoolEvaluator().workers, 1)
+
+        with self.assertRaisesRegex(RuntimeError, "start"):
+            evaluator.evaluate([[1]])
+
+    def test_evaluate(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        threads = set()
+
+        def objective_function(x):
+            threads.add(threading.get_ident())
+            return np.sum(x)
+
+        optimisation_problem.objective_function = objective_function
+        optimisation_problem.enable_cache()
+
+        with pbparam.ThreadPoolEvaluator(workers=2) as evaluator:
+            evaluator.start(optimisation_problem)
+            np.testing.assert_array_equal(
+                evaluator.evaluate([[1, 2], [3, 4], [0, 0]]), [3, 7, 0]
+            )
+        self.assertIsNone(evaluator._executor)
+        self.assertNotIn(threading.get_ident(), threads)
+
+        # The threads share the evaluation cache and the best cost
+        self.assertEqual(len(optimisation_problem.cache), 3)
+        self.assertEqual(optimisation_problem.best_cost, 0)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -0,0 +1,65 @@
+#
+# Tests for the ParallelFiniteDifference class
+#
+import pbparam
+import numpy as np
+
+import unittest
+
+
+class QuadraticProblem(pbparam.BaseOptimisationProblem):
+    def __init__(self):
+        super().__init__(cost_function=pbparam.RMSE())
+        self.x0 = [3.0, -2.0]
+        self.bounds = [(-5, 5), (-5, 5)]
+
+    def objective_function(self, x):
+        return np.sum((np.asarray(x) - 1) ** 2)
+
+    def setup_objective_function(self):
+        pass
+
+
+class TestParallelFiniteDifference(unittest.TestCase):
+    def test_init(self):
+        finite_difference = pbparam.ParallelFiniteDifference(rel_step=1e-4, workers=2)
+        self.assertEqual(finite_difference.rel_step, 1e-4)
+        self.assertEqual(finite_difference.workers, 2)
+        self.assertGreaterEqual(pbparam.ParallelFiniteDifference().workers, 1)
+
+        with self.assertRaisesRegex(RuntimeError, "start"):
+            finite_difference([1, 2])
+
+    def test_steps(self):
+        finite_difference = pbparam.ParallelFiniteDifference(rel_step=[1e-2, 1e-3])
+        finite_difference.start(QuadraticProblem())
+        np.testing.assert_array_almost_equal(
+            finite_difference.steps([0.5, -20]), [1e-2, 2e-2]
+        )
+
+        # Backward steps at the upper bound
+        finite_difference.start(QuadraticProblem(), bounds=[(-1, 1), (-30, 30)])
+        np.testing.assert_array_almost_equal(
+            finite_difference.steps([1, 29.99]), [-1e-2, -2.999e-2]
+        )
+        finite_difference.close()
+
+    def test_gradient(self):
+        optimisation_problem = QuadraticProblem()
+        for workers in [1, 2]:
+            with pbparam.ParallelFiniteDifference(
+                rel_step=1e-6, workers=workers
+            ) as finite_difference:
+                finite_difference.start(optimisation_problem)
+                cost, gradient = finite_difference([2.0, 3.0])
+                self.assertEqual(cost, 5)
+                np.testing.assert_array_almost_equal(gradient, [2, 4], decimal=4)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -0,0 +1,48 @@
+#
+# Tests for the lazy imports of pbparam
+#
+import pbparam
+import subprocess
+import sys
+
+import unittest
+
+
+def modules_after(code):
+    # Run in a new interpreter, as the modules are already imported in this one
+    output = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys\nprint(' '.join(sys.modules))"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return output.stdout.split()
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_import_pbparam(self):
+        modules = modules_after("import pbparam")
+        for module in ["pybamm", "scipy", "pandas", "matplotlib"]:
+            self.assertNotIn(module, modules)
+
+    def test_import_ocp_balance(self):
+        modules = modules_after("import pbparam\npbparam.OCPBalance\npbparam.MLE")
+        self.assertIn("pbparam.optimisation_problems.OCP_balance", modules)
+        for module in ["pybamm", "scipy.stats", "matplotlib"]:
+            self.assertNotIn(module, modules)
+
+    def test_getattr(self):
+        self.assertIs(
+            pbparam.DataFit, pbparam.optimisation_problems.data_fit.DataFit
+        )
+        self.assertIn("DataFit", dir(pbparam))
+        with self.assertRaisesRegex(AttributeError, "no attribute 'Foo'"):
+            pbparam.Foo
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
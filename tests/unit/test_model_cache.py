@@ -0,0 +1,120 @@
+#
+# Tests for the Model Cache class
+#
+import pbparam
+import pybamm
+import os
+import subprocess
+import sys
+import tempfile
+
+import unittest
+
+
+class TestModelCache(unittest.TestCase):
+    def setUp(self):
+        self.parameter_values = pybamm.ParameterValues("Chen2020")
+        self.parameter_values.update(
+            {"Negative electrode diffusivity [m2.s-1]": "[input]"}
+        )
+        self.inputs = {"Negative electrode diffusivity [m2.s-1]": 3.3e-14}
+
+    def simulation(self, parameter_values=None):
+        return pybamm.Simulation(
+            pybamm.lithium_ion.SPM(),
+            parameter_values=parameter_values or self.parameter_values.copy(),
+            solver=pybamm.CasadiSolver(mode="fast"),
+        )
+
+    def test_key(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model_cache = pbparam.ModelCache(directory)
+            key = model_cache.key(self.simulation())
+            self.assertEqual(key, model_cache.key(self.simulation()))
+
+            # The key changes with the parameters that are not inputs
+            parameter_values = self.parameter_values.copy()
+            parameter_values.update({"Ambient temperature [K]": 300})
+            self.assertNotEqual(key, model_cache.key(self.simulation(parameter_values)))
+
+            # and with the model equations
+            simulation = pybamm.Simulation(
+                pybamm.lithium_ion.SPMe(),
+                parameter_values=self.parameter_values.copy(),
+                solver=pybamm.CasadiSolver(mode="fast"),
+            )
+            self.assertNotEqual(key, model_cache.key(simulation))
+
+    def test_key_across_processes(self):
+        # The key does not depend on the ids of the symbols, which change between
+        # interpreters
+        code = "\n".join(
+            [
+                "import pbparam, pybamm",
+                "parameter_values = pybamm.ParameterValues('Chen2020')",
+                "parameter_values.update(",
+                "    {'Negative electrode diffusivity [m2.s-1]': '[input]'}",
+                ")",
+                "simulation = pybamm.Simulation(",
+                "    pybamm.lithium_ion.SPM(),",
+                "    parameter_values=parameter_values,",
+                "    solver=pybamm.CasadiSolver(mode='fast'),",
+                ")",
+                "print(pbparam.ModelCache('.').key(simulation))",
+            ]
+        )
+        root = os.path.dirname(os.path.dirname(pbparam.__file__))
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [root] + [p for p in [env.get("PYTHONPATH")] if p]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            output = subprocess.run(
+                [sys.executable, "-c", code],
+                cwd=directory,
+                env=env,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+            key = pbparam.ModelCache(directory).key(self.simulation())
+        self.assertEqual(output.strip(), key)
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model_cache = pbparam.ModelCache(directory)
+            simulation = self.simulation()
+            key = model_cache.key(simulation)
+            self.assertFalse(model_cache.load(key, simulation))
+            self.assertFalse(model_cache.save(key, simulation))
+
+            solution = simulation.solve([0, 3600], inputs=self.inputs)
+            self.assertTrue(model_cache.save(key, simulation))
+            self.assertEqual(os.listdir(directory), [key + ".pkl"])
+
+            new_simulation = self.simulation()
+            self.assertTrue(model_cache.load(key, new_simulation))
+            self.assertIsNotNone(new_simulation.built_model)
+            new_solution = new_simulation.solve([0, 3600], inputs=self.inputs)
+            self.assertAlmostEqual(
+                new_solution["Voltage [V]"].entries[-1],
+                solution["Voltage [V]"].entries[-1],
+            )
+
+    def test_experiment(self):
+        with tempfile.TemporaryDirectory() as directory:
+            model_cache = pbparam.ModelCache(directory)
+            simulation = pybamm.Simulation(
+                pybamm.lithium_ion.SPM(),
+                experiment=pybamm.Experiment(["Rest for 10 minutes"]),
+            )
+            self.assertFalse(model_cache.save("key", simulation))
+            self.assertFalse(model_cache.load("key", simulation))
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -2,6 +2,7 @@
 # Tests for the Data Fit class
 #
 import pbparam
+import numpy as np
 import pandas as pd
 
 import unittest
@@ -89,6 +90,56 @@ class TestOCPBalance(unittest.TestCase):
                                     "data elements must be all array-like objects"):
             optimisation_problem = pbparam.OCPBalance(["data_fit"], ["data_ref"])
 
+    def test_profiled_mle(self):
+        data_ref = [
+            pd.DataFrame({'Voltage [V]': [0.1, 0.3, 0.5, 0.7, 0.9],
+                          'Time [s]': [5, 4, 3, 2, 1]}),
+            pd.DataFrame({'Voltage [V]': [0.1, 0.3, 0.5, 0.7, 0.9],
+                          'Time [s]': [6, 5, 4, 3, 2]}),
+        ]
+        data_fit = [
+            pd.DataFrame({'Voltage [V]': [1, 2, 3, 4, 5],
+                          'Time [s]': [5, 4, 3, 2, 1]}),
+            pd.DataFrame({'Voltage [V]': [1, 2, 3, 4, 5],
+                          'Time [s]': [6, 5, 4, 3, 2]}),
+        ]
+        optimisation_problem = pbparam.OCPBalance(
+            data_fit, data_ref, cost_function=pbparam.MLE(profiled=True)
+        )
+        optimisation_problem.setup_objective_function()
+
+        # Only the shift and stretch are optimised
+        self.assertEqual(optimisation_problem.x0, [-0.25, 0.25])
+        self.assertEqual(len(optimisation_problem.bounds), 2)
+
+        x = [-0.1, 0.21]
+        y_sim = [
+            ref(x[0] + x[1] * fit.iloc[:, 0])
+            for fit, ref in zip(data_fit, optimisation_problem.model_fun)
+        ]
+        sd = [
+            np.sqrt(np.mean((y - fit.iloc[:, 1].to_numpy()) ** 2))
+            for y, fit in zip(y_sim, data_fit)
+        ]
+        estimated = optimisation_problem.estimated_parameters(x)
+        self.assertEqual(
+            list(estimated),
+            [
+                "Standard deviation of voltage [V] of dataset 1",
+                "Standard deviation of voltage [V] of dataset 2",
+            ],
+        )
+        np.testing.assert_allclose(list(estimated.values()), sd)
+
+        optimiser = pbparam.ScipyMinimize(
+            method="Nelder-Mead", optimiser_options={"maxiter": 20}
+        )
+        result = optimiser.optimise(optimisation_problem)
+        self.assertEqual(
+            set(result.result_dict),
+            {"Shift", "Stretch", *optimisation_problem.estimated_parameters(x)},
+        )
+
     def test_weights_length_mismatch(self):
         data_fit = [
             pd.DataFrame({'Voltage [V]': [1, 2, 3, 4, 5],
@@ -152,6 +203,39 @@ class TestOCPBalance(unittest.TestCase):
         self.assertEqual(ax.get_xlabel(), "Stoichiometry")
         self.assertEqual(ax.get_ylabel(), "OCP [V]")
 
+    def test_residuals(self):
+        data_ref = pd.DataFrame({'Voltage [V]': [0.1, 0.3, 0.5, 0.7, 0.9],
+                                 'Time [s]': [5, 4, 3, 2, 1]})
+        data_fit = pd.DataFrame({'Voltage [V]': [1, 2, 3, 4, 5],
+                                 'Time [s]': [5, 4, 3, 2, 1]})
+        optimisation_problem = pbparam.OCPBalance(data_fit, data_ref)
+
+        residuals = optimisation_problem.residuals([-0.1, 0.2])
+        self.assertEqual(residuals.shape, (5,))
+        np.testing.assert_array_almost_equal(residuals, 0)
+
+        # The sum of squares of the residuals is the square of the RMSE
+        x = [0.1, 0.1]
+        self.assertAlmostEqual(
+            np.sum(optimisation_problem.residuals(x) ** 2),
+            float(optimisation_problem.objective_function(x)) ** 2,
+        )
+
+    def test_timing(self):
+        data_ref = pd.DataFrame({'Voltage [V]': [0.1, 0.3, 0.5, 0.7, 0.9],
+                                 'Time [s]': [5, 4, 3, 2, 1]})
+        data_fit = pd.DataFrame({'Voltage [V]': [1, 2, 3, 4, 5],
+                                 'Time [s]': [5, 4, 3, 2, 1]})
+        optimisation_problem = pbparam.OCPBalance(data_fit, data_ref)
+        optimisation_problem.enable_timing()
+        self.assertAlmostEqual(optimisation_problem.objective_function([-0.1, 0.2]), 0)
+
+        profile = optimisation_problem.timer.summary()
+        self.assertEqual(
+            set(profile), {"objective_function", "data", "interpolation", "cost"}
+        )
+        self.assertEqual(profile["cost"]["count"], 1)
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
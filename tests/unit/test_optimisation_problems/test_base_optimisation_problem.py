@@ -2,6 +2,9 @@
 # Tests for the Base Optimisation Problem class
 #
 import pbparam
+import numpy as np
+import os
+import tempfile
 
 import unittest
 
@@ -23,6 +26,247 @@ class TestBaseOptimisationProblem(unittest.TestCase):
         ):
             optimisation_problem.objective_function(None)
 
+    def test_evaluate(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.MLE()
+        )
+        calls = []
+
+        def objective_function(x):
+            calls.append(x)
+            return np.sum(x)
+
+        optimisation_problem.objective_function = objective_function
+
+        # Without cache every evaluation calls the objective function
+        self.assertEqual(optimisation_problem.evaluate([1, 2]), 3)
+        self.assertEqual(optimisation_problem.evaluate([1, 2]), 3)
+        self.assertEqual(len(calls), 2)
+
+        # With cache repeated evaluations are looked up
+        calls.clear()
+        optimisation_problem.enable_cache(maxsize=10)
+        self.assertEqual(optimisation_problem.evaluate([1, 2]), 3)
+        self.assertEqual(optimisation_problem.evaluate([1, 2]), 3)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(optimisation_problem.cache.hits, 1)
+        self.assertEqual(optimisation_problem.cache.misses, 1)
+
+        optimisation_problem.disable_cache()
+        self.assertIsNone(optimisation_problem.cache)
+
+    def test_evaluate_with_gradient(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.MLE()
+        )
+        with self.assertRaisesRegex(
+            NotImplementedError, "objective_function_and_gradient not defined"
+        ):
+            optimisation_problem.evaluate_with_gradient([1, 2])
+
+        def objective_function_and_gradient(x):
+            x = np.asarray(x)
+            return np.sum(x**2), 2 * x
+
+        optimisation_problem.objective_function_and_gradient = (
+            objective_function_and_gradient
+        )
+        cost, gradient = optimisation_problem.evaluate_with_gradient([1, 2])
+        self.assertEqual(cost, 5)
+        np.testing.assert_array_equal(gradient, [2, 4])
+
+        # The cost is recorded in the cache
+        optimisation_problem.enable_cache()
+        optimisation_problem.evaluate_with_gradient([1, 2])
+        self.assertEqual(optimisation_problem.evaluate([1, 2]), 5)
+
+    def test_residuals(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        with self.assertRaisesRegex(NotImplementedError, "residuals not defined"):
+            optimisation_problem.residuals([1, 2])
+        with self.assertRaisesRegex(
+            NotImplementedError, "residuals_and_jacobian not defined"
+        ):
+            optimisation_problem.residuals_and_jacobian([1, 2])
+
+    def test_early_abort(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        with self.assertRaisesRegex(ValueError, "at least 1"):
+            optimisation_problem.enable_early_abort(0.5)
+
+        optimisation_problem.enable_early_abort(1.5)
+        self.assertIsNone(optimisation_problem.early_abort_threshold())
+
+        def objective_function(x):
+            # Abort the evaluations with a large cost
+            cost = np.sum(x)
+            optimisation_problem.aborted = cost > 10
+            return cost
+
+        optimisation_problem.objective_function = objective_function
+
+        # The best cost is tracked by the evaluations
+        optimisation_problem.evaluate([1, 1])
+        self.assertEqual(optimisation_problem.best_cost, 2)
+        self.assertEqual(optimisation_problem.early_abort_threshold(), 3)
+        optimisation_problem.evaluate_batch([[1, 0], [5, 5]])
+        self.assertEqual(optimisation_problem.best_cost, 1)
+
+        # The threshold is relaxed for negative costs too
+        optimisation_problem.best_cost = -2
+        self.assertEqual(optimisation_problem.early_abort_threshold(), -1)
+
+        # Aborted evaluations are not cached
+        optimisation_problem.enable_cache()
+        optimisation_problem.evaluate([10, 10])
+        self.assertTrue(optimisation_problem.aborted)
+        self.assertEqual(len(optimisation_problem.cache), 0)
+        optimisation_problem.evaluate([1, 1])
+        self.assertFalse(optimisation_problem.aborted)
+        self.assertEqual(len(optimisation_problem.cache), 1)
+
+        optimisation_problem.disable_early_abort()
+        self.assertIsNone(optimisation_problem.early_abort_threshold())
+
+    def test_evaluate_threadsafe(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = np.sum
+        optimisation_problem.enable_cache()
+        self.assertEqual(optimisation_problem.evaluate_threadsafe([1, 2]), 3)
+        self.assertEqual(optimisation_problem.best_cost, 3)
+        self.assertEqual(len(optimisation_problem.cache), 1)
+
+        # The evaluation runs on a copy of the problem, which is reused
+        thread_problem = optimisation_problem._thread_problem()
+        self.assertIsNot(thread_problem, optimisation_problem)
+        self.assertIsNone(thread_problem.cache)
+        self.assertIs(optimisation_problem._thread_problem(), thread_problem)
+
+    def test_timing(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        self.assertIsNone(optimisation_problem.timer)
+        optimisation_problem.enable_timing()
+        self.assertIsInstance(optimisation_problem.timer, pbparam.EvaluationTimer)
+        optimisation_problem.disable_timing()
+        self.assertIsNone(optimisation_problem.timer)
+
+    def test_history(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+
+        def objective_function(x):
+            if x[0] < 0:
+                raise ValueError("negative x")
+            return np.sum(x)
+
+        optimisation_problem.objective_function = objective_function
+        optimisation_problem.enable_history()
+        optimisation_problem.enable_cache()
+        optimisation_problem.evaluate([1, 2])
+        optimisation_problem.evaluate_batch([[1, 2], [3, 4]])
+        optimisation_problem.evaluate_threadsafe([5, 6])
+        with self.assertRaisesRegex(ValueError, "negative x"):
+            optimisation_problem.evaluate([-1, 2])
+
+        # The evaluations looked up in the cache are not recorded again
+        history = optimisation_problem.history
+        np.testing.assert_array_equal(history.x, [[1, 2], [3, 4], [5, 6], [-1, 2]])
+        np.testing.assert_array_equal(history.costs, [3, 7, 11, np.nan])
+        self.assertEqual(list(history.statuses)[-1], "error")
+
+        optimisation_problem.disable_history()
+        self.assertIsNone(optimisation_problem.history)
+
+    def test_evaluate_batch(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.MLE()
+        )
+        calls = []
+
+        def objective_function(x):
+            calls.append(x)
+            return np.sum(x)
+
+        optimisation_problem.objective_function = objective_function
+        X = [[1, 2], [3, 4], [1, 2]]
+
+        # Identical rows are only evaluated once
+        np.testing.assert_array_equal(optimisation_problem.evaluate_batch(X), [3, 7, 3])
+        self.assertEqual(len(calls), 2)
+
+        # Cached rows are reused
+        calls.clear()
+        optimisation_problem.enable_cache()
+        optimisation_problem.evaluate([3, 4])
+        np.testing.assert_array_equal(optimisation_problem.evaluate_batch(X), [3, 7, 3])
+        self.assertEqual(len(calls), 2)
+
+    def test_objective_function_batch(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.MLE()
+        )
+        optimisation_problem.objective_function = np.sum
+        np.testing.assert_array_equal(
+            optimisation_problem.objective_function_batch([[1, 2], [3, 4]]), [3, 7]
+        )
+
+    def test_evaluate_store(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        calls = []
+
+        def objective_function(x):
+            calls.append(x)
+            if x[0] < 0:
+                raise ValueError("negative x")
+            return np.sum(x)
+
+        optimisation_problem.objective_function = objective_function
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "evaluations.db")
+            optimisation_problem.enable_store(filename)
+            self.assertEqual(optimisation_problem.evaluate([1, 2]), 3)
+            self.assertEqual(optimisation_problem.evaluate([1, 2]), 3)
+            self.assertEqual(len(calls), 1)
+
+            with self.assertRaisesRegex(ValueError, "negative x"):
+                optimisation_problem.evaluate([-1, 2])
+
+            _, costs, statuses = optimisation_problem.store.records(
+                optimisation_problem.fingerprint()
+            )
+            np.testing.assert_array_equal(costs, [3, np.nan])
+            self.assertEqual(statuses, ["success", "error"])
+
+            optimisation_problem.disable_store()
+            self.assertIsNone(optimisation_problem.store)
+
+    def test_fingerprint(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE(), variables_to_fit=["Voltage [V]"]
+        )
+        fingerprint = optimisation_problem.fingerprint()
+        self.assertEqual(fingerprint, optimisation_problem.fingerprint())
+
+        optimisation_problem.weights = {"Voltage [V]": [2]}
+        self.assertNotEqual(fingerprint, optimisation_problem.fingerprint())
+
+        other_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.MLE(), variables_to_fit=["Voltage [V]"]
+        )
+        self.assertNotEqual(fingerprint, other_problem.fingerprint())
+
     def test_setup_objective_function(self):
         optimisation_problem = pbparam.BaseOptimisationProblem(
             cost_function=pbparam.MLE()
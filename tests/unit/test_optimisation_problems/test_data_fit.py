@@ -5,6 +5,9 @@ import pbparam
 import pybamm
 import pandas as pd
 import numpy as np
+import pickle
+import os
+import tempfile
 import unittest
 
 from .test_opt_problem import TestOptimisationProblemTemplate
@@ -226,6 +229,611 @@ class TestDataFit(TestOptimisationProblemTemplate):
         # Check that the objective function does not return None
         self.assertIsNotNone(optimisation_problem.objective_function([1e-15]))
 
+    def test_compile_evaluation_plan(self):
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+                "X-averaged cell temperature [K]": [298, 298, 299, 299],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            sim,
+            data,
+            model_parameters,
+            variables_to_fit=["Voltage [V]", "X-averaged cell temperature [K]"],
+            cost_function=pbparam.MLE(),
+            weights={
+                "Voltage [V]": [2],
+                "X-averaged cell temperature [K]": [1, 2, 3, 4],
+            },
+        )
+        optimisation_problem.setup_objective_function()
+        self.assertFalse(optimisation_problem._evaluation_plan_compiled)
+
+        optimisation_problem._compile_evaluation_plan()
+        np.testing.assert_array_equal(optimisation_problem._t_data, [0, 1, 2, 3])
+        self.assertEqual(optimisation_problem._t_end, 3)
+        np.testing.assert_array_equal(
+            optimisation_problem._y_data,
+            [[3.7, 3.6, 3.5, 3.4], [298, 298, 299, 299]],
+        )
+        np.testing.assert_array_equal(
+            optimisation_problem._weights_data, [[2, 2, 2, 2], [1, 2, 3, 4]]
+        )
+        self.assertEqual(
+            optimisation_problem._input_names,
+            [
+                "Negative electrode diffusivity [m2.s-1]",
+                "Standard deviation of voltage [V]",
+                "Standard deviation of x-averaged cell temperature [K]",
+            ],
+        )
+        np.testing.assert_array_equal(optimisation_problem._input_indices, [0, 1, 2])
+        np.testing.assert_array_equal(optimisation_problem._sd_indices, [1, 2])
+
+    def test_solve_on_data_grid(self):
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        t = np.linspace(0, 3000, 31)
+        solution = sim.solve(t)
+        data = pd.DataFrame(
+            {
+                "Time [s]": t,
+                "Voltage [V]": solution["Voltage [V]"](t),
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        grid_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters, solve_on_data_grid=True
+        )
+        x = [1.5]
+        self.assertAlmostEqual(
+            float(optimisation_problem.objective_function(x)),
+            float(grid_problem.objective_function(x)),
+            places=4,
+        )
+        np.testing.assert_array_equal(grid_problem._t_eval, t)
+
+        # Repeated times and data not starting at t = 0
+        data = pd.DataFrame(
+            {
+                "Time [s]": [10, 20, 20, 30],
+                "Voltage [V]": [3.7, 3.6, 3.6, 3.5],
+            }
+        )
+        grid_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters, solve_on_data_grid=True
+        )
+        grid_problem.objective_function(x)
+        np.testing.assert_array_equal(grid_problem._t_eval, [0, 10, 20, 30])
+        np.testing.assert_array_equal(grid_problem._t_eval_indices, [1, 2, 2, 3])
+        y_sim = grid_problem._get_variables_on_data_grid(grid_problem.solution)
+        np.testing.assert_array_almost_equal(
+            y_sim[0], grid_problem.solution["Voltage [V]"].entries[[1, 2, 2, 3]]
+        )
+
+    def test_interpolate_variables(self):
+        model = pybamm.lithium_ion.SPM()
+        # The data go beyond the end of the discharge, where the simulation stops
+        t = np.linspace(0, 5000, 51)
+        data = pd.DataFrame({"Time [s]": t, "Voltage [V]": np.full(t.shape, 3.5)})
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        optimisation_problem.objective_function([1])
+        solution = optimisation_problem.solution
+        self.assertLess(solution.t[-1], 5000)
+
+        y_sim = optimisation_problem._interpolate_variables(solution)
+        np.testing.assert_array_almost_equal(
+            y_sim[0], solution["Voltage [V]"](t), decimal=10
+        )
+        self.assertTrue(np.isnan(y_sim[0][t > solution.t[-1]]).all())
+
+    def test_objective_function_batch(self):
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(sim, data, model_parameters)
+        X = np.array([[0.5], [1], [2]])
+
+        costs = optimisation_problem.objective_function_batch(X)
+        self.assertEqual(costs.shape, (3,))
+        for x, cost in zip(X, costs):
+            self.assertAlmostEqual(
+                cost, float(optimisation_problem.objective_function(x))
+            )
+
+        # Solving a batch after single solves still works
+        np.testing.assert_array_almost_equal(
+            optimisation_problem.objective_function_batch(X), costs
+        )
+
+    def test_objective_function_and_gradient(self):
+        model = pybamm.lithium_ion.SPM()
+        t = np.linspace(0, 3000, 31)
+        solution = pybamm.Simulation(model).solve(t)
+        data = pd.DataFrame(
+            {
+                "Time [s]": t,
+                "Voltage [V]": solution["Voltage [V]"](t) + 1e-3 * np.sin(t),
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        with self.assertRaisesRegex(ValueError, "calculate_sensitivities"):
+            optimisation_problem.objective_function_and_gradient([1.5])
+
+        for solve_on_data_grid in [False, True]:
+            optimisation_problem = pbparam.DataFit(
+                pybamm.Simulation(model),
+                data,
+                model_parameters,
+                cost_function=pbparam.MLE(),
+                solve_on_data_grid=solve_on_data_grid,
+                calculate_sensitivities=True,
+            )
+            x = np.array([1.5, 0.5])
+            cost, gradient = optimisation_problem.objective_function_and_gradient(x)
+            self.assertAlmostEqual(
+                float(cost), float(optimisation_problem.objective_function(x))
+            )
+
+            # Compare with central finite differences
+            h = 1e-4 * x
+            for i in range(len(x)):
+                dx = np.zeros_like(x)
+                dx[i] = h[i]
+                fd = (
+                    optimisation_problem.objective_function(x + dx)
+                    - optimisation_problem.objective_function(x - dx)
+                ) / (2 * h[i])
+                np.testing.assert_allclose(gradient[i], fd, rtol=1e-2)
+
+    def test_profiled_mle(self):
+        model = pybamm.lithium_ion.SPM()
+        t = np.linspace(0, 3000, 31)
+        solution = pybamm.Simulation(model).solve(t)
+        data = pd.DataFrame(
+            {
+                "Time [s]": t,
+                "Voltage [V]": solution["Voltage [V]"](t) + 1e-3 * np.sin(t),
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model),
+            data,
+            model_parameters,
+            cost_function=pbparam.MLE(profiled=True),
+            calculate_sensitivities=True,
+        )
+
+        # The standard deviation is not optimised
+        self.assertEqual(len(optimisation_problem.x0), 1)
+        self.assertEqual(
+            list(optimisation_problem.map_inputs),
+            ["Negative electrode diffusivity [m2.s-1]"],
+        )
+
+        x = np.array([1.5])
+        cost, gradient = optimisation_problem.objective_function_and_gradient(x)
+        self.assertAlmostEqual(
+            float(cost), float(optimisation_problem.objective_function(x))
+        )
+        h = 1e-4 * x
+        fd = (
+            optimisation_problem.objective_function(x + h)
+            - optimisation_problem.objective_function(x - h)
+        ) / (2 * h)
+        np.testing.assert_allclose(gradient, fd, rtol=1e-2)
+
+        # The estimated standard deviation is added to the result
+        optimiser = pbparam.ScipyMinimize(
+            method="Nelder-Mead", optimiser_options={"maxiter": 5}
+        )
+        result = optimiser.optimise(optimisation_problem)
+        y_sim = optimisation_problem.calculate_solution(result.x)["Voltage [V]"](t)
+        np.testing.assert_allclose(
+            result.result_dict["Standard deviation of voltage [V]"],
+            np.sqrt(np.mean((y_sim - data["Voltage [V]"].to_numpy()) ** 2)),
+        )
+
+    def test_residuals(self):
+        model = pybamm.lithium_ion.SPM()
+        t = np.linspace(0, 3000, 31)
+        solution = pybamm.Simulation(model).solve(t)
+        data = pd.DataFrame(
+            {
+                "Time [s]": t,
+                "Voltage [V]": solution["Voltage [V]"](t) + 1e-3 * np.sin(t),
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model),
+            data,
+            model_parameters,
+            calculate_sensitivities=True,
+        )
+        x = np.array([1.5])
+
+        # The sum of squares of the residuals is the square of the RMSE
+        residuals = optimisation_problem.residuals(x)
+        self.assertEqual(residuals.shape, (31,))
+        self.assertAlmostEqual(
+            np.sum(residuals**2),
+            float(optimisation_problem.objective_function(x)) ** 2,
+        )
+
+        # Compare the jacobian with central finite differences
+        residuals_jac, jacobian = optimisation_problem.residuals_and_jacobian(x)
+        np.testing.assert_array_almost_equal(residuals_jac, residuals)
+        self.assertEqual(jacobian.shape, (31, 1))
+        h = 1e-4 * x
+        fd = (
+            optimisation_problem.residuals(x + h)
+            - optimisation_problem.residuals(x - h)
+        ) / (2 * h)
+        np.testing.assert_allclose(jacobian[:, 0], fd, rtol=1e-2, atol=1e-8)
+
+    def test_pickle(self):
+        model = pybamm.lithium_ion.SPM()
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        cost = optimisation_problem.objective_function([1.5])
+
+        # The problem can be pickled after solving, e.g. to send it to workers
+        new_problem = pickle.loads(pickle.dumps(optimisation_problem))
+        self.assertAlmostEqual(
+            float(new_problem.objective_function([1.5])), float(cost)
+        )
+        self.assertAlmostEqual(
+            float(optimisation_problem.objective_function([1.5])), float(cost)
+        )
+
+    def test_snapshot(self):
+        model = pybamm.lithium_ion.SPM()
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        optimisation_problem.setup_objective_function()
+        optimisation_problem.enable_cache()
+        cost = optimisation_problem.objective_function([1.5])
+
+        # The snapshot references the data but not the built simulations
+        state = optimisation_problem._snapshot()
+        self.assertIs(state["data"], data)
+        self.assertIsNone(state["model"])
+        self.assertIsNone(state["solution"])
+        self.assertIsNone(state["cache"])
+        self.assertNotIn("_y_data", state)
+        self.assertIsNot(state["x0"], optimisation_problem.x0)
+
+        new_problem = pbparam.DataFit._from_snapshot(state)
+        self.assertIsNot(new_problem.model, optimisation_problem.model)
+        self.assertIsNone(new_problem.model.built_model)
+        self.assertAlmostEqual(
+            float(new_problem.objective_function([1.5])), float(cost)
+        )
+
+    def test_model_cache(self):
+        model = pybamm.lithium_ion.SPM()
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        cost = optimisation_problem.objective_function([1.5])
+
+        with tempfile.TemporaryDirectory() as directory:
+            # The simulation is built and stored when the cache is enabled
+            optimisation_problem.enable_model_cache(directory)
+            self.assertIsNotNone(optimisation_problem.model.built_model)
+            self.assertEqual(len(os.listdir(directory)), 1)
+            self.assertAlmostEqual(
+                float(optimisation_problem.objective_function([1.5])), float(cost)
+            )
+
+            # The built model is loaded from the cache instead of being pickled
+            new_problem = pickle.loads(pickle.dumps(optimisation_problem))
+            self.assertIsNotNone(new_problem.model.built_model)
+            self.assertAlmostEqual(
+                float(new_problem.objective_function([1.5])), float(cost)
+            )
+            self.assertEqual(len(os.listdir(directory)), 1)
+
+            optimisation_problem.disable_model_cache()
+            self.assertIsNone(optimisation_problem.model_cache)
+
+    def test_evaluate_threadsafe(self):
+        model = pybamm.lithium_ion.SPM()
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        cost = optimisation_problem.evaluate_threadsafe([1.5])
+        self.assertIsNone(getattr(optimisation_problem, "solution", None))
+        self.assertAlmostEqual(
+            float(optimisation_problem.objective_function([1.5])), float(cost)
+        )
+
+        # The thread has its own simulation and solver
+        thread_problem = optimisation_problem._thread_problem()
+        self.assertIsNot(thread_problem.model, optimisation_problem.model)
+        self.assertIsNot(
+            thread_problem.model.solver, optimisation_problem.model.solver
+        )
+        self.assertIsNot(
+            thread_problem.model.built_model, optimisation_problem.model.built_model
+        )
+
+    def test_timing(self):
+        model = pybamm.lithium_ion.SPM()
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        optimisation_problem.enable_timing()
+        optimiser = pbparam.ScipyMinimize(
+            method="Nelder-Mead", optimiser_options={"maxiter": 3}
+        )
+        result = optimiser.optimise(optimisation_problem)
+
+        profile = result.profile
+        self.assertEqual(
+            set(profile),
+            {"objective_function", "data", "build", "solve", "variables", "cost"},
+        )
+        # The model is only built and the plan compiled in the first evaluation
+        self.assertEqual(profile["build"]["count"], 1)
+        self.assertEqual(profile["data"]["count"], 1)
+        self.assertEqual(
+            profile["solve"]["count"], profile["objective_function"]["count"]
+        )
+        for stats in profile.values():
+            self.assertLessEqual(stats["p50"], stats["max"])
+        self.assertGreater(profile["solve"]["total"], profile["cost"]["total"])
+
+        optimisation_problem.disable_timing()
+        self.assertIsNone(optimiser.optimise(optimisation_problem).profile)
+
+    def test_early_abort(self):
+        model = pybamm.lithium_ion.SPM()
+        t = np.linspace(0, 3000, 31)
+        solution = pybamm.Simulation(model).solve(t)
+        data = pd.DataFrame(
+            {
+                "Time [s]": t,
+                "Voltage [V]": solution["Voltage [V]"](t),
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters, early_abort_windows=5
+        )
+        cost = float(optimisation_problem.objective_function([2]))
+
+        # With a large threshold the whole simulation is solved, with the same cost
+        # as a full solve
+        optimisation_problem.enable_early_abort(1)
+        optimisation_problem.best_cost = 1
+        self.assertEqual(float(optimisation_problem.objective_function([2])), cost)
+        self.assertFalse(optimisation_problem.aborted)
+        self.assertAlmostEqual(optimisation_problem.solution.t[-1], 3000)
+
+        # With a small threshold the solve stops after the first window
+        optimisation_problem.best_cost = 1e-6
+        self.assertEqual(optimisation_problem.objective_function([2]), np.inf)
+        self.assertTrue(optimisation_problem.aborted)
+        self.assertAlmostEqual(optimisation_problem.solution.t[-1], 600)
+
+        # The costs on the data grid do not depend on the early abort either
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model),
+            data,
+            model_parameters,
+            early_abort_windows=5,
+            solve_on_data_grid=True,
+        )
+        cost = float(optimisation_problem.objective_function([2]))
+        optimisation_problem.enable_early_abort(1)
+        optimisation_problem.best_cost = 1
+        self.assertEqual(float(optimisation_problem.objective_function([2])), cost)
+
+        # Full solves are not affected by the windowed solves
+        optimisation_problem.best_cost = 1e-6
+        self.assertEqual(optimisation_problem.objective_function([2]), np.inf)
+        optimisation_problem.disable_early_abort()
+        self.assertEqual(float(optimisation_problem.objective_function([2])), cost)
+
+    def test_refresh_simulation(self):
+        model = pybamm.lithium_ion.SPM()
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        optimisation_problem = pbparam.DataFit(
+            pybamm.Simulation(model), data, model_parameters
+        )
+        simulation = optimisation_problem.model
+        cost = optimisation_problem.objective_function([1])
+        built_model = simulation.built_model
+
+        # The built model is reused while only the inputs change
+        optimisation_problem.setup_objective_function()
+        optimisation_problem.calculate_solution()
+        self.assertFalse(optimisation_problem.refresh_simulation())
+        self.assertIs(optimisation_problem.model, simulation)
+        self.assertIs(optimisation_problem.model.built_model, built_model)
+
+        # Changing a parameter that is not an input updates the simulation
+        optimisation_problem.parameter_values["Ambient temperature [K]"] = 310
+        optimisation_problem.setup_objective_function()
+        self.assertIsNot(optimisation_problem.model, simulation)
+        self.assertNotAlmostEqual(
+            float(optimisation_problem.objective_function([1])), float(cost)
+        )
+
+        # The simulation of previous parameter values is cached
+        optimisation_problem.parameter_values["Ambient temperature [K]"] = 298.15
+        self.assertTrue(optimisation_problem.refresh_simulation())
+        self.assertIs(optimisation_problem.model, simulation)
+        self.assertAlmostEqual(
+            float(optimisation_problem.objective_function([1])), float(cost)
+        )
+
+        # Only the simulations of the last parameter values used are kept
+        for temperature in range(290, 300):
+            optimisation_problem.parameter_values["Ambient temperature [K]"] = (
+                temperature
+            )
+            optimisation_problem.refresh_simulation()
+        self.assertEqual(len(optimisation_problem._simulations), 4)
+        self.assertIs(
+            list(optimisation_problem._simulations.values())[-1],
+            optimisation_problem.model,
+        )
+        optimisation_problem.parameter_values["Ambient temperature [K]"] = 298.15
+        self.assertTrue(optimisation_problem.refresh_simulation())
+        self.assertIsNot(optimisation_problem.model, simulation)
+
+    def test_fingerprint(self):
+        model = pybamm.lithium_ion.SPM()
+        sim = pybamm.Simulation(model)
+        data = pd.DataFrame(
+            {
+                "Time [s]": [0, 1, 2, 3],
+                "Voltage [V]": [3.7, 3.6, 3.5, 3.4],
+            }
+        )
+        model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (5e-15, (2.06e-16, 2.06e-12))
+        }
+        fingerprint = pbparam.DataFit(sim, data, model_parameters).fingerprint()
+
+        # Same problem gives the same fingerprint
+        self.assertEqual(
+            fingerprint, pbparam.DataFit(sim, data, model_parameters).fingerprint()
+        )
+
+        # Changing the data changes the fingerprint
+        new_data = data.copy()
+        new_data["Voltage [V]"] += 0.1
+        self.assertNotEqual(
+            fingerprint,
+            pbparam.DataFit(sim, new_data, model_parameters).fingerprint(),
+        )
+
+        # Changing a non-optimised parameter changes the fingerprint
+        parameter_values = sim.parameter_values.copy()
+        parameter_values["Positive electrode thickness [m]"] *= 2
+        new_sim = pybamm.Simulation(model, parameter_values=parameter_values)
+        self.assertNotEqual(
+            fingerprint,
+            pbparam.DataFit(new_sim, data, model_parameters).fingerprint(),
+        )
+
+        # Changing the initial guess changes the scalings of x, and so the
+        # fingerprint, as the evaluations are keyed by the scaled x
+        new_model_parameters = {
+            "Negative electrode diffusivity [m2.s-1]": (9e-15, (2.06e-16, 2.06e-12))
+        }
+        self.assertNotEqual(
+            fingerprint,
+            pbparam.DataFit(sim, data, new_model_parameters).fingerprint(),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "store.sqlite")
+            costs = []
+            for parameters in [model_parameters, new_model_parameters]:
+                optimisation_problem = pbparam.DataFit(
+                    pybamm.Simulation(model), data, parameters
+                )
+                optimisation_problem.enable_store(filename)
+                costs.append(float(optimisation_problem.evaluate([1])))
+                optimisation_problem.disable_store()
+            self.assertNotAlmostEqual(costs[0], costs[1])
+
     def test_calculate_solution(self):
         # Test without experiment & initial parameter values
         model = pybamm.lithium_ion.SPM()
@@ -2,6 +2,7 @@
 # Tests for the Optimisation Result class
 #
 import pbparam
+import pickle
 
 import unittest
 
@@ -32,6 +33,32 @@ class TestOptimisationResult(unittest.TestCase):
         self.assertEqual(optimisation_result.optimiser_name, "optimiser_name")
         self.assertIsNone(optimisation_result.solve_time)
 
+    def test_optimisation_problem_snapshot(self):
+        opt = pbparam.BaseOptimisationProblem(cost_function=pbparam.RMSE())
+        opt.x0 = [1]
+        opt.bounds = [(0, 2)]
+        opt.map_inputs = {"a": 0}
+        opt.enable_cache()
+        optimisation_result = pbparam.OptimisationResult(
+            [1.5], True, "message", 0, "raw_result", opt, "optimiser_name"
+        )
+
+        # Later changes to the problem do not affect the result
+        opt.x0[0] = 2
+        opt.map_inputs["b"] = 1
+        problem = optimisation_result.optimisation_problem
+        self.assertIsNot(problem, opt)
+        self.assertIs(optimisation_result.optimisation_problem, problem)
+        self.assertEqual(problem.x0, [1])
+        self.assertEqual(problem.map_inputs, {"a": 0})
+        self.assertIs(problem.cost_function, opt.cost_function)
+        self.assertIsNone(problem.cache)
+        self.assertEqual(optimisation_result.initial_guess, {"a": 1})
+
+        new_result = pickle.loads(pickle.dumps(optimisation_result))
+        self.assertIsNone(new_result._optimisation_problem)
+        self.assertEqual(new_result.optimisation_problem.x0, [1])
+
     def test_str(self):
         opt = pbparam.BaseOptimisationProblem(cost_function=pbparam.RMSE())
         optimisation_result = pbparam.OptimisationResult(
@@ -3,6 +3,11 @@
 #
 import pbparam
 import pybamm
+import numpy as np
+import os
+import tempfile
+import time
+from pbparam.optimisers.base_optimiser import _rng_state, _set_rng_state
 
 import unittest
 
@@ -13,6 +18,8 @@ class TestBaseOptimiser(unittest.TestCase):
         self.assertEqual(optimiser.name, "Base optimiser")
         self.assertFalse(optimiser.single_variable)
         self.assertFalse(optimiser.global_optimiser)
+        self.assertFalse(optimiser.ask_tell)
+        self.assertFalse(optimiser.checkpointing)
 
     def test_optimise(self):
         optimiser = pbparam.BaseOptimiser()
@@ -49,6 +56,107 @@ class TestBaseOptimiser(unittest.TestCase):
         self.assertEqual(pybamm.logger.level, 30)
         self.assertEqual(internal_logging_level, 10)
 
+    def test_early_abort_factor(self):
+        optimiser = pbparam.BaseOptimiser()
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.MLE()
+        )
+
+        def hack_optimiser(optimisation_problem, x0, bounds):
+            return optimisation_problem.early_abort_factor
+
+        optimiser._run_optimiser = hack_optimiser
+
+        self.assertIsNone(optimiser.optimise(optimisation_problem))
+        self.assertEqual(
+            optimiser.optimise(optimisation_problem, early_abort_factor=1.5), 1.5
+        )
+        # Early abort is disabled after the optimisation
+        self.assertIsNone(optimisation_problem.early_abort_factor)
+
+    def test_ask_tell(self):
+        optimiser = pbparam.BaseOptimiser()
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.MLE()
+        )
+        with self.assertRaisesRegex(NotImplementedError, "ask/tell is not supported"):
+            optimiser.start(optimisation_problem)
+        with self.assertRaisesRegex(RuntimeError, "start needs to be called"):
+            optimiser.ask()
+        with self.assertRaisesRegex(RuntimeError, "ask needs to be called"):
+            optimiser.tell([1])
+
+        # Errors of the optimiser are raised by ask
+        def run_optimiser(optimisation_problem, x0, bounds):
+            optimiser.evaluator.evaluate([x0])
+            raise ValueError("optimiser error")
+
+        optimiser.ask_tell = True
+        optimiser._run_optimiser = run_optimiser
+        optimiser.start(optimisation_problem, x0=[1])
+        np.testing.assert_array_equal(optimiser.ask(), [[1]])
+        optimiser.tell([2])
+        with self.assertRaisesRegex(ValueError, "optimiser error"):
+            optimiser.ask()
+
+    def test_checkpoint(self):
+        optimiser = pbparam.BaseOptimiser()
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.MLE()
+        )
+        with self.assertRaisesRegex(NotImplementedError, "not supported"):
+            optimiser.optimise(optimisation_problem, checkpoint="checkpoint.npz")
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "checkpoint.npz")
+            optimiser._checkpoint = {
+                "filename": filename,
+                "interval": 60,
+                "resume_from": filename,
+                "time": time.monotonic(),
+            }
+            # Checkpoints are only written once the interval has passed
+            optimiser._write_checkpoint(optimisation_problem, {"x": [1, 2]})
+            self.assertFalse(os.path.exists(filename))
+            optimiser._write_checkpoint(optimisation_problem, {"x": [1, 2]}, force=True)
+            state = optimiser._read_checkpoint(optimisation_problem)
+            self.assertEqual(list(state), ["x"])
+            np.testing.assert_array_equal(state["x"], [1, 2])
+
+    def test_profile(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = lambda x: (x[0] - 1) ** 2
+        optimisation_problem.setup_objective_function = lambda: None
+        optimisation_problem.scalings = None
+        optimisation_problem.map_inputs = {"x": 0}
+        optimisation_problem.x0 = [0]
+        optimisation_problem.bounds = [(-2, 2)]
+        optimiser = pbparam.ScipyMinimize(method="Nelder-Mead")
+
+        result = optimiser.optimise(optimisation_problem)
+        self.assertIsNone(result.profiler)
+
+        result = optimiser.optimise(optimisation_problem, profiler="cprofile")
+        functions = {function for _, _, function in result.profiler.stats.stats}
+        self.assertIn("_run_optimiser", functions)
+
+        profiler = pbparam.Profiler("sampling")
+        result = optimiser.optimise(optimisation_problem, profiler=profiler)
+        self.assertIs(result.profiler, profiler)
+        self.assertIsNone(optimiser.profiler)
+
+        with self.assertRaisesRegex(ValueError, "mode must be one of"):
+            optimiser.optimise(optimisation_problem, profiler="tracing")
+
+    def test_rng_state(self):
+        for rng in [np.random.RandomState(0), np.random.default_rng(0)]:
+            state = _rng_state(rng)
+            expected = rng.uniform(size=3)
+            _set_rng_state(rng, state)
+            np.testing.assert_array_equal(rng.uniform(size=3), expected)
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
@@ -2,6 +2,10 @@
 # Tests for the Scipy Differential Evolution Optimiser class
 #
 import pbparam
+import numpy as np
+import os
+import tempfile
+from unittest import mock
 
 import unittest
 
@@ -10,6 +14,11 @@ def parabola(x):
     return x[0] ** 2
 
 
+def rastrigin(x):
+    x = np.asarray(x)
+    return np.sum(x**2 - np.cos(2 * np.pi * x))
+
+
 class TestScipyDifferentialEvolution(unittest.TestCase):
     def test_scipy_differential_evolution_init(self):
         optimiser = pbparam.ScipyDifferentialEvolution()
@@ -17,6 +26,220 @@ class TestScipyDifferentialEvolution(unittest.TestCase):
         self.assertFalse(optimiser.single_variable)
         self.assertTrue(optimiser.global_optimiser)
         self.assertEqual(optimiser.extra_options, {})
+        self.assertFalse(optimiser.vectorized)
+
+    def test_vectorized(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = parabola
+        optimisation_problem.x0 = [1]
+        optimisation_problem.bounds = [(-2, 2)]
+        batch_sizes = []
+
+        def objective_function_batch(X):
+            batch_sizes.append(len(X))
+            return np.array([parabola(x) for x in X])
+
+        optimisation_problem.objective_function_batch = objective_function_batch
+        optimiser = pbparam.ScipyDifferentialEvolution(
+            extra_options={"popsize": 5, "seed": 0}, vectorized=True
+        )
+        result = optimiser.optimise(optimisation_problem)
+
+        np.testing.assert_array_almost_equal(result.x, [0], decimal=4)
+        # The population is evaluated together
+        self.assertEqual(max(batch_sizes), 5)
+
+    def test_profiler_workers(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = parabola
+        optimisation_problem.x0 = [1]
+        optimisation_problem.bounds = [(-2, 2)]
+        optimiser = pbparam.ScipyDifferentialEvolution(extra_options={"workers": 2})
+        with self.assertRaisesRegex(ValueError, "ProcessPoolEvaluator"):
+            optimiser.optimise(optimisation_problem, profiler="cprofile")
+
+    def test_evaluator(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = parabola
+        optimisation_problem.x0 = [1]
+        optimisation_problem.bounds = [(-2, 2)]
+        batch_sizes = []
+
+        class Evaluator(pbparam.BaseEvaluator):
+            def evaluate(self, X):
+                batch_sizes.append(len(X))
+                return super().evaluate(X)
+
+        optimiser = pbparam.ScipyDifferentialEvolution(
+            extra_options={"popsize": 5, "seed": 0}
+        )
+        evaluator = Evaluator()
+        result = optimiser.optimise(optimisation_problem, evaluator=evaluator)
+
+        np.testing.assert_array_almost_equal(result.x, [0], decimal=4)
+        # The population is sent to the evaluator, which is closed at the end
+        self.assertEqual(max(batch_sizes), 5)
+        self.assertIsNone(evaluator.optimisation_problem)
+
+    def test_ask_tell(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = parabola
+        optimisation_problem.x0 = [1]
+        optimisation_problem.bounds = [(-2, 2)]
+        optimiser = pbparam.ScipyDifferentialEvolution(
+            extra_options={"popsize": 5, "seed": 0}
+        )
+        self.assertTrue(optimiser.ask_tell)
+
+        optimiser.start(optimisation_problem)
+        batch_sizes = []
+        X = optimiser.ask()
+        # Asking again returns the same points until their costs are told
+        self.assertIs(optimiser.ask(), X)
+        with self.assertRaisesRegex(ValueError, "Expected 5 costs, got 1"):
+            optimiser.tell([0])
+        while X is not None:
+            batch_sizes.append(len(X))
+            optimiser.tell([parabola(x) for x in X])
+            X = optimiser.ask()
+
+        np.testing.assert_array_almost_equal(optimiser.result.x, [0], decimal=4)
+        self.assertEqual(max(batch_sizes), 5)
+
+        # The optimisation can be stopped before the end
+        optimiser.start(optimisation_problem)
+        optimiser.ask()
+        optimiser.stop()
+        with self.assertRaisesRegex(RuntimeError, "start needs to be called"):
+            optimiser.ask()
+
+    def test_checkpoint(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = rastrigin
+        optimisation_problem.x0 = [1, 1]
+        optimisation_problem.bounds = [(-3, 3), (-3, 3)]
+
+        def optimiser(maxiter):
+            return pbparam.ScipyDifferentialEvolution(
+                extra_options={"seed": 0, "maxiter": maxiter, "tol": 0}
+            )
+
+        expected = optimiser(12).optimise(optimisation_problem)
+        self.assertTrue(optimiser(12).checkpointing)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "checkpoint.npz")
+            optimiser(5).optimise(
+                optimisation_problem, checkpoint=filename, checkpoint_interval=0
+            )
+            with np.load(filename) as checkpoint:
+                self.assertEqual(checkpoint["nit"], 5)
+
+            # The resumed optimisation continues exactly
+            result = optimiser(12).optimise(optimisation_problem, resume_from=filename)
+            np.testing.assert_array_equal(result.x, expected.x)
+            self.assertEqual(result.raw_result.nfev, expected.raw_result.nfev)
+            self.assertEqual(result.raw_result.nit, expected.raw_result.nit)
+
+            # Checkpoints can only be resumed for the same problem and optimiser
+            other_problem = pbparam.BaseOptimisationProblem(
+                cost_function=pbparam.MLE()
+            )
+            other_problem.objective_function = rastrigin
+            with self.assertRaisesRegex(ValueError, "different optimisation problem"):
+                optimiser(12).optimise(
+                    other_problem,
+                    x0=[1, 1],
+                    bounds=[(-3, 3), (-3, 3)],
+                    resume_from=filename,
+                )
+            with self.assertRaisesRegex(ValueError, "not written by ScipyMinimize"):
+                pbparam.ScipyMinimize().optimise(
+                    optimisation_problem, resume_from=filename
+                )
+            with self.assertRaisesRegex(ValueError, "population of the checkpoint"):
+                pbparam.ScipyDifferentialEvolution(
+                    extra_options={"popsize": 5}
+                ).optimise(optimisation_problem, resume_from=filename)
+
+    def test_callback(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = parabola
+        optimisation_problem.x0 = [1]
+        optimisation_problem.bounds = [(-2, 2)]
+        generations = []
+
+        # Without checkpoints, both signatures of SciPy are supported
+        def callback(x, convergence=None):
+            generations.append(convergence)
+
+        pbparam.ScipyDifferentialEvolution(
+            extra_options={"seed": 0, "maxiter": 3, "callback": callback}
+        ).optimise(optimisation_problem)
+        self.assertGreater(len(generations), 0)
+
+        # With checkpoints, the callback is called after the checkpoint is written
+        def stop(intermediate_result):
+            generations.append(intermediate_result.nit)
+            return True
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "checkpoint.npz")
+            result = pbparam.ScipyDifferentialEvolution(
+                extra_options={"seed": 0, "maxiter": 3, "callback": stop}
+            ).optimise(optimisation_problem, checkpoint=filename)
+            with np.load(filename) as checkpoint:
+                self.assertEqual(checkpoint["nit"], 1)
+        self.assertEqual(generations[-1], 1)
+        self.assertEqual(result.raw_result.nit, 1)
+
+    def test_checkpoint_scipy_version(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = parabola
+        optimisation_problem.x0 = [1]
+        optimisation_problem.bounds = [(-2, 2)]
+
+        # Checkpoints are not available before SciPy 1.12
+        with mock.patch("scipy.__version__", "1.11.4"):
+            optimiser = pbparam.ScipyDifferentialEvolution()
+        self.assertFalse(optimiser.checkpointing)
+        with self.assertRaisesRegex(NotImplementedError, "checkpoints"):
+            optimiser.optimise(optimisation_problem, checkpoint="checkpoint.npz")
+
+        # and fail clearly if the state of the solver changes in later versions
+        from scipy.optimize._differentialevolution import (
+            DifferentialEvolutionSolver,
+        )
+
+        class Solver(DifferentialEvolutionSolver):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                del self._random_population_index
+
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch(
+                "scipy.optimize._differentialevolution.DifferentialEvolutionSolver",
+                Solver,
+            ):
+                with self.assertRaisesRegex(RuntimeError, "_random_population_index"):
+                    pbparam.ScipyDifferentialEvolution().optimise(
+                        optimisation_problem,
+                        checkpoint=os.path.join(directory, "checkpoint.npz"),
+                    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,91 @@
+#
+# Tests for the Scipy Least Squares Optimiser class
+#
+import pbparam
+import numpy as np
+import pandas as pd
+
+import unittest
+
+
+class TestScipyLeastSquares(unittest.TestCase):
+    def test_scipy_least_squares_init(self):
+        optimiser = pbparam.ScipyLeastSquares(method="method")
+        self.assertEqual(
+            optimiser.name, "SciPy Least Squares optimiser with method method"
+        )
+        self.assertEqual(optimiser.method, "method")
+        self.assertFalse(optimiser.single_variable)
+        self.assertFalse(optimiser.global_optimiser)
+        self.assertEqual(optimiser.extra_options, {})
+
+    def test_optimise(self):
+        data_ref = pd.DataFrame(
+            {"Voltage [V]": [0.1, 0.3, 0.5, 0.7, 0.9], "Time [s]": [5, 4, 3, 2, 1]}
+        )
+        data_fit = pd.DataFrame(
+            {"Voltage [V]": [1, 2, 3, 4, 5], "Time [s]": [5, 4, 3, 2, 1]}
+        )
+        optimisation_problem = pbparam.OCPBalance(data_fit, data_ref)
+        optimiser = pbparam.ScipyLeastSquares()
+        result = optimiser.optimise(optimisation_problem)
+        np.testing.assert_array_almost_equal(result.x, [-0.1, 0.2])
+        self.assertAlmostEqual(result.fun, 0)
+
+        optimisation_problem = pbparam.OCPBalance(
+            data_fit, data_ref, cost_function=pbparam.MLE()
+        )
+        with self.assertRaisesRegex(ValueError, "MLE"):
+            optimiser.optimise(optimisation_problem)
+
+    def test_lm(self):
+        data_ref = pd.DataFrame(
+            {"Voltage [V]": [0.1, 0.3, 0.5, 0.7, 0.9], "Time [s]": [5, 4, 3, 2, 1]}
+        )
+        data_fit = pd.DataFrame(
+            {"Voltage [V]": [1, 2, 3, 4, 5], "Time [s]": [5, 4, 3, 2, 1]}
+        )
+        optimisation_problem = pbparam.OCPBalance(data_fit, data_ref)
+        # The bounds of the problem are ignored, as SciPy does not support them
+        # with this method
+        optimiser = pbparam.ScipyLeastSquares(method="lm")
+        result = optimiser.optimise(optimisation_problem)
+        np.testing.assert_array_almost_equal(result.x, [-0.1, 0.2])
+        self.assertAlmostEqual(result.fun, 0)
+
+    def test_jacobian(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        A = np.array([[1.0, 0.5], [2.0, -1.0], [0.5, 3.0]])
+        b = np.array([1.0, 2.0, 3.0])
+        calls = []
+
+        def residuals_and_jacobian(x):
+            calls.append(x)
+            return A @ x - b, A
+
+        optimisation_problem.residuals_and_jacobian = residuals_and_jacobian
+        optimisation_problem.objective_function = lambda x: np.sqrt(
+            np.mean((A @ x - b) ** 2)
+        )
+        optimisation_problem.setup_objective_function = lambda: None
+        optimisation_problem.calculate_sensitivities = True
+
+        result = pbparam.ScipyLeastSquares().optimise(
+            optimisation_problem, x0=[0.0, 0.0], bounds=[(-10, 10), (-10, 10)]
+        )
+        np.testing.assert_array_almost_equal(
+            result.x, np.linalg.lstsq(A, b, rcond=None)[0]
+        )
+        # The jacobian is taken from the residuals evaluations
+        self.assertEqual(len(calls), result.raw_result.nfev)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()
@@ -2,6 +2,9 @@
 # Tests for the Scipy Minimize Optimiser class
 #
 import pbparam
+import numpy as np
+import os
+import tempfile
 
 import unittest
 
@@ -15,6 +18,191 @@ class TestScipyMinimize(unittest.TestCase):
         self.assertFalse(optimiser.global_optimiser)
         self.assertEqual(optimiser.extra_options, {})
 
+    def test_use_gradient(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        calls = []
+
+        def objective_function_and_gradient(x):
+            calls.append(x)
+            x = np.asarray(x)
+            return np.sum((x - 1) ** 2), 2 * (x - 1)
+
+        optimisation_problem.objective_function = lambda x: (
+            objective_function_and_gradient(x)[0]
+        )
+        optimisation_problem.objective_function_and_gradient = (
+            objective_function_and_gradient
+        )
+        optimisation_problem.setup_objective_function = lambda: None
+        optimisation_problem.scalings = None
+
+        optimiser = pbparam.ScipyMinimize(method="L-BFGS-B")
+        self.assertFalse(optimiser._use_gradient(optimisation_problem))
+
+        optimisation_problem.calculate_sensitivities = True
+        self.assertTrue(optimiser._use_gradient(optimisation_problem))
+        self.assertFalse(
+            pbparam.ScipyMinimize(method="Nelder-Mead")._use_gradient(
+                optimisation_problem
+            )
+        )
+        self.assertFalse(
+            pbparam.ScipyMinimize(
+                method="BFGS", extra_options={"jac": "3-point"}
+            )._use_gradient(optimisation_problem)
+        )
+
+        # With the analytic gradient no finite difference evaluations are needed
+        result = optimiser.optimise(
+            optimisation_problem, x0=[3.0, -2.0], bounds=[(-5, 5), (-5, 5)]
+        )
+        np.testing.assert_array_almost_equal(result.x, [1, 1])
+        self.assertEqual(len(calls), result.raw_result.nfev)
+
+    def test_finite_difference(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = lambda x: np.sum(
+            (np.asarray(x) - 1) ** 2
+        )
+        optimisation_problem.setup_objective_function = lambda: None
+        optimisation_problem.scalings = None
+
+        finite_difference = pbparam.ParallelFiniteDifference(rel_step=1e-6, workers=1)
+        optimiser = pbparam.ScipyMinimize(
+            method="L-BFGS-B", finite_difference=finite_difference
+        )
+        self.assertTrue(optimiser._use_finite_difference())
+        self.assertFalse(
+            pbparam.ScipyMinimize(
+                method="Nelder-Mead", finite_difference=finite_difference
+            )._use_finite_difference()
+        )
+
+        result = optimiser.optimise(
+            optimisation_problem, x0=[3.0, -2.0], bounds=[(-5, 5), (-5, 5)]
+        )
+        np.testing.assert_array_almost_equal(result.x, [1, 1], decimal=5)
+
+    def test_evaluator(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = lambda x: np.sum(
+            (np.asarray(x) - 1) ** 2
+        )
+        optimisation_problem.setup_objective_function = lambda: None
+        optimisation_problem.scalings = None
+        batch_sizes = []
+
+        class Evaluator(pbparam.BaseEvaluator):
+            def evaluate(self, X):
+                batch_sizes.append(len(X))
+                return super().evaluate(X)
+
+        # The finite difference points are sent to the evaluator together
+        result = pbparam.ScipyMinimize(method="L-BFGS-B").optimise(
+            optimisation_problem,
+            x0=[3.0, -2.0],
+            bounds=[(-5, 5), (-5, 5)],
+            evaluator=Evaluator(),
+        )
+        np.testing.assert_array_almost_equal(result.x, [1, 1], decimal=3)
+        self.assertEqual(set(batch_sizes), {3})
+
+        # Gradient-free methods send one point at a time
+        batch_sizes.clear()
+        pbparam.ScipyMinimize(method="Nelder-Mead").optimise(
+            optimisation_problem, x0=[3.0, -2.0], evaluator=Evaluator()
+        )
+        self.assertEqual(set(batch_sizes), {1})
+
+    def test_ask_tell(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = lambda x: np.sum(
+            (np.asarray(x) - 1) ** 2
+        )
+        optimisation_problem.setup_objective_function = lambda: None
+        optimisation_problem.scalings = None
+
+        optimiser = pbparam.ScipyMinimize(method="L-BFGS-B")
+        optimiser.start(optimisation_problem, x0=[3.0, -2.0])
+        X = optimiser.ask()
+        while X is not None:
+            # The points of the finite differences are asked together
+            self.assertEqual(len(X), 3)
+            optimiser.tell(np.sum((X - 1) ** 2, axis=1))
+            X = optimiser.ask()
+        np.testing.assert_array_almost_equal(optimiser.result.x, [1, 1], decimal=3)
+
+    def test_checkpoint(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = lambda x: np.sum(
+            (np.asarray(x) - 1) ** 2
+        )
+        optimisation_problem.x0 = [3.0, -2.0]
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "checkpoint.npz")
+            pbparam.ScipyMinimize(
+                method="Nelder-Mead", optimiser_options={"maxiter": 5}
+            ).optimise(optimisation_problem, checkpoint=filename)
+            with np.load(filename) as checkpoint:
+                x = checkpoint["x"]
+                nfev = checkpoint["nfev"]
+                self.assertEqual(
+                    checkpoint["fun"], optimisation_problem.objective_function(x)
+                )
+
+            # The optimisation restarts from the best point of the checkpoint
+            result = pbparam.ScipyMinimize(method="Nelder-Mead").optimise(
+                optimisation_problem, x0=[100, 100], resume_from=filename
+            )
+            np.testing.assert_array_almost_equal(result.x, [1, 1], decimal=3)
+            self.assertGreater(result.raw_result.nfev, nfev)
+
+    def test_history(self):
+        optimisation_problem = pbparam.BaseOptimisationProblem(
+            cost_function=pbparam.RMSE()
+        )
+        optimisation_problem.objective_function = lambda x: np.sum(
+            (np.asarray(x) - 1) ** 2
+        )
+        optimisation_problem.x0 = [3.0, -2.0]
+        optimisation_problem.enable_history()
+
+        optimiser = pbparam.ScipyMinimize(method="Nelder-Mead")
+        result = optimiser.optimise(optimisation_problem)
+        self.assertIs(result.history, optimisation_problem.history)
+        self.assertEqual(len(result.history), result.raw_result.nfev)
+        self.assertEqual(result.history.best_costs()[-1], result.fun)
+
+        # Each optimisation has its own history
+        first_costs = result.history.costs
+        new_result = optimiser.optimise(optimisation_problem)
+        self.assertEqual(len(new_result.history), new_result.raw_result.nfev)
+        self.assertIsNot(new_result.history, result.history)
+        np.testing.assert_array_equal(result.history.costs, first_costs)
+
+        # The results of a memory-mapped history hold a copy, as the file is reused
+        with tempfile.TemporaryDirectory() as directory:
+            optimisation_problem.enable_history(
+                filename=os.path.join(directory, "history.dat")
+            )
+            result = optimiser.optimise(optimisation_problem)
+            new_result = optimiser.optimise(optimisation_problem)
+            optimisation_problem.disable_history()
+        self.assertIsNone(result.history.filename)
+        np.testing.assert_array_equal(result.history.costs, first_costs)
+        np.testing.assert_array_equal(new_result.history.costs, first_costs)
+
 
 if __name__ == "__main__":
     print("Add -v for more debug output")
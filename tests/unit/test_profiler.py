@@ -0,0 +1,81 @@
+#
+# Tests for the Profiler class
+#
+import pbparam
+import os
+import pickle
+import tempfile
+import time
+
+import unittest
+
+
+def busy_function(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestProfiler(unittest.TestCase):
+    def test_profiler_init(self):
+        profiler = pbparam.Profiler()
+        self.assertEqual(profiler.mode, "cprofile")
+        self.assertIsNone(profiler.stats)
+        with self.assertRaisesRegex(ValueError, "mode must be one of"):
+            pbparam.Profiler("tracing")
+
+    def test_cprofile(self):
+        profiler = pbparam.Profiler("cprofile")
+        with profiler:
+            busy_function(0.01)
+            with self.assertRaisesRegex(RuntimeError, "already running"):
+                profiler.start()
+        functions = {function for _, _, function in profiler.stats.stats}
+        self.assertIn("busy_function", functions)
+        calls = profiler.stats.total_calls
+
+        # The statistics of several runs are added
+        with profiler:
+            busy_function(0.01)
+        self.assertGreater(profiler.stats.total_calls, calls)
+
+        copy = pickle.loads(pickle.dumps(profiler))
+        self.assertEqual(copy.stats.total_calls, profiler.stats.total_calls)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "profile.prof")
+            profiler.dump(filename)
+            loaded = pbparam.Profiler("cprofile")
+            loaded.load(filename)
+            loaded.load(filename)
+        self.assertEqual(loaded.stats.total_calls, 2 * profiler.stats.total_calls)
+
+    def test_sampling(self):
+        profiler = pbparam.Profiler("sampling", interval=0.001)
+        with profiler:
+            busy_function(0.1)
+        self.assertIsNone(profiler.stats)
+        self.assertGreater(sum(profiler.stacks.values()), 0)
+        self.assertTrue(any("busy_function" in stack for stack in profiler.stacks))
+
+        copy = pickle.loads(pickle.dumps(profiler))
+        self.assertEqual(copy.stacks, profiler.stacks)
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "profile.txt")
+            profiler.dump(filename)
+            with open(filename) as file:
+                stack, count = file.readline().rsplit(" ", 1)
+            self.assertEqual(profiler.stacks[stack], int(count))
+            loaded = pbparam.Profiler("sampling")
+            loaded.load(filename)
+        self.assertEqual(loaded.stacks, profiler.stacks)
+
+
+if __name__ == "__main__":
+    print("Add -v for more debug output")
+    import sys
+
+    if "-v" in sys.argv:
+        debug = True
+    unittest.main()